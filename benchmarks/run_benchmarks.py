@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.simulator import Simulator
+from systems.contracts import Contract, ContractsSystem, PuzzleType
+from systems.materials_system import MaterialsSystem
+from systems.time_system import TimeSystem
+from world.workshop_state import WorkshopState
+
+BenchmarkResult = Dict[str, float]
+
+
+def _best_rate(operation: Callable[[], int], repeat: int) -> float:
+    """Run ``operation`` several times and return its best operations-per-second."""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = operation()
+        elapsed = time.perf_counter() - start
+        if elapsed > 0:
+            best = max(best, count / elapsed)
+    return best
+
+
+def bench_pipeline(scale: float, repeat: int) -> BenchmarkResult:
+    """Ticks/sec frame by frame and days/sec through the headless day loop."""
+    ticks = max(1, int(300_000 * scale))
+    days = max(1, int(100_000 * scale))
+
+    def run_ticks() -> int:
+        simulator = Simulator()
+        for _ in range(ticks):
+            simulator.step()
+        return ticks
+
+    def run_days() -> int:
+        Simulator().advance_days(days)
+        return days
+
+    return {
+        "pipeline.ticks_per_sec": _best_rate(run_ticks, repeat),
+        "pipeline.days_per_sec": _best_rate(run_days, repeat),
+    }
+
+
+def bench_contract_churn(scale: float, repeat: int) -> BenchmarkResult:
+    """Expire/generate throughput with thousands of long-running active contracts."""
+    pool_size = max(1, int(5_000 * scale))
+    days = max(1, int(20_000 * scale))
+
+    def run() -> int:
+        state = WorkshopState()
+        contracts_system = ContractsSystem(max_active_contracts=pool_size + 1)
+        for contract_id in range(pool_size):
+            state.active_contracts.append(
+                Contract(
+                    id=1_000_000 + contract_id,
+                    name="Standing commission",
+                    reward_money=100.0,
+                    duration_days=1 + (contract_id * 7919) % days,
+                    prestige=0.1,
+                    materials_required={"wood": 1},
+                    puzzle_type=PuzzleType.GEARS,
+                    puzzle_difficulty=1,
+                    start_day=1,
+                )
+            )
+        for _ in range(days):
+            state.day += 1
+            contracts_system.remove_expired_contracts(state, state.day)
+            contracts_system.maybe_generate_daily_contracts(state)
+        return days
+
+    return {"contracts.churn_days_per_sec": _best_rate(run, repeat)}
+
+
+def bench_materials(scale: float, repeat: int) -> BenchmarkResult:
+    """Single-material purchase and removal operations per second."""
+    operations = max(1, int(200_000 * scale))
+    materials_system = MaterialsSystem()
+
+    def run() -> int:
+        state = WorkshopState(money=float(operations))
+        for _ in range(operations // 2):
+            materials_system.purchase_material(state, "wood", 2, price_per_unit=0.5)
+            materials_system.remove_material(state, "wood", 1)
+        return operations
+
+    return {"materials.ops_per_sec": _best_rate(run, repeat)}
+
+
+def bench_render(scale: float, repeat: int) -> BenchmarkResult:
+    """WorkshopScene frames/sec under SDL's dummy video driver."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    try:
+        import pygame
+    except ImportError:
+        return {}
+    from ui.workshop_scene import WorkshopScene
+
+    frames = max(1, int(3_000 * scale))
+    pygame.init()
+    try:
+        surface = pygame.display.set_mode((1280, 720))
+        simulator = Simulator(time_system=TimeSystem(ticks_per_day=30))
+        scene = WorkshopScene(simulator.workshop_state)
+
+        def run() -> int:
+            for _ in range(frames):
+                simulator.step()
+                scene.render(surface)
+            return frames
+
+        return {"render.frames_per_sec": _best_rate(run, repeat)}
+    finally:
+        pygame.quit()
+
+
+BENCHMARKS: Dict[str, Callable[[float, int], BenchmarkResult]] = {
+    "pipeline": bench_pipeline,
+    "contracts": bench_contract_churn,
+    "materials": bench_materials,
+    "render": bench_render,
+}
+
+
+def run_benchmarks(
+    names: Optional[List[str]] = None, scale: float = 1.0, repeat: int = 3
+) -> Dict[str, object]:
+    """Run the selected benchmarks and return a JSON-serializable report."""
+    results: BenchmarkResult = {}
+    for name in names or list(BENCHMARKS):
+        results.update(BENCHMARKS[name](scale, repeat))
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "results": results,
+    }
+
+
+def compare(
+    current: BenchmarkResult,
+    baseline: BenchmarkResult,
+    threshold: float = 0.1,
+    only: Optional[List[str]] = None,
+) -> List[Tuple[str, float, float, float]]:
+    """
+    Return the metrics that dropped by more than ``threshold`` against the baseline.
+
+    All metrics are rates, so lower is worse. Each entry is
+    ``(metric, baseline, current, ratio)``. Baseline metrics of benchmarks
+    outside ``only`` are skipped; any other metric missing from the current
+    run, such as a render benchmark that could not start, is a regression
+    with a current rate and ratio of 0.
+    """
+    regressions = []
+    for metric, baseline_value in sorted(baseline.items()):
+        if only and metric.split(".", 1)[0] not in only:
+            continue
+        current_value = current.get(metric)
+        if current_value is None:
+            regressions.append((metric, baseline_value, 0.0, 0.0))
+            continue
+        if baseline_value <= 0:
+            continue
+        ratio = current_value / baseline_value
+        if ratio < 1.0 - threshold:
+            regressions.append((metric, baseline_value, current_value, ratio))
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the workshop performance benchmarks.")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="Subset to run.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply workload sizes.")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N repetitions.")
+    parser.add_argument("--output", help="Write the JSON report to this path.")
+    parser.add_argument("--compare", help="Baseline JSON report to check for regressions.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Allowed slowdown before flagging."
+    )
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.only, args.scale, args.repeat)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text)
+
+    if not args.compare:
+        return 0
+    with open(args.compare, "r", encoding="utf-8") as handle:
+        baseline = json.load(handle)["results"]
+    regressions = compare(report["results"], baseline, args.threshold, args.only)
+    for metric, baseline_value, current_value, ratio in regressions:
+        if metric not in report["results"]:
+            print(f"REGRESSION {metric}: missing from this run", file=sys.stderr)
+            continue
+        print(
+            f"REGRESSION {metric}: {current_value:,.0f}/s vs baseline "
+            f"{baseline_value:,.0f}/s ({ratio:.0%})",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
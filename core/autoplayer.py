@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from core.commands import complete_contract, purchase_materials
+from core.simulator import Simulator
+from systems.contracts import KNOWN_MATERIALS, ContractsSystem
+from systems.random_events import RandomEventSystem
+from systems.rng import RandomService
+from world.inventory import material_vector
+
+# Unit prices the autoplayer pays for materials; the game has no market yet.
+DEFAULT_PRICES: Dict[str, float] = {"wood": 4.0, "metal": 10.0, "pigment": 7.0}
+
+
+class Action(NamedTuple):
+    """One day's decision: wait, or deliver a contract after buying what it lacks."""
+
+    kind: str
+    contract_id: Optional[int] = None
+    purchase: Tuple[Tuple[str, int], ...] = ()
+
+
+WAIT = Action("wait")
+
+
+class SearchStats(NamedTuple):
+    nodes: int
+    transpositions: int
+    depth_reached: int
+    elapsed_seconds: float
+    budget_exhausted: bool
+
+
+def state_key(simulator: Simulator) -> Hashable:
+    """
+    Canonical key of the fields that decide how a workshop plays out.
+
+    Two simulations with equal keys are treated as the same search node.
+    Random event streams are deliberately left out, so with events enabled
+    equal keys are equivalent in distribution rather than exactly.
+    """
+    state = simulator.workshop_state
+    return (
+        state.day,
+        simulator.time_system.tick_counter,
+        round(state.money, 2),
+        round(state.reputation, 4),
+        tuple(state.materials.counts),
+        tuple(sorted(contract.id for contract in state.active_contracts)),
+        simulator.contracts_system.next_contract_id,
+        tuple(sorted(job.contract.id for job in simulator.production_system.jobs())),
+    )
+
+
+class Autoplayer:
+    """Picks a daily action by beam search over forked simulations.
+
+    Each search node is a ``Simulator.fork()`` advanced by one action and one
+    day. Expansions are memoized in a transposition table keyed by
+    ``state_key``, so a state reached by two orders of the same actions, or
+    again on the next day's decision, is expanded only once. Each decision
+    stops at ``max_nodes`` simulated children or ``time_budget`` seconds and
+    then uses the deepest fully searched layer, so it can run inside the
+    frame loop.
+    """
+
+    def __init__(
+        self,
+        prices: Optional[Dict[str, float]] = None,
+        beam_width: int = 4,
+        depth: int = 3,
+        max_nodes: int = 200,
+        time_budget: Optional[float] = None,
+        reputation_value: float = 4 * ContractsSystem.REPUTATION_REWARD_RATE,
+        max_table_size: int = 20_000,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if beam_width <= 0 or depth <= 0 or max_nodes <= 0:
+            raise ValueError("beam_width, depth and max_nodes must be positive.")
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be positive.")
+        self.prices = dict(DEFAULT_PRICES if prices is None else prices)
+        missing = [name for name in KNOWN_MATERIALS if name not in self.prices]
+        if missing:
+            raise ValueError(f"No price given for: {', '.join(missing)}.")
+        self.beam_width = beam_width
+        self.depth = depth
+        self.max_nodes = max_nodes
+        self.time_budget = time_budget
+        self.reputation_value = reputation_value
+        self.max_table_size = max_table_size
+        self.clock = clock
+        self.last_stats: Optional[SearchStats] = None
+        # state key -> [(action, child simulation, child key)]
+        self._expansions: Dict[Hashable, List[Tuple[Action, Simulator, Hashable]]] = {}
+
+    def legal_actions(self, simulator: Simulator) -> List[Action]:
+        """Waiting, plus every active contract the workshop can complete today."""
+        state = simulator.workshop_state
+        stock = state.materials.counts
+        actions = [WAIT]
+        for contract in state.active_contracts:
+            required = material_vector(contract.materials_required)
+            purchase = tuple(
+                (KNOWN_MATERIALS[index], need - have)
+                for index, (need, have) in enumerate(zip(required, stock))
+                if need > have
+            )
+            cost = sum(amount * self.prices[name] for name, amount in purchase)
+            if cost <= state.money and cost < contract.reward_money:
+                actions.append(Action("complete", contract.id, purchase))
+        return actions
+
+    def apply(self, simulator: Simulator, action: Action) -> None:
+        """Carry out an action through the simulator's commands, so recordings capture it."""
+        if action.kind == "wait":
+            return
+        if action.purchase:
+            simulator.execute(purchase_materials(dict(action.purchase), self.prices))
+        simulator.execute(complete_contract(action.contract_id))
+
+    def evaluate(self, simulator: Simulator) -> float:
+        """Heuristic value of a workshop: money, reputation, and stock at half its price."""
+        state = simulator.workshop_state
+        stock_value = sum(
+            count * self.prices[name] for name, count in zip(KNOWN_MATERIALS, state.materials.counts)
+        )
+        return state.money + state.reputation * self.reputation_value + 0.5 * stock_value
+
+    def decide(self, simulator: Simulator) -> Action:
+        """Search ahead from the current state and return the best action for today."""
+        started = self.clock()
+        root_key = state_key(simulator)
+        self._prune(simulator.workshop_state.day)
+        nodes = transpositions = 0
+        exhausted = False
+        seen = {root_key}
+
+        # Frontier entries: (score, root action, simulation, key).
+        frontier: List[Tuple[float, Action, Simulator, Hashable]] = []
+        for action, child, child_key in self._expand(simulator, root_key):
+            nodes += 1
+            seen.add(child_key)
+            frontier.append((self.evaluate(child), action, child, child_key))
+        depth_reached = 1
+
+        while depth_reached < self.depth and not exhausted:
+            frontier.sort(key=lambda entry: entry[0], reverse=True)
+            layer: List[Tuple[float, Action, Simulator, Hashable]] = []
+            for _, root_action, node, key in frontier[: self.beam_width]:
+                if nodes >= self.max_nodes or self._out_of_time(started):
+                    exhausted = True
+                    break
+                for _, child, child_key in self._expand(node, key):
+                    nodes += 1
+                    if child_key in seen:
+                        transpositions += 1
+                        continue
+                    seen.add(child_key)
+                    layer.append((self.evaluate(child), root_action, child, child_key))
+            if exhausted or not layer:
+                # A partial layer would compare states at different depths.
+                break
+            frontier = layer
+            depth_reached += 1
+
+        best = max(frontier, key=lambda entry: entry[0], default=None)
+        self.last_stats = SearchStats(
+            nodes, transpositions, depth_reached, self.clock() - started, exhausted
+        )
+        return WAIT if best is None else best[1]
+
+    def act(self, simulator: Simulator) -> Action:
+        """Decide and carry out today's action; time is not advanced."""
+        action = self.decide(simulator)
+        self.apply(simulator, action)
+        return action
+
+    def play(self, simulator: Simulator, days: int) -> Dict[str, Any]:
+        """
+        Play ``days`` days headlessly and summarize the run.
+
+        Raises:
+            ValueError: If days is negative.
+        """
+        if days < 0:
+            raise ValueError("days cannot be negative.")
+        state = simulator.workshop_state
+        starting_money = state.money
+        completed = 0
+        nodes = 0
+        bankruptcy_day: Optional[int] = None
+        started = time.perf_counter()
+        for _ in range(days):
+            action = self.act(simulator)
+            completed += action.kind == "complete"
+            nodes += self.last_stats.nodes if self.last_stats is not None else 0
+            simulator.advance_days(1)
+            if state.money < 0 and bankruptcy_day is None:
+                bankruptcy_day = state.day
+        return {
+            "days": days,
+            "starting_money": starting_money,
+            "final_money": state.money,
+            "final_reputation": state.reputation,
+            "contracts_completed": completed,
+            "bankruptcy_day": bankruptcy_day,
+            "nodes": nodes,
+            "seconds": time.perf_counter() - started,
+        }
+
+    def clear(self) -> None:
+        """Drop the transposition table."""
+        self._expansions.clear()
+
+    def _expand(
+        self, simulator: Simulator, key: Hashable
+    ) -> List[Tuple[Action, Simulator, Hashable]]:
+        expansion = self._expansions.get(key)
+        if expansion is None:
+            expansion = []
+            for action in self.legal_actions(simulator):
+                child = simulator.fork()
+                self.apply(child, action)
+                child.advance_days(1)
+                expansion.append((action, child, state_key(child)))
+            if len(self._expansions) < self.max_table_size:
+                self._expansions[key] = expansion
+        return expansion
+
+    def _prune(self, day: int) -> None:
+        # Keys start with the day, and days only move forward.
+        stale = [key for key in self._expansions if key[0] < day]
+        for key in stale:
+            del self._expansions[key]
+
+    def _out_of_time(self, started: float) -> bool:
+        return self.time_budget is not None and self.clock() - started >= self.time_budget
+
+
+def play_headless(
+    days: int,
+    seed: int = 0,
+    daily_event_chance: float = 0.0,
+    max_active_contracts: int = 3,
+    **options: Any,
+) -> Dict[str, Any]:
+    """Play one seeded game with a fresh autoplayer and return its summary."""
+    rng = RandomService(seed)
+    simulator = Simulator(
+        contracts_system=ContractsSystem(max_active_contracts=max_active_contracts),
+        rng=rng,
+        random_event_system=RandomEventSystem(rng, daily_event_chance=daily_event_chance),
+    )
+    return {"seed": seed, **Autoplayer(**options).play(simulator, days)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Soak-test balance with the autoplayer.")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game.")
+    parser.add_argument("--event-chance", type=float, default=0.0)
+    parser.add_argument("--max-active-contracts", type=int, default=3)
+    parser.add_argument("--beam-width", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--max-nodes", type=int, default=200)
+    parser.add_argument("--time-budget", type=float, default=None, help="Seconds per decision.")
+    args = parser.parse_args(argv)
+
+    for game in range(args.games):
+        summary = play_headless(
+            args.days,
+            seed=args.seed + game,
+            daily_event_chance=args.event_chance,
+            max_active_contracts=args.max_active_contracts,
+            beam_width=args.beam_width,
+            depth=args.depth,
+            max_nodes=args.max_nodes,
+            time_budget=args.time_budget,
+        )
+        sys.stdout.write(json.dumps(summary) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from systems.batch_systems import BatchContractsSystem, BatchEconomySystem, BatchTimeSystem
+from world.workshop_batch import WorkshopBatch
+
+
+class BatchSimulator:
+    """Steps a ``WorkshopBatch`` through the same day loop as ``Simulator``."""
+
+    def __init__(
+        self,
+        batch: WorkshopBatch,
+        time_system: Optional[BatchTimeSystem] = None,
+        economy_system: Optional[BatchEconomySystem] = None,
+        contracts_system: Optional[BatchContractsSystem] = None,
+    ) -> None:
+        self.batch = batch
+        self.time_system = time_system if time_system is not None else BatchTimeSystem()
+        self.economy_system = economy_system if economy_system is not None else BatchEconomySystem()
+        self.contracts_system = (
+            contracts_system
+            if contracts_system is not None
+            else BatchContractsSystem(batch.max_contracts)
+        )
+
+    def step(self) -> np.ndarray:
+        """Advance every workshop by one tick and process the rows whose day rolled over."""
+        rolled = self.time_system.tick(self.batch)
+        if rolled.any():
+            self._process_day(None if rolled.all() else rolled)
+        return rolled
+
+    def advance_ticks(self, ticks: int) -> None:
+        """
+        Advance every workshop by the given number of ticks.
+
+        Raises:
+            ValueError: If ticks is negative.
+        """
+        if ticks < 0:
+            raise ValueError("ticks cannot be negative.")
+        batch = self.batch
+        ticks_per_day = self.time_system.ticks_per_day
+        remaining = ticks
+        while remaining > 0:
+            # Jump straight to the next tick on which any workshop changes day.
+            step = min(remaining, int((ticks_per_day - batch.tick_counter).min()))
+            batch.tick_counter += step
+            remaining -= step
+            rolled = batch.tick_counter >= ticks_per_day
+            if rolled.any():
+                batch.day += rolled
+                batch.tick_counter[rolled] = 0
+                self._process_day(None if rolled.all() else rolled)
+
+    def advance_days(self, days: int) -> None:
+        """Advance every workshop by ``days`` full days worth of ticks."""
+        if days < 0:
+            raise ValueError("days cannot be negative.")
+        self.advance_ticks(days * self.time_system.ticks_per_day)
+
+    def _process_day(self, mask: Optional[np.ndarray]) -> None:
+        batch = self.batch
+        self.economy_system.apply_daily_upkeep(batch, mask)
+        self.economy_system.apply_inspiration_gain(batch, mask)
+        self.contracts_system.remove_expired_contracts(batch, mask=mask)
+        self.contracts_system.maybe_generate_daily_contracts(batch, mask)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+
+@dataclass
+class Command:
+    """A player or tool input applied to the simulation, e.g. buying materials.
+
+    ``args`` must be JSON-serializable so commands can be recorded and replayed.
+    """
+
+    name: str
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+def purchase_material(material_name: str, amount: int, price_per_unit: float) -> Command:
+    return Command(
+        "purchase_material",
+        {"material_name": material_name, "amount": amount, "price_per_unit": price_per_unit},
+    )
+
+
+def purchase_materials(amounts: Dict[str, int], prices_per_unit: Dict[str, float]) -> Command:
+    return Command(
+        "purchase_materials",
+        {"amounts": dict(amounts), "prices_per_unit": dict(prices_per_unit)},
+    )
+
+
+def remove_material(material_name: str, amount: int) -> Command:
+    return Command("remove_material", {"material_name": material_name, "amount": amount})
+
+
+def decline_contract(contract_id: int) -> Command:
+    return Command("decline_contract", {"contract_id": contract_id})
+
+
+def complete_contract(contract_id: int) -> Command:
+    return Command("complete_contract", {"contract_id": contract_id})
+
+
+def accept_contract(contract_id: int, priority: int = 0) -> Command:
+    return Command("accept_contract", {"contract_id": contract_id, "priority": priority})
@@ -1,64 +1,210 @@
 from __future__ import annotations
 
-import pygame
+from typing import Any, Dict, Optional, TYPE_CHECKING
 
+from core.commands import Command
+from core.loop import TIME_SCALES, FixedTimestep
+from core.profiling import Profiler
 from core.scene import Scene
-from systems.contracts import ContractsSystem
-from systems.economy_system import EconomySystem
-from systems.time_system import TimeSystem
+from core.simulation_thread import SimulationThread
+from core.simulator import Simulator
+from core.startup import StartupReport
+from world.save_game import SaveGame
 from world.workshop_state import WorkshopState
 
+if TYPE_CHECKING:
+    import pygame
+
+    from core.autoplayer import Autoplayer
+
+# Keys are named by pygame attribute and resolved when a Game is created, so
+# importing this module does not import pygame. Number keys 1-4 select the
+# matching entry of TIME_SCALES.
+TIME_SCALE_KEYS: Dict[str, float] = {
+    "K_1": TIME_SCALES[0],
+    "K_2": TIME_SCALES[1],
+    "K_3": TIME_SCALES[2],
+    "K_4": TIME_SCALES[3],
+}
+PROFILER_TOGGLE_KEY = "K_F3"
+TRACE_EXPORT_KEY = "K_F4"
+TRACE_EXPORT_PATH = "workshop_trace.json"
+
 
 class Game:
     """Main game container handling the loop and scene management."""
 
     def __init__(
-        self, screen: pygame.Surface, initial_scene: Scene, workshop_state: WorkshopState
+        self,
+        screen: pygame.Surface,
+        initial_scene: Scene,
+        workshop_state: WorkshopState,
+        target_fps: int = 60,
+        render_fps: Optional[int] = None,
+        time_scale: float = 1.0,
+        save_game: Optional[SaveGame] = None,
+        profiler: Optional[Profiler] = None,
+        startup_report: Optional[StartupReport] = None,
+        autoplayer: Optional["Autoplayer"] = None,
+        threaded: bool = False,
     ) -> None:
+        import pygame
+
         self.screen = screen
         self.scene = initial_scene
         self.workshop_state = workshop_state
         self.clock = pygame.time.Clock()
         self.running = True
-        self.time_system = TimeSystem()
-        self.economy_system = EconomySystem()
-        self.contracts_system = ContractsSystem()
-        self._last_processed_day = workshop_state.day
+        self.target_fps = target_fps
+        self.render_fps = render_fps
+        self.save_game = save_game
+        self.profiler = profiler if profiler is not None else Profiler()
+        # The profiler records one thread's frames, so a threaded simulation
+        # gets its own.
+        self.simulator = Simulator(
+            workshop_state, profiler=Profiler() if threaded else self.profiler
+        )
+        self.time_system = self.simulator.time_system
+        self.economy_system = self.simulator.economy_system
+        self.contracts_system = self.simulator.contracts_system
+        # One simulation step is one TimeSystem tick of 1/60 s, so a day still
+        # lasts 5 s at 1x regardless of the frame rate.
+        self.timestep = FixedTimestep(step_seconds=1.0 / 60.0, time_scale=time_scale)
+        self._render_accumulator = 0.0
+        self.startup_report = startup_report
+        self.autoplayer = autoplayer
+        self._time_scale_keys = {
+            getattr(pygame, name): scale for name, scale in TIME_SCALE_KEYS.items()
+        }
+        self._profiler_toggle_key = getattr(pygame, PROFILER_TOGGLE_KEY)
+        self._trace_export_key = getattr(pygame, TRACE_EXPORT_KEY)
+        # In threaded mode the simulator, autoplayer and autosave run on a
+        # worker and the scene draws the snapshots it publishes.
+        self.simulation_thread = (
+            SimulationThread(
+                self.simulator,
+                timestep=self.timestep,
+                autoplayer=autoplayer,
+                on_days=self._autosave if save_game is not None else None,
+            )
+            if threaded
+            else None
+        )
 
     def change_scene(self, scene: Scene) -> None:
         """Switch to a different scene."""
         self.scene = scene
 
+    def set_time_scale(self, time_scale: float) -> None:
+        """Change how many simulated seconds pass per wall-clock second."""
+        if self.simulation_thread is not None:
+            self.simulation_thread.set_time_scale(time_scale)
+        else:
+            self.timestep.time_scale = time_scale
+
+    def execute(self, command: Command) -> Any:
+        """
+        Run a player command against the simulation.
+
+        In threaded mode the command is queued for the worker and a future of
+        its result is returned.
+        """
+        if self.simulation_thread is not None:
+            return self.simulation_thread.execute(command)
+        return self.simulator.execute(command)
+
     def _handle_events(self) -> None:
+        import pygame
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.KEYDOWN and event.key in self._time_scale_keys:
+                self.set_time_scale(self._time_scale_keys[event.key])
+            elif event.type == pygame.KEYDOWN and event.key == self._profiler_toggle_key:
+                self.profiler.enabled = not self.profiler.enabled
+            elif event.type == pygame.KEYDOWN and event.key == self._trace_export_key:
+                self.profiler.export_chrome_trace(TRACE_EXPORT_PATH)
             self.scene.handle_event(event)
 
     def update(self, dt: float) -> None:
-        """Update the active systems and scene."""
-        self.time_system.tick(self.workshop_state)
-        current_day = self.workshop_state.day
-        if current_day > self._last_processed_day:
-            days_passed = current_day - self._last_processed_day
-            for _ in range(days_passed):
-                self.economy_system.apply_daily_upkeep(self.workshop_state)
-                self.economy_system.apply_inspiration_gain(self.workshop_state)
-                self.contracts_system.remove_expired_contracts(
-                    self.workshop_state, self.workshop_state.day
-                )
-                self.contracts_system.maybe_generate_daily_contracts(self.workshop_state)
-            self._last_processed_day = current_day
-        self.scene.update(dt)
+        """Run the fixed simulation steps owed for this frame, then update the scene."""
+        profiler = self.profiler
+        if self.simulation_thread is not None:
+            self.scene.show_state(self.simulation_thread.latest().state)
+            with profiler.section("scene.update"):
+                self.scene.update(dt)
+            return
+        steps = self.timestep.steps_for_frame(dt)
+        if steps:
+            with profiler.section("simulation"):
+                days_processed = self.simulator.advance_ticks(steps)
+            if days_processed and self.autoplayer is not None:
+                # One decision per frame in which a day passed, within its budget.
+                with profiler.section("autoplayer"):
+                    self.autoplayer.act(self.simulator)
+            if days_processed and self.save_game is not None:
+                with profiler.section("autosave"):
+                    self._autosave(self.simulator, days_processed)
+        with profiler.section("scene.update"):
+            self.scene.update(dt)
+
+    def _autosave(self, simulator: Simulator, days_processed: int) -> None:
+        self.save_game.autosave(
+            simulator.workshop_state,
+            simulator.time_system,
+            simulator.contracts_system,
+            simulator.production_system,
+        )
+
+    def _should_render(self, dt: float) -> bool:
+        if self.render_fps is None:
+            return True
+        interval = 1.0 / self.render_fps
+        self._render_accumulator += dt
+        if self._render_accumulator < interval:
+            return False
+        self._render_accumulator %= interval
+        return True
 
     def run(self) -> None:
         """Main game loop."""
+        import pygame
+
+        first_frame_started: Optional[float] = None
+        if self.startup_report is not None and not self.startup_report.completed:
+            first_frame_started = self.startup_report.elapsed()
+        if self.simulation_thread is not None:
+            self.simulation_thread.start()
+        try:
+            self._run_frames(first_frame_started)
+        finally:
+            if self.simulation_thread is not None:
+                self.simulation_thread.stop()
+            pygame.quit()
+
+    def _run_frames(self, first_frame_started: Optional[float]) -> None:
+        import pygame
+
+        profiler = self.profiler
         while self.running:
-            dt_ms = self.clock.tick(60)
+            dt_ms = self.clock.tick(self.target_fps)
             dt = dt_ms / 1000.0
-            self._handle_events()
+            profiler.begin_frame()
+            with profiler.section("events"):
+                self._handle_events()
             self.update(dt)
-            self.scene.render(self.screen)
-            pygame.display.flip()
-
-        pygame.quit()
+            if self._should_render(dt):
+                with profiler.section("render"):
+                    dirty_rects = self.scene.render(self.screen)
+                with profiler.section("present"):
+                    if dirty_rects is None:
+                        pygame.display.flip()
+                    elif dirty_rects:
+                        pygame.display.update(dirty_rects)
+                if first_frame_started is not None:
+                    report = self.startup_report
+                    report.record("first_frame", report.elapsed() - first_frame_started)
+                    report.complete()
+                    first_frame_started = None
+            profiler.end_frame()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import math
+from typing import Tuple
+
+MAX_TIME_SCALE = math.inf
+# Tolerance so frames of exactly N steps are not lost to float rounding.
+_EPSILON = 1e-9
+TIME_SCALES: Tuple[float, ...] = (1.0, 10.0, 100.0, MAX_TIME_SCALE)
+
+
+class FixedTimestep:
+    """Converts variable frame times into a whole number of fixed simulation steps.
+
+    Frame time is scaled by ``time_scale`` and accumulated; every full
+    ``step_seconds`` in the accumulator becomes one simulation step. At
+    ``MAX_TIME_SCALE`` each frame runs ``max_steps_per_frame`` steps. When a
+    frame would need more than ``max_steps_per_frame`` steps the backlog is
+    dropped instead of carried over, so a slow frame cannot snowball into
+    ever longer catch-up frames.
+    """
+
+    def __init__(
+        self,
+        step_seconds: float = 1.0 / 60.0,
+        time_scale: float = 1.0,
+        max_steps_per_frame: int = 10_000,
+        max_frame_seconds: float = 0.25,
+    ) -> None:
+        if step_seconds <= 0:
+            raise ValueError("step_seconds must be positive.")
+        if max_steps_per_frame <= 0:
+            raise ValueError("max_steps_per_frame must be positive.")
+        if max_frame_seconds <= 0:
+            raise ValueError("max_frame_seconds must be positive.")
+        self.step_seconds = step_seconds
+        self.max_steps_per_frame = max_steps_per_frame
+        self.max_frame_seconds = max_frame_seconds
+        self.time_scale = time_scale
+        self.dropped_steps = 0
+        self._accumulator = 0.0
+
+    @property
+    def time_scale(self) -> float:
+        return self._time_scale
+
+    @time_scale.setter
+    def time_scale(self, value: float) -> None:
+        if value <= 0:
+            raise ValueError("time_scale must be positive.")
+        self._time_scale = value
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a step left in the accumulator, for render interpolation."""
+        return self._accumulator / self.step_seconds
+
+    def steps_for_frame(self, dt: float) -> int:
+        """Return how many simulation steps to run for a frame lasting ``dt`` seconds."""
+        if self._time_scale == MAX_TIME_SCALE:
+            self._accumulator = 0.0
+            return self.max_steps_per_frame
+
+        self._accumulator += min(max(dt, 0.0), self.max_frame_seconds) * self._time_scale
+        steps = int((self._accumulator + _EPSILON) // self.step_seconds)
+        if steps > self.max_steps_per_frame:
+            self.dropped_steps += steps - self.max_steps_per_frame
+            self._accumulator = 0.0
+            return self.max_steps_per_frame
+        self._accumulator = max(0.0, self._accumulator - steps * self.step_seconds)
+        return steps
+
+    def reset(self) -> None:
+        self._accumulator = 0.0
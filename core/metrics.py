@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import ast
+import csv
+import io
+import struct
+import sys
+import zipfile
+from array import array
+from collections import deque
+from typing import IO, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING, Union
+
+from systems.contracts import KNOWN_MATERIALS
+from world.state_changes import Subscription
+from world.workshop_state import WorkshopState
+
+if TYPE_CHECKING:
+    from core.simulator import Simulator
+
+METRICS: Tuple[str, ...] = ("money", "reputation", "inspiration", *KNOWN_MATERIALS, "contracts")
+STATS: Tuple[str, ...] = ("min", "max", "mean")
+# ``day`` is the first day in a row's bucket and ``days`` how many days it covers.
+COLUMNS: Tuple[str, ...] = (
+    "day",
+    "days",
+    *(f"{metric}_{stat}" for metric in METRICS for stat in STATS),
+)
+OVERFLOW_MODES = ("ring", "downsample")
+
+
+class MetricsRecorder:
+    """Per-day time series of workshop metrics in preallocated columnar arrays.
+
+    Every column is an ``array`` of ``capacity`` slots allocated up front. When
+    the arrays are full, ``overflow="ring"`` overwrites the oldest day (for
+    interactive sessions) and ``overflow="downsample"`` merges neighbouring
+    rows in place, doubling the days per row, so a run of any length fits in
+    ``capacity`` rows with min/max/mean per bucket. ``segments`` exposes the
+    columns as memoryviews for readers such as the history graph; a recorder
+    attached with ``deferred=True`` only writes them in ``flush``, on the
+    reader's thread.
+    """
+
+    def __init__(self, capacity: int = 4096, overflow: str = "ring") -> None:
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2.")
+        if overflow not in OVERFLOW_MODES:
+            raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_MODES)}.")
+        self.capacity = capacity
+        self.overflow = overflow
+        self.bucket_days = 1
+        self.total_days = 0
+        self._length = 0
+        self._start = 0
+        self._columns: Dict[str, array] = {
+            name: array("q" if name in ("day", "days") else "d", bytes(8 * capacity))
+            for name in COLUMNS
+        }
+        # (min, max, mean) columns per metric, in METRICS order.
+        self._stat_columns = [
+            tuple(self._columns[f"{metric}_{stat}"] for stat in STATS) for metric in METRICS
+        ]
+        self._subscription: Optional[Subscription] = None
+        # (day, values) sampled on the simulation thread, awaiting ``flush``.
+        self._pending: "deque[Tuple[int, Tuple[float, ...]]]" = deque()
+
+    def attach(self, simulator: "Simulator", deferred: bool = False) -> "MetricsRecorder":
+        """
+        Record every day the simulator processes from now on.
+
+        With ``deferred``, days are only sampled on the simulator's thread and
+        written into the columns by ``flush``, so a simulator stepped on a
+        worker thread never touches what readers see.
+        """
+        self.detach()
+        self._subscription = simulator.add_day_hook(self._sample if deferred else self.record)
+        return self
+
+    def detach(self) -> None:
+        if self._subscription is not None:
+            self._subscription.cancel()
+            self._subscription = None
+
+    def record(self, workshop_state: WorkshopState) -> None:
+        """Append the state's metrics as one day."""
+        self._append(workshop_state.day, _metric_values(workshop_state))
+
+    def flush(self) -> int:
+        """
+        Write the days sampled by a deferred ``attach`` into the columns.
+
+        Returns:
+            The number of days written.
+        """
+        pending = self._pending
+        written = 0
+        # deque.popleft is atomic, so the simulation thread may keep sampling.
+        while pending:
+            self._append(*pending.popleft())
+            written += 1
+        return written
+
+    def _sample(self, workshop_state: WorkshopState) -> None:
+        self._pending.append((workshop_state.day, _metric_values(workshop_state)))
+
+    def _append(self, day: int, values: Tuple[float, ...]) -> None:
+        self.total_days += 1
+        days = self._columns["days"]
+        if self.overflow == "downsample":
+            last = self._length - 1
+            if last >= 0 and days[last] < self.bucket_days:
+                self._merge_value(last, values)
+                return
+            if self._length == self.capacity:
+                self._halve()
+                last = self._length - 1
+                if days[last] < self.bucket_days:
+                    self._merge_value(last, values)
+                    return
+            index = self._length
+            self._length += 1
+        elif self._length < self.capacity:
+            index = self._length
+            self._length += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+
+        self._columns["day"][index] = day
+        days[index] = 1
+        for (low, high, mean), value in zip(self._stat_columns, values):
+            low[index] = high[index] = mean[index] = value
+
+    def segments(self, column: str) -> Tuple[memoryview, ...]:
+        """
+        Return a column's recorded rows, oldest first, without copying.
+
+        A wrapped ring buffer yields two views; concatenated they are in order.
+
+        Raises:
+            ValueError: If the column is unknown.
+        """
+        data = self._columns.get(column)
+        if data is None:
+            raise ValueError(f"Unknown metrics column '{column}'.")
+        view = memoryview(data)
+        if self._start == 0:
+            return (view[: self._length],)
+        return (view[self._start : self._length], view[: self._start])
+
+    def values(self, column: str) -> List[float]:
+        """Return a copy of a column, oldest first."""
+        return [value for segment in self.segments(column) for value in segment]
+
+    def iter_rows(self) -> Iterator[Tuple[Union[int, float], ...]]:
+        """Yield rows oldest first, one value per entry of ``COLUMNS``."""
+        columns = [self._columns[name] for name in COLUMNS]
+        for index in self._row_order():
+            yield tuple(column[index] for column in columns)
+
+    def iter_csv(self) -> Iterator[str]:
+        """Yield the table as CSV text, the header first and then one line per row."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for row in self._csv_rows():
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    def write_csv(self, target: Union[str, IO[str]]) -> None:
+        """Stream the table to a CSV file path or text handle."""
+        if isinstance(target, str):
+            with open(target, "w", encoding="utf-8", newline="") as handle:
+                handle.writelines(self.iter_csv())
+        else:
+            target.writelines(self.iter_csv())
+
+    def write_npz(self, path: str) -> None:
+        """
+        Stream every column into a NumPy ``.npz`` archive, one array per column.
+
+        The arrays' memory is written straight into the archive, so numpy is
+        only needed to read the file back.
+        """
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+            for name in COLUMNS:
+                with archive.open(f"{name}.npy", "w", force_zip64=True) as member:
+                    member.write(_npy_header(self._columns[name].typecode, self._length))
+                    for segment in self.segments(name):
+                        member.write(segment)
+
+    @classmethod
+    def read_npz(cls, path: str) -> "MetricsRecorder":
+        """
+        Load an archive written by ``write_npz`` into a downsampling recorder.
+
+        Raises:
+            ValueError: If the archive is not a metrics export.
+        """
+        columns: Dict[str, array] = {}
+        try:
+            with zipfile.ZipFile(path) as archive:
+                for name in COLUMNS:
+                    data = archive.read(f"{name}.npy")
+                    typecode = "q" if name in ("day", "days") else "d"
+                    columns[name] = _read_npy(data, typecode)
+        except (KeyError, zipfile.BadZipFile) as exc:
+            raise ValueError(f"'{path}' is not a metrics archive: {exc}") from exc
+        length = len(columns["day"])
+        if any(len(column) != length for column in columns.values()):
+            raise ValueError(f"'{path}' has columns of different lengths.")
+        recorder = cls(max(length, 2), overflow="downsample")
+        for name, column in columns.items():
+            recorder._columns[name][:length] = column
+        recorder._length = length
+        recorder.total_days = sum(columns["days"])
+        recorder.bucket_days = max(columns["days"], default=1)
+        return recorder
+
+    def clear(self) -> None:
+        self.bucket_days = 1
+        self.total_days = 0
+        self._length = 0
+        self._start = 0
+        self._pending.clear()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _csv_rows(self) -> Iterator[Tuple[object, ...]]:
+        yield COLUMNS
+        yield from self.iter_rows()
+
+    def _row_order(self) -> Iterator[int]:
+        yield from range(self._start, self._length)
+        yield from range(self._start)
+
+    def _merge_value(self, index: int, values: Tuple[float, ...]) -> None:
+        days = self._columns["days"]
+        count = days[index] + 1
+        days[index] = count
+        for (low, high, mean), value in zip(self._stat_columns, values):
+            if value < low[index]:
+                low[index] = value
+            if value > high[index]:
+                high[index] = value
+            mean[index] += (value - mean[index]) / count
+
+    def _halve(self) -> None:
+        # Merge rows (0, 1), (2, 3), ... into rows 0, 1, ...; an odd last row
+        # moves down unmerged and stays open for the next days.
+        day, days = self._columns["day"], self._columns["days"]
+        length = self._length
+        for target, source in enumerate(range(0, length, 2)):
+            pair = source + 1
+            day[target] = day[source]
+            if pair >= length:
+                days[target] = days[source]
+                for low, high, mean in self._stat_columns:
+                    low[target] = low[source]
+                    high[target] = high[source]
+                    mean[target] = mean[source]
+                continue
+            first, second = days[source], days[pair]
+            total = first + second
+            days[target] = total
+            for low, high, mean in self._stat_columns:
+                low[target] = min(low[source], low[pair])
+                high[target] = max(high[source], high[pair])
+                mean[target] = (mean[source] * first + mean[pair] * second) / total
+        self._length = (length + 1) // 2
+        self.bucket_days *= 2
+
+
+def _metric_values(workshop_state: WorkshopState) -> Tuple[float, ...]:
+    """The state's value for every entry of ``METRICS``."""
+    return (
+        workshop_state.money,
+        workshop_state.reputation,
+        workshop_state.inspiration,
+        *workshop_state.materials.counts,
+        len(workshop_state.active_contracts),
+    )
+
+
+def _npy_header(typecode: str, length: int) -> bytes:
+    """Version 1.0 ``.npy`` header for a one-dimensional array of 8-byte items."""
+    order = "<" if sys.byteorder == "little" else ">"
+    kind = "f8" if typecode == "d" else "i8"
+    header = f"{{'descr': '{order}{kind}', 'fortran_order': False, 'shape': ({length},), }}"
+    # Magic, version and length take 10 bytes; the whole header pads to 64.
+    header += " " * (-(10 + len(header) + 1) % 64) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+def _read_npy(data: bytes, typecode: str) -> array:
+    """Parse a ``.npy`` blob written by ``_npy_header`` back into an array."""
+    if data[:8] != b"\x93NUMPY\x01\x00":
+        raise ValueError("Unsupported .npy format.")
+    (header_length,) = struct.unpack("<H", data[8:10])
+    header = ast.literal_eval(data[10 : 10 + header_length].decode("latin1"))
+    values = array(typecode)
+    values.frombytes(data[10 + header_length :])
+    if header["descr"][0] != ("<" if sys.byteorder == "little" else ">"):
+        values.byteswap()
+    return values
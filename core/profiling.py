@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+FRAME = "frame"
+
+
+class _NullSection:
+    """Shared no-op context manager returned while profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._profiler.record(self._name, self._start, time.perf_counter())
+
+
+class Profiler:
+    """Toggleable timing of game-loop phases and system calls.
+
+    Keeps a rolling window of durations per section (for p50/p95/p99), running
+    counters, and a bounded buffer of Chrome trace events. While ``enabled`` is
+    False ``section`` returns a shared no-op context manager and nothing is
+    recorded; hot loops should additionally check ``enabled`` themselves.
+    """
+
+    def __init__(
+        self, enabled: bool = False, history: int = 600, max_trace_events: int = 100_000
+    ) -> None:
+        if history <= 0:
+            raise ValueError("history must be positive.")
+        self.enabled = enabled
+        self.history = history
+        self.counters: Dict[str, int] = defaultdict(int)
+        self._durations: Dict[str, Deque[float]] = {}
+        self._trace_events: Deque[Dict[str, Any]] = deque(maxlen=max_trace_events)
+        self._origin = time.perf_counter()
+        self._frame_start: Optional[float] = None
+
+    def section(self, name: str) -> Any:
+        """Context manager timing the enclosed block under ``name``."""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def begin_frame(self) -> None:
+        if self.enabled:
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        if self.enabled and self._frame_start is not None:
+            self.record(FRAME, self._frame_start, time.perf_counter())
+        self._frame_start = None
+
+    def record(self, name: str, start: float, end: float) -> None:
+        """Store one timed span given ``perf_counter`` start and end values."""
+        durations = self._durations.get(name)
+        if durations is None:
+            durations = self._durations[name] = deque(maxlen=self.history)
+        durations.append(end - start)
+        self._trace_events.append(
+            {
+                "name": name,
+                "cat": "workshop",
+                "ph": "X",
+                "ts": (start - self._origin) * 1_000_000,
+                "dur": (end - start) * 1_000_000,
+                "pid": os.getpid(),
+                "tid": 0,
+            }
+        )
+
+    def count(self, name: str, amount: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] += amount
+
+    def percentiles(self, name: str = FRAME) -> Dict[str, float]:
+        """Return p50/p95/p99 of the rolling window for a section, in milliseconds."""
+        durations = sorted(self._durations.get(name, ()))
+        if not durations:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        last = len(durations) - 1
+        return {
+            label: durations[min(last, int(round(fraction * last)))] * 1000.0
+            for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+        }
+
+    def per_day(self, counter: str) -> float:
+        """Average value of a counter per processed day."""
+        days = self.counters.get("days_processed", 0)
+        return self.counters.get(counter, 0) / days if days else 0.0
+
+    def sections(self) -> List[str]:
+        return sorted(self._durations)
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self._durations.clear()
+        self._trace_events.clear()
+
+    def export_chrome_trace(self, path: str) -> None:
+        """Write recorded spans as Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"traceEvents": list(self._trace_events), "displayTimeUnit": "ms"}, handle)
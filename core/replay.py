@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from core.commands import Command
+from core.simulator import Simulator
+from systems.contracts import ContractsSystem
+from systems.production_system import ProductionSystem
+from systems.random_events import RandomEvent, RandomEventSystem
+from systems.rng import RandomService
+from systems.time_system import TimeSystem
+from world.save_game import decode_snapshot, encode_snapshot
+from world.workshop_state import WorkshopRoom, WorkshopState
+
+
+def state_fingerprint(workshop_state: WorkshopState) -> str:
+    """Stable digest of every gameplay-relevant field of a workshop state."""
+    contracts = [
+        [
+            contract.id,
+            contract.name,
+            repr(contract.reward_money),
+            contract.duration_days,
+            repr(contract.prestige),
+            sorted(contract.materials_required.items()),
+            str(getattr(contract.puzzle_type, "value", contract.puzzle_type)),
+            contract.puzzle_difficulty,
+            contract.start_day,
+            contract.patron,
+        ]
+        for contract in workshop_state.active_contracts
+    ]
+    payload = [
+        workshop_state.day,
+        repr(workshop_state.money),
+        repr(workshop_state.reputation),
+        repr(workshop_state.inspiration),
+        sorted(workshop_state.materials.items()),
+        repr(workshop_state.daily_upkeep),
+        repr(workshop_state.inspiration_gain),
+        contracts,
+        [room.value for room in workshop_state.rooms],
+    ]
+    return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RecordedInput:
+    tick: int
+    command: Command
+
+
+@dataclass
+class Recording:
+    """Everything needed to re-run a session: start state, random streams, settings and inputs.
+
+    Input ticks count from the start of the recording. ``rng_state`` holds the
+    position of every random stream when recording began and ``events`` the
+    random event pool; None means the built-in pool, for older recordings.
+    """
+
+    seed: int
+    ticks_per_day: int
+    max_active_contracts: int
+    initial_snapshot: bytes
+    daily_event_chance: float = 0.0
+    # Production room capacities by room name; the jobs are in the snapshot.
+    room_capacity: Dict[str, int] = field(default_factory=dict)
+    rng_state: Dict[str, Any] = field(default_factory=dict)
+    events: Optional[List[Dict[str, Any]]] = None
+    inputs: List[RecordedInput] = field(default_factory=list)
+    final_tick: int = 0
+    final_fingerprint: Optional[str] = None
+
+    def save(self, path: str) -> None:
+        """Write the recording as JSON lines: a header, then one line per input."""
+        header = {
+            "seed": self.seed,
+            "ticks_per_day": self.ticks_per_day,
+            "max_active_contracts": self.max_active_contracts,
+            "initial_snapshot": base64.b64encode(self.initial_snapshot).decode("ascii"),
+            "daily_event_chance": self.daily_event_chance,
+            "room_capacity": self.room_capacity,
+            "rng_state": self.rng_state,
+            "events": self.events,
+            "final_tick": self.final_tick,
+            "final_fingerprint": self.final_fingerprint,
+        }
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps(header) + "\n")
+            for entry in self.inputs:
+                handle.write(
+                    json.dumps([entry.tick, entry.command.name, entry.command.args]) + "\n"
+                )
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path, "r", encoding="utf-8") as handle:
+            header = json.loads(handle.readline())
+            inputs = []
+            for line in handle:
+                if line.strip():
+                    tick, name, args = json.loads(line)
+                    inputs.append(RecordedInput(tick, Command(name, args)))
+        return cls(
+            seed=header["seed"],
+            ticks_per_day=header["ticks_per_day"],
+            max_active_contracts=header["max_active_contracts"],
+            initial_snapshot=base64.b64decode(header["initial_snapshot"]),
+            daily_event_chance=header.get("daily_event_chance", 0.0),
+            room_capacity=header.get("room_capacity", {}),
+            rng_state=header.get("rng_state", {}),
+            events=header.get("events"),
+            inputs=inputs,
+            final_tick=header["final_tick"],
+            final_fingerprint=header["final_fingerprint"],
+        )
+
+
+class InputRecorder:
+    """Logs the commands a ``Simulator`` executes against the tick they happened on."""
+
+    def __init__(self, simulator: Simulator) -> None:
+        self._start_tick = simulator.elapsed_ticks
+        self.recording = Recording(
+            seed=simulator.rng.seed,
+            ticks_per_day=simulator.time_system.ticks_per_day,
+            max_active_contracts=simulator.contracts_system.max_active_contracts,
+            initial_snapshot=encode_snapshot(
+                simulator.workshop_state,
+                simulator.time_system,
+                simulator.contracts_system,
+                simulator.production_system,
+            ),
+            daily_event_chance=simulator.random_event_system.daily_event_chance,
+            room_capacity={
+                room.value: slots
+                for room, slots in simulator.production_system.room_capacity.items()
+            },
+            rng_state=simulator.rng.getstate(),
+            events=[
+                event.to_dict() for event in simulator.random_event_system.possible_events()
+            ],
+        )
+
+    @classmethod
+    def attach(cls, simulator: Simulator) -> "InputRecorder":
+        """Start recording everything ``simulator`` executes from now on."""
+        recorder = cls(simulator)
+        simulator.recorder = recorder
+        return recorder
+
+    def record(self, tick: int, command: Command) -> None:
+        self.recording.inputs.append(
+            RecordedInput(tick - self._start_tick, Command(command.name, dict(command.args)))
+        )
+
+    def finish(self, simulator: Simulator) -> Recording:
+        """Stop recording and stamp the final tick and state fingerprint."""
+        if simulator.recorder is self:
+            simulator.recorder = None
+        self.recording.final_tick = simulator.elapsed_ticks - self._start_tick
+        self.recording.final_fingerprint = state_fingerprint(simulator.workshop_state)
+        return self.recording
+
+
+class Replayer:
+    """Re-runs a ``Recording`` headlessly at full speed."""
+
+    def __init__(self, recording: Recording) -> None:
+        self.recording = recording
+
+    def build_simulator(self) -> Simulator:
+        recording = self.recording
+        production_system = ProductionSystem(
+            {WorkshopRoom(name): slots for name, slots in recording.room_capacity.items()}
+        )
+        workshop_state, tick_counter, next_contract_id = decode_snapshot(
+            recording.initial_snapshot, production_system
+        )
+        time_system = TimeSystem(ticks_per_day=recording.ticks_per_day)
+        time_system.tick_counter = tick_counter
+        contracts_system = ContractsSystem(max_active_contracts=recording.max_active_contracts)
+        if next_contract_id > 0:
+            contracts_system.next_contract_id = next_contract_id
+        rng = RandomService(recording.seed)
+        rng.setstate(recording.rng_state)
+        events = (
+            None
+            if recording.events is None
+            else [RandomEvent.from_dict(data) for data in recording.events]
+        )
+        return Simulator(
+            workshop_state,
+            time_system=time_system,
+            contracts_system=contracts_system,
+            rng=rng,
+            random_event_system=RandomEventSystem(
+                rng, events, daily_event_chance=recording.daily_event_chance
+            ),
+            production_system=production_system,
+        )
+
+    def run(self) -> Simulator:
+        """Replay every input at its recorded tick and run on to the final tick."""
+        simulator = self.build_simulator()
+        for entry in self.recording.inputs:
+            simulator.advance_ticks(entry.tick - simulator.elapsed_ticks)
+            simulator.execute(entry.command)
+        simulator.advance_ticks(max(0, self.recording.final_tick - simulator.elapsed_ticks))
+        return simulator
+
+    def verify(self) -> bool:
+        """Replay and check the final state matches the recorded fingerprint."""
+        simulator = self.run()
+        return state_fingerprint(simulator.workshop_state) == self.recording.final_fingerprint
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from core.metrics import MetricsRecorder
+
+# Packages whose source decides simulation results; editing any of them
+# changes the code version and so misses every older cache entry.
+SIMULATION_PACKAGES = ("core", "systems", "world")
+SUMMARY_SUFFIX = ".json"
+METRICS_SUFFIX = ".npz"
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    """Hash of the simulation source files, computed once per process."""
+    root = Path(__file__).resolve().parent.parent
+    digest = hashlib.sha256()
+    for package in SIMULATION_PACKAGES:
+        for path in sorted((root / package).glob("*.py")):
+            digest.update(path.relative_to(root).as_posix().encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(
+    kind: str,
+    config: Dict[str, Any],
+    days: int,
+    seed: int = 0,
+    version: Optional[str] = None,
+) -> str:
+    """
+    Stable hex key for one run: what ran, its full configuration, length,
+    seed and the code version.
+
+    Raises:
+        ValueError: If the configuration is not JSON serializable.
+    """
+    try:
+        canonical = json.dumps(
+            {
+                "kind": kind,
+                "config": config,
+                "days": days,
+                "seed": seed,
+                "version": code_version() if version is None else version,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            allow_nan=False,
+        )
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Cannot hash configuration: {exc}") from exc
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Content-addressed on-disk store of run summaries and metric series.
+
+    Entries live under ``directory/<key[:2]>/<key>`` as a JSON summary plus an
+    optional ``.npz`` of metrics. Every file is written to a temporary name
+    and moved into place with ``os.replace``, so any number of processes can
+    share the directory without locks: readers see a whole entry or none, and
+    writers racing on a key store identical content. Reads refresh an entry's
+    modification time, and once the store grows past ``max_bytes`` the least
+    recently used entries are deleted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive.")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Bytes written since the last size scan; None until the first scan.
+        self._written_since_scan: Optional[int] = None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached summary for ``key``, or None on a miss."""
+        path = self._path(key, SUMMARY_SUFFIX)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                summary = json.load(handle)
+            _touch(path)
+            if summary.get("metrics"):
+                _touch(self._path(key, METRICS_SUFFIX))
+        except (OSError, ValueError):
+            # Missing, evicted by another process mid-read, or unreadable.
+            self.misses += 1
+            return None
+        self.hits += 1
+        return summary["result"]
+
+    def get_metrics(self, key: str) -> Optional[MetricsRecorder]:
+        """Return the metric series stored with ``key``, or None if there is none."""
+        try:
+            return MetricsRecorder.read_npz(str(self._path(key, METRICS_SUFFIX)))
+        except (OSError, ValueError):
+            return None
+
+    def put(
+        self,
+        key: str,
+        result: Dict[str, Any],
+        metrics: Optional[MetricsRecorder] = None,
+    ) -> None:
+        """
+        Store a run's summary, and optionally its metrics, under ``key``.
+
+        Raises:
+            ValueError: If the summary is not JSON serializable.
+        """
+        try:
+            payload = json.dumps({"result": result, "metrics": metrics is not None})
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Cannot cache result: {exc}") from exc
+        written = 0
+        if metrics is not None:
+            # The metrics go first so a visible summary always has them.
+            written += self._write_atomic(
+                self._path(key, METRICS_SUFFIX), lambda path: metrics.write_npz(path)
+            )
+        written += self._write_atomic(
+            self._path(key, SUMMARY_SUFFIX),
+            lambda path: Path(path).write_text(payload, encoding="utf-8"),
+        )
+        self._note_written(written)
+
+    def size(self) -> int:
+        """Bytes currently stored."""
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self) -> int:
+        """
+        Delete least recently used entries until the store fits ``max_bytes``.
+
+        Returns:
+            The number of files deleted.
+        """
+        # Group files by key so a summary and its metrics leave together.
+        groups: Dict[str, Tuple[float, List[Path], int]] = {}
+        for mtime, path, size in self._entries():
+            latest, paths, total_size = groups.get(path.stem, (mtime, [], 0))
+            groups[path.stem] = (max(latest, mtime), paths + [path], total_size + size)
+        total = sum(size for _, _, size in groups.values())
+        removed = 0
+        for _, paths, size in sorted(groups.values(), key=lambda group: group[0]):
+            if total <= self.max_bytes:
+                break
+            # Summary first, so readers never find a summary without its metrics.
+            for path in sorted(paths, key=lambda path: path.suffix != SUMMARY_SUFFIX):
+                try:
+                    path.unlink()
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+            total -= size
+        self._written_since_scan = 0
+        return removed
+
+    def clear(self) -> None:
+        for _, path, _ in list(self._entries()):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        self._written_since_scan = 0
+
+    def _path(self, key: str, suffix: str) -> Path:
+        if len(key) < 3 or not all(char in "0123456789abcdef" for char in key):
+            raise ValueError(f"Invalid cache key '{key}'.")
+        return self.directory / key[:2] / f"{key}{suffix}"
+
+    def _write_atomic(self, path: Path, write: Callable[[str], Any]) -> int:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(
+            dir=path.parent, prefix=".tmp-", suffix=path.suffix
+        )
+        os.close(descriptor)
+        try:
+            write(temporary)
+            size = os.path.getsize(temporary)
+            os.replace(temporary, path)
+        except BaseException:
+            try:
+                os.unlink(temporary)
+            except FileNotFoundError:
+                pass
+            raise
+        return size
+
+    def _note_written(self, written: int) -> None:
+        # Scanning the whole store on every write would make puts O(entries);
+        # scan on the first write and then after every sixteenth of the budget.
+        if self._written_since_scan is not None:
+            self._written_since_scan += written
+            if self._written_since_scan < self.max_bytes // 16:
+                return
+        self.evict()
+
+    def _entries(self) -> Iterator[Tuple[float, Path, int]]:
+        if not self.directory.is_dir():
+            return
+        for shard in self.directory.iterdir():
+            if not shard.is_dir():
+                continue
+            for path in shard.iterdir():
+                if path.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, path, stat.st_size
+
+    def __len__(self) -> int:
+        return sum(1 for _, path, _ in self._entries() if path.suffix == SUMMARY_SUFFIX)
+
+
+def _touch(path: Path) -> None:
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
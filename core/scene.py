@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-import pygame
+from typing import List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pygame
+
+    from world.workshop_state import WorkshopState
 
 
 class Scene:
@@ -18,6 +23,14 @@ class Scene:
         """
         raise NotImplementedError
 
-    def render(self, surface: pygame.Surface) -> None:
-        """Render the scene to the given surface."""
+    def show_state(self, workshop_state: WorkshopState) -> None:
+        """Display ``workshop_state`` from now on, such as a newer simulation snapshot."""
+
+    def render(self, surface: pygame.Surface) -> Optional[List[pygame.Rect]]:
+        """Render the scene to the given surface.
+
+        Returns:
+            The rectangles that changed, or None if the whole surface should be
+            presented.
+        """
         raise NotImplementedError
@@ -0,0 +1,587 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from core.commands import (
+    Command,
+    accept_contract,
+    complete_contract,
+    decline_contract,
+    purchase_material,
+)
+from core.simulator import Simulator
+
+Request = Dict[str, Any]
+Response = Dict[str, Any]
+
+
+class LatencyStats:
+    """Rolling window of request latencies, from receipt to reply."""
+
+    __slots__ = ("_samples", "count", "max_seconds")
+
+    def __init__(self, window: int = 256) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def summary(self) -> Dict[str, float]:
+        """Return request count and p50/p95/max latency in milliseconds."""
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        last = len(samples) - 1
+        return {
+            "count": self.count,
+            "p50_ms": samples[int(round(0.50 * last))] * 1000.0,
+            "p95_ms": samples[int(round(0.95 * last))] * 1000.0,
+            "max_ms": self.max_seconds * 1000.0,
+        }
+
+
+class Session:
+    """One player's workshop and its request/reply queues.
+
+    The simulator is created on the first request that needs it, so a
+    connected but idle session only costs its queues.
+    """
+
+    __slots__ = (
+        "session_id",
+        "inbox",
+        "outbox",
+        "latency",
+        "time_scale",
+        "scheduled",
+        "_tick_carry",
+        "_factory",
+        "_simulator",
+    )
+
+    def __init__(
+        self,
+        session_id: int,
+        factory: Callable[[], Simulator],
+        queue_size: int,
+        outbox_size: int,
+    ) -> None:
+        self.session_id = session_id
+        # (receipt time, request, parse error)
+        self.inbox: "asyncio.Queue[Tuple[float, Request, Optional[str]]]" = asyncio.Queue(
+            queue_size
+        )
+        self.outbox: "asyncio.Queue[Response]" = asyncio.Queue(outbox_size)
+        self.latency = LatencyStats()
+        self.time_scale = 0.0
+        self.scheduled = False
+        self._tick_carry = 0.0
+        self._factory = factory
+        self._simulator: Optional[Simulator] = None
+
+    @property
+    def simulator(self) -> Simulator:
+        if self._simulator is None:
+            self._simulator = self._factory()
+        return self._simulator
+
+    @property
+    def started(self) -> bool:
+        return self._simulator is not None
+
+
+class SessionServer:
+    """Hosts many workshops in one process behind a newline-delimited JSON protocol.
+
+    Each connection is a session. Requests look like
+    ``{"id": 1, "op": "advance", "days": 2}`` and replies like
+    ``{"id": 1, "ok": true, "result": {...}}``. A single scheduler task does
+    all simulation work: it serves sessions with queued requests round-robin,
+    a few requests per turn, and advances every running session's clock in
+    one batch per ``tick_interval``. Idle sessions are never visited.
+
+    Backpressure: a session's inbox and outbox are bounded. A session whose
+    replies are not being read is skipped by the scheduler, its inbox then
+    fills, and the server stops reading from its socket.
+
+    Every request runs on the shared scheduler, so its cost is bounded:
+    ``advance`` covers at most ``max_advance_days``, ``run`` accepts time
+    scales up to ``max_time_scale`` and a request line may be at most
+    ``max_request_bytes`` long. A running session whose simulation fails is
+    stopped with an error reply; the others keep running.
+    """
+
+    # A scheduler stalled for longer than this many tick intervals drops the
+    # backlog instead of catching up, as ``FixedTimestep`` does for frames.
+    MAX_CATCH_UP_INTERVALS = 4
+
+    def __init__(
+        self,
+        simulator_factory: Callable[[], Simulator] = Simulator,
+        max_sessions: int = 10_000,
+        queue_size: int = 16,
+        outbox_size: int = 64,
+        tick_rate: float = 60.0,
+        tick_interval: float = 0.05,
+        max_requests_per_turn: int = 4,
+        max_advance_days: int = 3650,
+        max_time_scale: float = 1000.0,
+        max_request_bytes: int = 64 * 1024,
+    ) -> None:
+        if queue_size <= 0 or outbox_size <= 0:
+            raise ValueError("Queue sizes must be positive.")
+        if tick_rate < 0:
+            raise ValueError("tick_rate cannot be negative.")
+        if tick_interval <= 0:
+            raise ValueError("tick_interval must be positive.")
+        if max_requests_per_turn <= 0:
+            raise ValueError("max_requests_per_turn must be positive.")
+        if max_advance_days <= 0:
+            raise ValueError("max_advance_days must be positive.")
+        if not (math.isfinite(max_time_scale) and max_time_scale > 0):
+            raise ValueError("max_time_scale must be positive and finite.")
+        if max_request_bytes <= 0:
+            raise ValueError("max_request_bytes must be positive.")
+        self.simulator_factory = simulator_factory
+        self.max_sessions = max_sessions
+        self.queue_size = queue_size
+        self.outbox_size = outbox_size
+        self.tick_rate = tick_rate
+        self.tick_interval = tick_interval
+        self.max_requests_per_turn = max_requests_per_turn
+        self.max_advance_days = max_advance_days
+        self.max_time_scale = max_time_scale
+        self.max_request_bytes = max_request_bytes
+        self.sessions: Dict[int, Session] = {}
+        self.requests_served = 0
+        self._next_session_id = 1
+        self._ready: Deque[Session] = deque()
+        self._running: Set[Session] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._scheduler: Optional["asyncio.Task[None]"] = None
+        self._connections: Set["asyncio.Task[Any]"] = set()
+        self._ops: Dict[str, Callable[[Session, Request], Any]] = {
+            "state": self._op_state,
+            "advance": self._op_advance,
+            "buy": self._op_buy,
+            "contracts": self._op_contracts,
+            "complete": self._op_complete,
+            "accept": self._op_accept,
+            "decline": self._op_decline,
+            "run": self._op_run,
+            "stats": self._op_stats,
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening and return the bound port."""
+        self._wakeup = asyncio.Event()
+        self._scheduler = asyncio.create_task(self._run_scheduler())
+        self._server = await asyncio.start_server(
+            self._handle_connection, host, port, limit=self.max_request_bytes
+        )
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop accepting connections, drop every session and stop the scheduler."""
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+        for task in list(self._connections):
+            task.cancel()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if server is not None:
+            # Only after the connections are gone: newer Pythons wait for them here.
+            await server.wait_closed()
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            await asyncio.gather(self._scheduler, return_exceptions=True)
+            self._scheduler = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Server-wide counts plus per-session latency summaries."""
+        return {
+            "sessions": len(self.sessions),
+            "started": sum(1 for session in self.sessions.values() if session.started),
+            "running": len(self._running),
+            "requests_served": self.requests_served,
+            "latency": {
+                session_id: session.latency.summary()
+                for session_id, session in self.sessions.items()
+                if session.latency.count
+            },
+        }
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+        try:
+            await self._serve_connection(reader, writer)
+        except asyncio.CancelledError:
+            # Server shutdown; end quietly so asyncio does not log the cancellation.
+            pass
+        finally:
+            self._connections.discard(task)
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(_encode({"ok": False, "error": "Server is full."}))
+            await _close_writer(writer)
+            return
+
+        session = Session(
+            self._next_session_id, self.simulator_factory, self.queue_size, self.outbox_size
+        )
+        self._next_session_id += 1
+        self.sessions[session.session_id] = session
+        writer.write(_encode({"ok": True, "session": session.session_id}))
+        replies = asyncio.create_task(self._write_replies(session, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                received = time.perf_counter()
+                error: Optional[str] = None
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request, error = {}, "Request is not valid JSON."
+                if not isinstance(request, dict):
+                    request, error = {}, "Request must be a JSON object."
+                # Blocks while the inbox is full, which stops reading the socket.
+                await session.inbox.put((received, request, error))
+                self._schedule(session)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:
+            # readline raises this once a line outgrows the stream limit.
+            writer.write(_encode({"id": None, "ok": False, "error": "Request too long."}))
+        finally:
+            del self.sessions[session.session_id]
+            self._running.discard(session)
+            replies.cancel()
+            writer.close()
+        await asyncio.gather(replies, return_exceptions=True)
+        await _close_writer(writer)
+
+    async def _write_replies(self, session: Session, writer: asyncio.StreamWriter) -> None:
+        outbox = session.outbox
+        while True:
+            replies = [await outbox.get()]
+            while not outbox.empty():
+                replies.append(outbox.get_nowait())
+            writer.write(b"".join(_encode(reply) for reply in replies))
+            await writer.drain()
+            # Room in the outbox again: let the scheduler resume this session.
+            if not session.inbox.empty():
+                self._schedule(session)
+
+    def _schedule(self, session: Session) -> None:
+        if not session.scheduled and session.session_id in self.sessions:
+            session.scheduled = True
+            self._ready.append(session)
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    async def _run_scheduler(self) -> None:
+        loop = asyncio.get_running_loop()
+        wakeup = self._wakeup
+        assert wakeup is not None
+        last_tick = loop.time()
+        while True:
+            if not self._ready:
+                wakeup.clear()
+                if self._running:
+                    timeout = max(0.0, last_tick + self.tick_interval - loop.time())
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await wakeup.wait()
+
+            now = loop.time()
+            if not self._running:
+                last_tick = now
+            elif now - last_tick >= self.tick_interval:
+                self._advance_running(now - last_tick)
+                last_tick = now
+
+            for _ in range(len(self._ready)):
+                self._serve(self._ready.popleft())
+            # Let connections read and write before the next round.
+            await asyncio.sleep(0)
+
+    def _advance_running(self, elapsed: float) -> None:
+        elapsed = min(elapsed, self.tick_interval * self.MAX_CATCH_UP_INTERVALS)
+        ticks_per_second = self.tick_rate * elapsed
+        for session in list(self._running):
+            owed = session._tick_carry + ticks_per_second * session.time_scale
+            ticks = int(owed)
+            session._tick_carry = owed - ticks
+            if ticks:
+                try:
+                    session.simulator.advance_ticks(ticks)
+                except Exception as error:
+                    # Like _reply: one failing session must not stop the scheduler.
+                    self._stop_running(session, error)
+
+    def _stop_running(self, session: Session, error: Exception) -> None:
+        self._running.discard(session)
+        session.time_scale = 0.0
+        session._tick_carry = 0.0
+        message = str(error) or type(error).__name__
+        # With a full outbox the client only sees time_scale 0 in its next state.
+        if not session.outbox.full():
+            session.outbox.put_nowait(
+                {"id": None, "ok": False, "error": f"Simulation stopped: {message}"}
+            )
+
+    def _serve(self, session: Session) -> None:
+        session.scheduled = False
+        if session.session_id not in self.sessions:
+            return
+        inbox, outbox = session.inbox, session.outbox
+        for _ in range(self.max_requests_per_turn):
+            if inbox.empty() or outbox.full():
+                return
+            received, request, error = inbox.get_nowait()
+            if error is not None:
+                reply = {"id": request.get("id"), "ok": False, "error": error}
+            else:
+                reply = self._reply(session, request)
+            session.latency.record(time.perf_counter() - received)
+            self.requests_served += 1
+            outbox.put_nowait(reply)
+        if not inbox.empty() and not outbox.full():
+            # Yield to other sessions; continue on the next round.
+            self._schedule(session)
+
+    def _reply(self, session: Session, request: Request) -> Response:
+        request_id = request.get("id")
+        op = request.get("op")
+        handler = self._ops.get(op) if isinstance(op, str) else None
+        if handler is None:
+            return {"id": request_id, "ok": False, "error": f"Unknown op {op!r}."}
+        try:
+            result = handler(session, request)
+        except KeyError as error:
+            return {"id": request_id, "ok": False, "error": f"Missing {error}."}
+        except Exception as error:
+            # One bad request must never take down the scheduler shared by every session.
+            message = str(error) or type(error).__name__
+            return {"id": request_id, "ok": False, "error": message}
+        return {"id": request_id, "ok": True, "result": result}
+
+    def _op_state(self, session: Session, request: Request) -> Dict[str, Any]:
+        simulator = session.simulator
+        state = simulator.workshop_state
+        return {
+            "day": state.day,
+            "tick": simulator.elapsed_ticks,
+            "money": state.money,
+            "reputation": state.reputation,
+            "inspiration": state.inspiration,
+            "materials": dict(state.materials),
+            "time_scale": session.time_scale,
+        }
+
+    def _op_advance(self, session: Session, request: Request) -> Dict[str, Any]:
+        simulator = session.simulator
+        fast = bool(request.get("fast", False))
+        if "days" in request:
+            advance = simulator.fast_forward_days if fast else simulator.advance_days
+            days_processed = advance(_bounded(request["days"], self.max_advance_days, "days"))
+        else:
+            advance = simulator.fast_forward_ticks if fast else simulator.advance_ticks
+            max_ticks = self.max_advance_days * simulator.time_system.ticks_per_day
+            days_processed = advance(_bounded(request["ticks"], max_ticks, "ticks"))
+        return {"days_processed": days_processed, **self._op_state(session, request)}
+
+    def _op_buy(self, session: Session, request: Request) -> Dict[str, Any]:
+        amount = session.simulator.execute(
+            purchase_material(request["material"], int(request["amount"]), float(request["price"]))
+        )
+        return {"amount": amount, "money": session.simulator.workshop_state.money}
+
+    def _op_contracts(self, session: Session, request: Request) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": contract.id,
+                "name": contract.name,
+                "reward_money": contract.reward_money,
+                "expires_day": contract.start_day + contract.duration_days,
+                "materials_required": dict(contract.materials_required),
+                "puzzle_type": contract.puzzle_type.value,
+                "puzzle_difficulty": contract.puzzle_difficulty,
+            }
+            for contract in session.simulator.workshop_state.active_contracts
+        ]
+
+    def _op_complete(self, session: Session, request: Request) -> Dict[str, Any]:
+        return self._contract_command(session, complete_contract(int(request["contract_id"])))
+
+    def _op_accept(self, session: Session, request: Request) -> Dict[str, Any]:
+        command = accept_contract(int(request["contract_id"]), int(request.get("priority", 0)))
+        return self._contract_command(session, command)
+
+    def _op_decline(self, session: Session, request: Request) -> Dict[str, Any]:
+        return self._contract_command(session, decline_contract(int(request["contract_id"])))
+
+    def _contract_command(self, session: Session, command: Command) -> Dict[str, Any]:
+        session.simulator.execute(command)
+        return {"money": session.simulator.workshop_state.money}
+
+    def _op_run(self, session: Session, request: Request) -> Dict[str, Any]:
+        time_scale = float(request["time_scale"])
+        if not (math.isfinite(time_scale) and 0 <= time_scale <= self.max_time_scale):
+            raise ValueError(f"time_scale must be between 0 and {self.max_time_scale}.")
+        session.time_scale = time_scale
+        if time_scale > 0:
+            self._running.add(session)
+        else:
+            self._running.discard(session)
+            session._tick_carry = 0.0
+        return {"time_scale": time_scale}
+
+    def _op_stats(self, session: Session, request: Request) -> Dict[str, float]:
+        return session.latency.summary()
+
+
+class SessionClient:
+    """Minimal asyncio client for ``SessionServer``, used by tests and load tools."""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, session_id: int
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.session_id = session_id
+        self._next_request_id = 1
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> "SessionClient":
+        """
+        Open a session.
+
+        Raises:
+            ConnectionError: If the server refuses the session.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        hello = json.loads(await reader.readline() or b"{}")
+        if not hello.get("ok"):
+            writer.close()
+            raise ConnectionError(hello.get("error", "Connection closed by server."))
+        return cls(reader, writer, hello["session"])
+
+    def send(self, op: str, **args: Any) -> int:
+        """Queue a request without waiting for its reply; returns the request id."""
+        request_id = self._next_request_id
+        self._next_request_id += 1
+        self.writer.write(_encode({"id": request_id, "op": op, **args}))
+        return request_id
+
+    async def receive(self) -> Response:
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server.")
+        return json.loads(line)
+
+    async def request(self, op: str, **args: Any) -> Any:
+        """
+        Send one request and wait for its result.
+
+        Raises:
+            ValueError: If the server rejects the request.
+        """
+        request_id = self.send(op, **args)
+        await self.writer.drain()
+        reply = await self.receive()
+        if reply.get("id") != request_id:
+            raise ConnectionError("Reply out of order; do not mix request() with send().")
+        if not reply["ok"]:
+            raise ValueError(reply["error"])
+        return reply["result"]
+
+    async def close(self) -> None:
+        await _close_writer(self.writer)
+
+
+def _bounded(value: Any, limit: int, name: str) -> int:
+    """
+    Convert a request count to an int within ``0..limit``.
+
+    Raises:
+        ValueError: If the count is out of range.
+    """
+    count = int(value)
+    if not 0 <= count <= limit:
+        raise ValueError(f"{name} must be between 0 and {limit}.")
+    return count
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+async def _close_writer(writer: asyncio.StreamWriter) -> None:
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except (ConnectionError, OSError):
+        pass
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = SessionServer(
+        max_sessions=args.max_sessions, tick_rate=args.tick_rate, queue_size=args.queue_size
+    )
+    port = await server.start(args.host, args.port)
+    print(f"Serving workshops on {args.host}:{port}")
+    try:
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            stats = server.stats()
+            print(
+                f"sessions={stats['sessions']} running={stats['running']} "
+                f"requests={stats['requests_served']}"
+            )
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Host many workshop sessions in one process.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-sessions", type=int, default=10_000)
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--tick-rate", type=float, default=60.0, help="Ticks per second at 1x.")
+    parser.add_argument("--stats-interval", type=float, default=10.0)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, NamedTuple, Optional, TYPE_CHECKING
+
+from core.commands import Command
+from core.loop import MAX_TIME_SCALE, FixedTimestep
+from core.simulator import Simulator
+from world.workshop_state import WorkshopState
+
+if TYPE_CHECKING:
+    from core.autoplayer import Autoplayer
+
+
+class Snapshot(NamedTuple):
+    """One published view of the simulation; never modified after publishing."""
+
+    state: WorkshopState
+    tick_counter: int
+    elapsed_ticks: int
+    sequence: int
+
+
+class SimulationThread:
+    """Steps a ``Simulator`` on a worker thread and publishes snapshots for rendering.
+
+    The simulator is only touched by the worker. Other threads talk to it
+    through a queue (``execute``, ``call``, ``set_time_scale``) and read
+    ``latest()``, an immutable ``WorkshopState.snapshot`` published after each
+    batch of steps. The live state is the back buffer and the latest snapshot
+    the front one; publishing is a single reference swap, so readers never
+    take a lock and never see a half-updated state.
+    """
+
+    def __init__(
+        self,
+        simulator: Simulator,
+        timestep: Optional[FixedTimestep] = None,
+        autoplayer: Optional["Autoplayer"] = None,
+        on_days: Optional[Callable[[Simulator, int], None]] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.simulator = simulator
+        self.timestep = timestep if timestep is not None else FixedTimestep()
+        self.autoplayer = autoplayer
+        self.on_days = on_days
+        self.clock = clock
+        self._inbox: "queue.Queue[tuple]" = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._sequence = 0
+        self._front = self._snapshot()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise ValueError("The simulation thread has already been started.")
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the worker after its current batch and re-raise any error it hit."""
+        self._stop.set()
+        self._inbox.put(("wake",))
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if not self.running:
+            # Calls queued while the worker was exiting would otherwise never resolve.
+            self._fail_pending()
+        self._raise_error()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def latest(self) -> Snapshot:
+        """
+        The most recently published snapshot.
+
+        Raises:
+            RuntimeError: If the worker stopped with an exception.
+        """
+        self._raise_error()
+        return self._front
+
+    def execute(self, command: Command) -> "Future[Any]":
+        """Queue a command for the worker; the future resolves to its result."""
+        return self.call(lambda simulator: simulator.execute(command))
+
+    def call(self, function: Callable[[Simulator], Any]) -> "Future[Any]":
+        """Queue ``function(simulator)`` to run on the worker between steps."""
+        future: "Future[Any]" = Future()
+        if self._stop.is_set():
+            future.set_exception(RuntimeError("The simulation thread has stopped."))
+        else:
+            self._inbox.put(("call", function, future))
+        return future
+
+    def set_time_scale(self, time_scale: float) -> None:
+        """
+        Change the worker's time scale.
+
+        Raises:
+            ValueError: If time_scale is not positive.
+        """
+        if time_scale <= 0:
+            raise ValueError("time_scale must be positive.")
+        self.call(lambda simulator: setattr(self.timestep, "time_scale", time_scale))
+
+    def _run(self) -> None:
+        try:
+            last = self.clock()
+            while not self._stop.is_set():
+                changed = self._drain_inbox()
+                now = self.clock()
+                steps = self.timestep.steps_for_frame(now - last)
+                last = now
+                if steps:
+                    self._step(steps)
+                    changed = True
+                if changed:
+                    self._publish()
+                if self.timestep.time_scale == MAX_TIME_SCALE:
+                    # Hand the interpreter to the render thread between batches.
+                    time.sleep(0)
+                else:
+                    self._wait_for_input(self.timestep.step_seconds)
+        except BaseException as exc:  # surfaced to the render thread by latest()/stop()
+            self._error = exc
+        finally:
+            self._fail_pending()
+
+    def _step(self, steps: int) -> None:
+        simulator = self.simulator
+        days_processed = simulator.advance_ticks(steps)
+        if days_processed and self.autoplayer is not None:
+            self.autoplayer.act(simulator)
+        if days_processed and self.on_days is not None:
+            self.on_days(simulator, days_processed)
+
+    def _drain_inbox(self) -> bool:
+        ran = False
+        while True:
+            try:
+                message = self._inbox.get_nowait()
+            except queue.Empty:
+                return ran
+            ran = self._handle(message) or ran
+
+    def _wait_for_input(self, seconds: float) -> None:
+        try:
+            message = self._inbox.get(timeout=seconds)
+        except queue.Empty:
+            return
+        if self._handle(message):
+            self._publish()
+
+    def _handle(self, message: tuple) -> bool:
+        if message[0] != "call":
+            return False
+        _, function, future = message
+        if not future.set_running_or_notify_cancel():
+            return False
+        try:
+            future.set_result(function(self.simulator))
+        except Exception as exc:
+            future.set_exception(exc)
+        return True
+
+    def _publish(self) -> None:
+        self._front = self._snapshot()
+
+    def _snapshot(self) -> Snapshot:
+        self._sequence += 1
+        simulator = self.simulator
+        return Snapshot(
+            simulator.workshop_state.snapshot(),
+            simulator.time_system.tick_counter,
+            simulator.elapsed_ticks,
+            self._sequence,
+        )
+
+    def _fail_pending(self) -> None:
+        while True:
+            try:
+                message = self._inbox.get_nowait()
+            except queue.Empty:
+                return
+            if message[0] == "call" and message[2].set_running_or_notify_cancel():
+                message[2].set_exception(RuntimeError("The simulation thread has stopped."))
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("The simulation thread failed.") from self._error
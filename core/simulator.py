@@ -0,0 +1,456 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from core.commands import Command
+from core.profiling import Profiler
+from systems.contracts import ContractsSystem
+from systems.economy_system import EconomySystem
+from systems.materials_system import MaterialsSystem
+from systems.production_system import ProductionSystem
+from systems.random_events import RandomEventSystem
+from systems.rng import RandomService
+from systems.time_system import TimeSystem
+from world.state_changes import Subscription
+from world.workshop_state import WorkshopState
+
+if TYPE_CHECKING:
+    from core.metrics import MetricsRecorder
+    from core.replay import InputRecorder
+
+
+class Simulator:
+    """Headless driver for the day loop, shared by the interactive game and tools."""
+
+    def __init__(
+        self,
+        workshop_state: Optional[WorkshopState] = None,
+        time_system: Optional[TimeSystem] = None,
+        economy_system: Optional[EconomySystem] = None,
+        contracts_system: Optional[ContractsSystem] = None,
+        rng: Optional[RandomService] = None,
+        profiler: Optional[Profiler] = None,
+        random_event_system: Optional[RandomEventSystem] = None,
+        production_system: Optional[ProductionSystem] = None,
+    ) -> None:
+        self.workshop_state = workshop_state if workshop_state is not None else WorkshopState()
+        self.time_system = time_system if time_system is not None else TimeSystem()
+        self.economy_system = economy_system if economy_system is not None else EconomySystem()
+        self.materials_system = MaterialsSystem()
+        self.contracts_system = (
+            contracts_system
+            if contracts_system is not None
+            else ContractsSystem(materials_system=self.materials_system)
+        )
+        self.rng = rng if rng is not None else RandomService()
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.random_event_system = (
+            random_event_system
+            if random_event_system is not None
+            else RandomEventSystem(self.rng)
+        )
+        self.production_system = (
+            production_system
+            if production_system is not None
+            else ProductionSystem(materials_system=self.materials_system)
+        )
+        self.recorder: Optional["InputRecorder"] = None
+        self.elapsed_ticks = 0
+        self._day_hooks: List[Callable[[WorkshopState], None]] = []
+        self._last_processed_day = self.workshop_state.day
+        self._command_handlers: Dict[str, Callable[..., Any]] = {
+            "purchase_material": self._purchase_material,
+            "purchase_materials": self._purchase_materials,
+            "remove_material": self._remove_material,
+            "decline_contract": self._decline_contract,
+            "complete_contract": self._complete_contract,
+            "accept_contract": self._accept_contract,
+        }
+
+    def step(self) -> int:
+        """Advance a single tick, exactly like one frame of ``Game.update``.
+
+        Returns:
+            The number of in-game days processed.
+        """
+        self.time_system.tick(self.workshop_state)
+        self.elapsed_ticks += 1
+        return self.process_pending_days()
+
+    def process_pending_days(self) -> int:
+        """Run the daily systems for every day reached but not yet processed."""
+        current_day = self.workshop_state.day
+        if current_day <= self._last_processed_day:
+            return 0
+        days_passed = current_day - self._last_processed_day
+        if self.profiler.enabled:
+            with self.profiler.section("simulation.days"):
+                for _ in range(days_passed):
+                    self._process_day_profiled()
+        else:
+            for _ in range(days_passed):
+                self._process_day()
+        self._last_processed_day = current_day
+        return days_passed
+
+    def advance_ticks(self, ticks: int) -> int:
+        """
+        Advance by the given number of ticks without a frame clock.
+
+        Day boundaries are crossed one at a time so the daily systems see the
+        same day values as they would when ticking frame by frame.
+
+        Returns:
+            The number of in-game days processed.
+
+        Raises:
+            ValueError: If ticks is negative.
+        """
+        if ticks < 0:
+            raise ValueError("ticks cannot be negative.")
+        days_processed = self.process_pending_days()
+        remaining = ticks
+        while remaining > 0:
+            step = min(remaining, self.time_system.ticks_until_next_day)
+            self.time_system.advance(self.workshop_state, step)
+            self.elapsed_ticks += step
+            remaining -= step
+            days_processed += self.process_pending_days()
+        return days_processed
+
+    def advance_days(self, days: int) -> int:
+        """
+        Advance until the given number of in-game days have passed.
+
+        Raises:
+            ValueError: If days is negative.
+        """
+        if days < 0:
+            raise ValueError("days cannot be negative.")
+        if days == 0:
+            return self.process_pending_days()
+        return self.advance_ticks(self._ticks_for_days(days))
+
+    def fast_forward_ticks(self, ticks: int) -> int:
+        """
+        Skip ahead by the given number of ticks without stepping day by day.
+
+        Upkeep and inspiration are applied in closed form and contracts are only
+        touched on days when they can change, so long spans cost time
+        proportional to contract events rather than days. Callbacks scheduled
+        on the time system split the span and fire at their own time, after
+        the days before them are settled. Money and inspiration agree with
+        ``advance_ticks`` up to floating-point rounding.
+
+        Returns:
+            The number of in-game days processed.
+
+        Raises:
+            ValueError: If ticks is negative.
+        """
+        if ticks < 0:
+            raise ValueError("ticks cannot be negative.")
+        if self._needs_daily_processing():
+            return self.advance_ticks(ticks)
+        days_processed = self.process_pending_days()
+        remaining = ticks
+        while remaining > 0:
+            until_event = self._ticks_until_next_event()
+            if until_event is None or until_event > remaining:
+                step = remaining
+            else:
+                # Stop one tick short of a scheduled event so the days before
+                # it are settled when it fires, as they are when stepping.
+                step = max(until_event - 1, 1) if until_event else 0
+            days_processed += self._fast_forward_span(step)
+            remaining -= step
+        return days_processed
+
+    def _fast_forward_span(self, ticks: int) -> int:
+        workshop_state = self.workshop_state
+        first_day = self._last_processed_day + 1
+        days_passed = self.time_system.advance(workshop_state, ticks)
+        self.elapsed_ticks += ticks
+        if days_passed:
+            self.economy_system.apply_daily_upkeep(workshop_state, days_passed)
+            self.economy_system.apply_inspiration_gain(workshop_state, days_passed)
+            self.production_system.advance(workshop_state, workshop_state.day)
+            self.contracts_system.fast_forward(workshop_state, first_day, workshop_state.day)
+            self._last_processed_day = workshop_state.day
+        return days_passed
+
+    def _ticks_until_next_event(self) -> Optional[int]:
+        time_system = self.time_system
+        until = time_system.ticks_until_next_event(self.workshop_state)
+        completion_day = self.production_system.next_completion_day()
+        if completion_day is not None:
+            # Jobs finish as their day begins, before that day's contracts.
+            until_completion = max(
+                time_system.time_of(completion_day) - time_system.now(self.workshop_state), 1
+            )
+            until = until_completion if until is None else min(until, until_completion)
+        return until
+
+    def fast_forward_days(self, days: int) -> int:
+        """
+        Skip ahead until the given number of in-game days have passed.
+
+        Raises:
+            ValueError: If days is negative.
+        """
+        if days < 0:
+            raise ValueError("days cannot be negative.")
+        if days == 0:
+            return self.process_pending_days()
+        return self.fast_forward_ticks(self._ticks_for_days(days))
+
+    def execute(self, command: Command) -> Any:
+        """
+        Apply a player or tool command at the current tick.
+
+        Successful commands are logged to ``recorder`` when one is attached.
+
+        Raises:
+            ValueError: If the command is unknown or its system rejects it.
+        """
+        handler = self._command_handlers.get(command.name)
+        if handler is None:
+            raise ValueError(f"Unknown command '{command.name}'.")
+        result = handler(**command.args)
+        if self.recorder is not None:
+            self.recorder.record(self.elapsed_ticks, command)
+        return result
+
+    def add_day_hook(self, callback: Callable[[WorkshopState], None]) -> Subscription:
+        """
+        Call ``callback`` with the workshop state after every processed day.
+
+        While a hook is attached, fast-forwarding processes days one at a
+        time so no day is skipped. Branches from ``fork`` start without hooks.
+        """
+        self._day_hooks.append(callback)
+        return Subscription(self._day_hooks, callback)
+
+    def fork(self) -> "Simulator":
+        """
+        Branch the whole simulation for lookahead: state, clocks, contract ids
+        and random streams.
+
+        The workshop state is forked copy-on-write, so branches are cheap.
+        Commands run on a branch are not recorded; discard the branch by
+        dropping it or adopt it with ``commit``.
+        """
+        rng = self.rng.fork()
+        branch = Simulator(
+            self.workshop_state.fork(),
+            time_system=copy.copy(self.time_system),
+            economy_system=self.economy_system,
+            contracts_system=copy.copy(self.contracts_system),
+            rng=rng,
+            random_event_system=self.random_event_system.fork(rng),
+            production_system=self.production_system.fork(),
+        )
+        branch.elapsed_ticks = self.elapsed_ticks
+        branch._last_processed_day = self._last_processed_day
+        return branch
+
+    def commit(self, branch: "Simulator") -> None:
+        """
+        Adopt a branch created by ``fork`` as the current simulation.
+
+        The branch's scheduled callbacks replace the current ones, so handles
+        returned before the fork no longer cancel anything.
+
+        Raises:
+            ValueError: If inputs are being recorded, since the branch's
+            commands were not captured and a replay would diverge.
+        """
+        if self.recorder is not None:
+            raise ValueError("Cannot commit a branch while inputs are being recorded.")
+        self.workshop_state.commit(branch.workshop_state)
+        self.time_system.tick_counter = branch.time_system.tick_counter
+        self.time_system.scheduler = branch.time_system.scheduler
+        self.production_system.commit(branch.production_system)
+        self.contracts_system.next_contract_id = branch.contracts_system.next_contract_id
+        self.rng.commit(branch.rng)
+        self.elapsed_ticks = branch.elapsed_ticks
+        self._last_processed_day = branch._last_processed_day
+
+    def _purchase_material(self, material_name: str, amount: int, price_per_unit: float) -> int:
+        return self.materials_system.purchase_material(
+            self.workshop_state, material_name, amount, price_per_unit
+        )
+
+    def _purchase_materials(
+        self, amounts: Dict[str, int], prices_per_unit: Dict[str, float]
+    ) -> None:
+        self.materials_system.purchase_materials(self.workshop_state, amounts, prices_per_unit)
+
+    def _remove_material(self, material_name: str, amount: int) -> int:
+        return self.materials_system.remove_material(self.workshop_state, material_name, amount)
+
+    def _decline_contract(self, contract_id: int) -> None:
+        self.contracts_system.decline_contract(self.workshop_state, contract_id)
+
+    def _complete_contract(self, contract_id: int) -> None:
+        self.contracts_system.complete_contract(self.workshop_state, contract_id)
+
+    def _accept_contract(self, contract_id: int, priority: int = 0) -> None:
+        self.production_system.accept_contract(self.workshop_state, contract_id, priority)
+
+    def _needs_daily_processing(self) -> bool:
+        # Random events can change money and materials on any day, so spans
+        # cannot be skipped in closed form while they are enabled; day hooks
+        # expect to see every day.
+        return self.random_event_system.daily_event_chance > 0.0 or bool(self._day_hooks)
+
+    def _ticks_for_days(self, days: int) -> int:
+        time_system = self.time_system
+        return time_system.ticks_until_next_day + (days - 1) * time_system.ticks_per_day
+
+    def _process_day(self) -> None:
+        workshop_state = self.workshop_state
+        self.economy_system.apply_daily_upkeep(workshop_state)
+        self.economy_system.apply_inspiration_gain(workshop_state)
+        self.production_system.advance(workshop_state, workshop_state.day)
+        self.contracts_system.remove_expired_contracts(workshop_state, workshop_state.day)
+        self.contracts_system.maybe_generate_daily_contracts(workshop_state)
+        self.random_event_system.maybe_trigger_daily_event(workshop_state)
+        for hook in self._day_hooks:
+            hook(workshop_state)
+
+    def _process_day_profiled(self) -> None:
+        # Same steps as _process_day, with per-system timings and counters.
+        workshop_state = self.workshop_state
+        profiler = self.profiler
+        with profiler.section("economy"):
+            self.economy_system.apply_daily_upkeep(workshop_state)
+            self.economy_system.apply_inspiration_gain(workshop_state)
+        with profiler.section("production"):
+            finished = self.production_system.advance(workshop_state, workshop_state.day)
+        with profiler.section("contracts.expire"):
+            expired = self.contracts_system.remove_expired_contracts(
+                workshop_state, workshop_state.day
+            )
+        with profiler.section("contracts.generate"):
+            before = len(workshop_state.active_contracts)
+            self.contracts_system.maybe_generate_daily_contracts(workshop_state)
+        with profiler.section("random_events"):
+            event = self.random_event_system.maybe_trigger_daily_event(workshop_state)
+        profiler.count("days_processed")
+        profiler.count("random_events", event is not None)
+        profiler.count("contracts_expired", len(expired))
+        profiler.count("jobs_completed", len(finished))
+        profiler.count("contracts_generated", len(workshop_state.active_contracts) - before)
+        if self._day_hooks:
+            with profiler.section("day_hooks"):
+                for hook in self._day_hooks:
+                    hook(workshop_state)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the workshop simulation headlessly.")
+    parser.add_argument("--days", type=int, default=10_000, help="In-game days to simulate.")
+    parser.add_argument("--ticks-per-day", type=int, default=300)
+    parser.add_argument("--max-active-contracts", type=int, default=3)
+    parser.add_argument(
+        "--fast-forward",
+        action="store_true",
+        help="Skip ahead in closed form instead of processing every day.",
+    )
+    parser.add_argument(
+        "--metrics",
+        default=None,
+        help="Record daily metrics and write them to this .csv or .npz file.",
+    )
+    parser.add_argument(
+        "--metrics-rows",
+        type=int,
+        default=4096,
+        help="Rows kept for --metrics; longer runs are downsampled to fit.",
+    )
+    parser.add_argument(
+        "--cache-dir", default=None, help="Reuse and store results in this directory."
+    )
+    args = parser.parse_args(argv)
+
+    config: Dict[str, Any] = {
+        "ticks_per_day": args.ticks_per_day,
+        "max_active_contracts": args.max_active_contracts,
+        # Fast-forward agrees with stepping only up to float rounding, so the
+        # two modes are cached separately.
+        "fast_forward": args.fast_forward,
+    }
+    if args.metrics is not None:
+        config["metrics_rows"] = args.metrics_rows
+    cache = key = None
+    summary: Optional[Dict[str, Any]] = None
+    recorder = None
+    if args.cache_dir is not None:
+        from core.result_cache import ResultCache, cache_key
+
+        cache = ResultCache(args.cache_dir)
+        key = cache_key("simulator", config, args.days)
+        summary = cache.get(key)
+        if summary is not None and args.metrics is not None:
+            recorder = cache.get_metrics(key)
+            if recorder is None:
+                summary = None
+
+    if summary is not None:
+        print(f"Loaded {args.days} simulated days from {args.cache_dir}")
+    else:
+        summary, recorder = _run_headless(args, config)
+        if cache is not None:
+            cache.put(key, summary, recorder)
+    print(
+        f"Final day {summary['day']}: money={summary['money']:.1f}, "
+        f"inspiration={summary['inspiration']:.1f}, "
+        f"active contracts={summary['active_contracts']}"
+    )
+    if recorder is not None:
+        if args.metrics.endswith(".npz"):
+            recorder.write_npz(args.metrics)
+        else:
+            recorder.write_csv(args.metrics)
+        print(
+            f"Wrote {len(recorder)} rows of {recorder.bucket_days} day(s) each to {args.metrics}"
+        )
+
+
+def _run_headless(
+    args: argparse.Namespace, config: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Optional["MetricsRecorder"]]:
+    simulator = Simulator(
+        time_system=TimeSystem(ticks_per_day=config["ticks_per_day"]),
+        contracts_system=ContractsSystem(max_active_contracts=config["max_active_contracts"]),
+    )
+    recorder = None
+    if "metrics_rows" in config:
+        from core.metrics import MetricsRecorder
+
+        recorder = MetricsRecorder(config["metrics_rows"], overflow="downsample").attach(simulator)
+    start = time.perf_counter()
+    if args.fast_forward:
+        simulator.fast_forward_days(args.days)
+    else:
+        simulator.advance_days(args.days)
+    elapsed = time.perf_counter() - start
+
+    state = simulator.workshop_state
+    days_per_sec = args.days / elapsed if elapsed > 0 else float("inf")
+    print(f"Simulated {args.days} days in {elapsed:.3f}s ({days_per_sec:,.0f} days/sec)")
+    summary = {
+        "day": state.day,
+        "money": state.money,
+        "inspiration": state.inspiration,
+        "active_contracts": len(state.active_contracts),
+    }
+    return summary, recorder
+
+
+if __name__ == "__main__":
+    main()
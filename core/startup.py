@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, TextIO
+
+
+class StartupReport:
+    """Wall-clock breakdown of startup phases such as imports, display init and first frame.
+
+    Phases are recorded in order; ``complete`` writes the report once to
+    ``output`` when one is given.
+    """
+
+    def __init__(
+        self,
+        output: Optional[TextIO] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.output = output
+        self._clock = clock
+        self._started = clock()
+        self.phases: Dict[str, float] = {}
+        self.completed = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as ``name``."""
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.record(name, self._clock() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add ``seconds`` to the phase ``name``."""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        """Seconds since the report was created."""
+        return self._clock() - self._started
+
+    def complete(self) -> None:
+        """Mark startup as finished and write the report if an output is set."""
+        if self.completed:
+            return
+        self.completed = True
+        if self.output is not None:
+            self.output.write(self.format() + "\n")
+            self.output.flush()
+
+    def format(self) -> str:
+        lines = ["Startup:"]
+        for name, seconds in self.phases.items():
+            lines.append(f"  {name:<14}{seconds * 1000.0:9.1f} ms")
+        lines.append(f"  {'total':<14}{self.elapsed() * 1000.0:9.1f} ms")
+        return "\n".join(lines)
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(self.phases)
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from functools import partial
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core.result_cache import ResultCache, cache_key
+from core.simulator import Simulator
+from systems.contracts import ContractsSystem
+from systems.rng import RandomService
+from systems.time_system import TimeSystem
+from world.workshop_state import WorkshopState
+
+# Tunable parameters and their types; anything omitted keeps the game default.
+SWEEP_PARAMETERS: Dict[str, type] = {
+    "money": float,
+    "daily_upkeep": float,
+    "inspiration_gain": float,
+    "ticks_per_day": int,
+    "max_active_contracts": int,
+}
+RESULT_FIELDS = [
+    "run",
+    *SWEEP_PARAMETERS,
+    "days",
+    "final_money",
+    "final_inspiration",
+    "bankruptcy_day",
+    "contracts_seen",
+]
+
+Config = Dict[str, Any]
+
+
+def grid(parameters: Dict[str, Sequence[Any]]) -> Iterator[Config]:
+    """Yield every combination of the given parameter values."""
+    _validate_names(parameters)
+    names = list(parameters)
+    for values in itertools.product(*(parameters[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def random_samples(
+    ranges: Dict[str, Tuple[float, float]], count: int, seed: int = 0
+) -> Iterator[Config]:
+    """Yield ``count`` configurations drawn uniformly from inclusive ranges."""
+    _validate_names(ranges)
+    generator = random.Random(seed)
+    for _ in range(count):
+        config: Config = {}
+        for name, (low, high) in ranges.items():
+            if SWEEP_PARAMETERS[name] is int:
+                config[name] = generator.randint(int(low), int(high))
+            else:
+                config[name] = generator.uniform(low, high)
+        yield config
+
+
+def run_configuration(config: Config, days: int, seed: int = 0) -> Dict[str, Any]:
+    """Simulate one configuration for ``days`` days and summarize the outcome."""
+    defaults = WorkshopState()
+    workshop_state = WorkshopState(
+        money=config.get("money", defaults.money),
+        daily_upkeep=config.get("daily_upkeep", defaults.daily_upkeep),
+        inspiration_gain=config.get("inspiration_gain", defaults.inspiration_gain),
+    )
+    contracts_system = ContractsSystem(max_active_contracts=config.get("max_active_contracts", 3))
+    simulator = Simulator(
+        workshop_state,
+        time_system=TimeSystem(ticks_per_day=config.get("ticks_per_day", 300)),
+        contracts_system=contracts_system,
+        rng=RandomService(seed),
+    )
+
+    bankruptcy_day: List[Optional[int]] = [None]
+
+    def watch_money(state: WorkshopState, field_name: str) -> None:
+        if state.money < 0 and bankruptcy_day[0] is None:
+            bankruptcy_day[0] = state.day
+
+    subscription = workshop_state.changes.subscribe("money", watch_money)
+    first_contract_id = contracts_system.next_contract_id
+    simulator.advance_days(days)
+    subscription.cancel()
+
+    return {
+        **config,
+        "days": days,
+        "final_money": workshop_state.money,
+        "final_inspiration": workshop_state.inspiration,
+        "bankruptcy_day": bankruptcy_day[0],
+        "contracts_seen": contracts_system.next_contract_id - first_contract_id,
+    }
+
+
+def _run_indexed(indexed_config: Tuple[int, Config], days: int, seed: int) -> Dict[str, Any]:
+    index, config = indexed_config
+    return {"run": index, **run_configuration(config, days, seed)}
+
+
+def run_sweep(
+    configs: Iterable[Config],
+    days: int,
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+    seed: int = 0,
+    cache: Optional[ResultCache] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run every configuration and yield summaries as they complete.
+
+    Runs are spread over a process pool with ``workers`` processes (all cores
+    by default); results arrive in completion order and carry their ``run``
+    index. ``workers=1`` runs in-process. With a ``cache``, configurations
+    already simulated with the same days, seed and code are yielded from it
+    first and only the rest are run, then stored.
+    """
+    if days < 0:
+        raise ValueError("days cannot be negative.")
+    worker = partial(_run_indexed, days=days, seed=seed)
+    indexed: Iterable[Tuple[int, Config]] = enumerate(configs)
+    keys: Dict[int, str] = {}
+    if cache is not None:
+        pending = []
+        for index, config in indexed:
+            key = cache_key("sweep", config, days, seed)
+            result = cache.get(key)
+            if result is not None:
+                yield {"run": index, **result}
+            else:
+                keys[index] = key
+                pending.append((index, config))
+        indexed = pending
+        if not pending:
+            return
+    if workers == 1:
+        results: Iterator[Dict[str, Any]] = map(worker, indexed)
+        yield from _store_results(results, keys, cache)
+        return
+    with multiprocessing.Pool(processes=workers) as pool:
+        results = pool.imap_unordered(worker, indexed, chunksize=chunksize)
+        yield from _store_results(results, keys, cache)
+
+
+def _store_results(
+    results: Iterator[Dict[str, Any]], keys: Dict[int, str], cache: Optional[ResultCache]
+) -> Iterator[Dict[str, Any]]:
+    # Only the parent process writes, so workers never contend on the store.
+    for result in results:
+        if cache is not None:
+            summary = dict(result)
+            cache.put(keys[summary.pop("run")], summary)
+        yield result
+
+
+class ResultWriter:
+    """Streams sweep summaries to JSONL or CSV, flushing after each row."""
+
+    def __init__(self, handle: IO[str], fmt: str = "jsonl") -> None:
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError("fmt must be 'jsonl' or 'csv'.")
+        self._handle = handle
+        self._csv = (
+            csv.DictWriter(handle, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+            if fmt == "csv"
+            else None
+        )
+        if self._csv is not None:
+            self._csv.writeheader()
+
+    def write(self, result: Dict[str, Any]) -> None:
+        if self._csv is not None:
+            self._csv.writerow(result)
+        else:
+            self._handle.write(json.dumps(result) + "\n")
+        self._handle.flush()
+
+
+def _validate_names(parameters: Dict[str, Any]) -> None:
+    unknown = sorted(set(parameters) - set(SWEEP_PARAMETERS))
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(unknown)}.")
+
+
+def _parse_assignments(assignments: List[str]) -> Dict[str, str]:
+    parsed = {}
+    for assignment in assignments:
+        name, separator, value = assignment.partition("=")
+        if not separator:
+            raise ValueError(f"Expected name=value, got '{assignment}'.")
+        parsed[name] = value
+    _validate_names(parsed)
+    return parsed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a multi-core balance parameter sweep.")
+    parser.add_argument(
+        "--grid", nargs="*", default=[], help="Grid values, e.g. daily_upkeep=0.5,1,2"
+    )
+    parser.add_argument(
+        "--sample", nargs="*", default=[], help="Sampling ranges, e.g. money=50:500"
+    )
+    parser.add_argument("--samples", type=int, default=100, help="Number of random samples.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=1_000)
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: all cores).")
+    parser.add_argument("--output", help="Result file; defaults to stdout.")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument(
+        "--cache-dir", default=None, help="Reuse and store results in this directory."
+    )
+    parser.add_argument(
+        "--cache-size-mb", type=float, default=256.0, help="Size limit of --cache-dir."
+    )
+    args = parser.parse_args(argv)
+    cache = (
+        ResultCache(args.cache_dir, max_bytes=int(args.cache_size_mb * 1024 * 1024))
+        if args.cache_dir
+        else None
+    )
+
+    if args.sample:
+        ranges = {
+            name: tuple(SWEEP_PARAMETERS[name](part) for part in value.split(":"))
+            for name, value in _parse_assignments(args.sample).items()
+        }
+        configs: Iterable[Config] = random_samples(ranges, args.samples, args.seed)
+    else:
+        configs = grid(
+            {
+                name: [SWEEP_PARAMETERS[name](part) for part in value.split(",")]
+                for name, value in _parse_assignments(args.grid).items()
+            }
+        )
+
+    handle = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    start = time.perf_counter()
+    runs = 0
+    try:
+        writer = ResultWriter(handle, args.format)
+        for result in run_sweep(configs, args.days, workers=args.workers, cache=cache):
+            writer.write(result)
+            runs += 1
+    finally:
+        if handle is not sys.stdout:
+            handle.close()
+    elapsed = time.perf_counter() - start
+    cached = f", {cache.hits} from cache" if cache is not None else ""
+    print(
+        f"{runs} runs in {elapsed:.1f}s on {args.workers or os.cpu_count()} workers{cached}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,74 @@
-import pygame
+from __future__ import annotations
 
-from core.game import Game
-from ui.workshop_scene import WorkshopScene
-from world.workshop_state import WorkshopState
+import argparse
+import sys
+from typing import List, Optional
 
+from core.startup import StartupReport
 
-def main() -> None:
-    pygame.init()
 
-    width, height = 1280, 720
-    screen = pygame.display.set_mode((width, height))
-    pygame.display.set_caption("Leonardo's Workshop: Renaissance Genius Simulator")
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Leonardo's Workshop")
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="print import, display init and first-frame timings to stderr",
+    )
+    parser.add_argument(
+        "--autoplay",
+        action="store_true",
+        help="let the autoplayer pick each day's action",
+    )
+    parser.add_argument(
+        "--threaded",
+        action="store_true",
+        help="run the simulation on a worker thread and render its snapshots",
+    )
+    args = parser.parse_args(argv)
+    report = StartupReport(output=sys.stderr if args.startup_report else None)
 
-    workshop_state = WorkshopState()
-    initial_scene = WorkshopScene(workshop_state)
-    game = Game(screen, initial_scene, workshop_state)
+    # pygame and the UI are imported here rather than at module load so that
+    # tools importing this module stay headless and the cost shows up in the report.
+    with report.phase("import"):
+        import pygame
+
+        from core.autoplayer import Autoplayer
+        from core.game import Game
+        from core.metrics import MetricsRecorder
+        from core.profiling import Profiler
+        from ui.assets import shared_assets
+        from ui.workshop_scene import WorkshopScene
+        from world.workshop_state import WorkshopState
+
+    with report.phase("display_init"):
+        # Only the display is needed up front; fonts initialize on first use
+        # and audio is never started.
+        pygame.display.init()
+        width, height = 1280, 720
+        screen = pygame.display.set_mode((width, height))
+        pygame.display.set_caption("Leonardo's Workshop: Renaissance Genius Simulator")
+
+    with report.phase("setup"):
+        workshop_state = WorkshopState()
+        profiler = Profiler()
+        # A ring of recent days for the history graph; memory stays fixed.
+        metrics = MetricsRecorder(capacity=1024, overflow="ring")
+        initial_scene = WorkshopScene(
+            workshop_state, profiler=profiler, assets=shared_assets(), metrics=metrics
+        )
+        # A few milliseconds per decision keeps the frame rate steady.
+        autoplayer = Autoplayer(time_budget=0.004) if args.autoplay else None
+        game = Game(
+            screen,
+            initial_scene,
+            workshop_state,
+            profiler=profiler,
+            startup_report=report,
+            autoplayer=autoplayer,
+            threaded=args.threaded,
+        )
+        # A threaded simulator only samples days; the scene writes them on this thread.
+        metrics.attach(game.simulator, deferred=args.threaded)
     game.run()
 
 
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from systems.contracts import KNOWN_MATERIALS, ContractsSystem, PuzzleType
+from world.workshop_batch import CONTRACT_COLUMNS, PUZZLE_TYPES, WorkshopBatch
+
+_WOOD = KNOWN_MATERIALS.index("wood")
+_METAL = KNOWN_MATERIALS.index("metal")
+_PIGMENT = KNOWN_MATERIALS.index("pigment")
+_GEARS = PUZZLE_TYPES.index(PuzzleType.GEARS)
+_PIGMENTS = PUZZLE_TYPES.index(PuzzleType.PIGMENTS)
+_ANATOMY = PUZZLE_TYPES.index(PuzzleType.ANATOMY)
+
+
+class BatchTimeSystem:
+    """Vectorized counterpart of ``TimeSystem`` for a ``WorkshopBatch``."""
+
+    def __init__(self, ticks_per_day: int = 300) -> None:
+        if ticks_per_day <= 0:
+            raise ValueError("ticks_per_day must be a positive integer.")
+        self.ticks_per_day = ticks_per_day
+
+    def tick(self, batch: WorkshopBatch) -> np.ndarray:
+        """Advance every workshop by one tick.
+
+        Returns:
+            Boolean mask of the workshops whose day advanced.
+        """
+        batch.tick_counter += 1
+        rolled = batch.tick_counter >= self.ticks_per_day
+        batch.day += rolled
+        batch.tick_counter[rolled] = 0
+        return rolled
+
+
+class BatchEconomySystem:
+    """Vectorized counterpart of ``EconomySystem``."""
+
+    def apply_daily_upkeep(
+        self, batch: WorkshopBatch, mask: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        if mask is None:
+            batch.money -= batch.daily_upkeep
+        else:
+            np.subtract(batch.money, batch.daily_upkeep, out=batch.money, where=mask)
+        return batch.money
+
+    def apply_inspiration_gain(
+        self, batch: WorkshopBatch, mask: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        if mask is None:
+            batch.inspiration += batch.inspiration_gain
+        else:
+            np.add(batch.inspiration, batch.inspiration_gain, out=batch.inspiration, where=mask)
+        return batch.inspiration
+
+
+class BatchContractsSystem:
+    """Vectorized counterpart of ``ContractsSystem``.
+
+    Every row keeps its own contract id counter, as if each workshop had its
+    own ``ContractsSystem``.
+    """
+
+    def __init__(self, max_active_contracts: int = 3) -> None:
+        self.max_active_contracts = max_active_contracts
+
+    def remove_expired_contracts(
+        self,
+        batch: WorkshopBatch,
+        current_day: Optional[np.ndarray] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> int:
+        """Drop expired contracts, keeping the remaining ones in order.
+
+        Returns:
+            The number of contracts removed across the batch.
+        """
+        if current_day is None:
+            current_day = batch.day
+        active = batch.active_slots()
+        expired = active & (
+            current_day[:, None] >= batch.contract_start_day + batch.contract_duration
+        )
+        if mask is not None:
+            expired &= mask[:, None]
+        removed = int(expired.sum())
+        if not removed:
+            return 0
+
+        keep = active & ~expired
+        order = np.argsort(~keep, axis=1, kind="stable")
+        for column in CONTRACT_COLUMNS:
+            values = getattr(batch, column)
+            index = order[:, :, None] if values.ndim == 3 else order
+            setattr(batch, column, np.take_along_axis(values, index, axis=1))
+        batch.contract_count = keep.sum(axis=1)
+        return removed
+
+    def maybe_generate_daily_contracts(
+        self, batch: WorkshopBatch, mask: Optional[np.ndarray] = None
+    ) -> int:
+        """Generate one contract for every workshop with free capacity.
+
+        Returns:
+            The number of contracts generated across the batch.
+        """
+        capacity = min(self.max_active_contracts, batch.max_contracts)
+        eligible = batch.contract_count < capacity
+        if mask is not None:
+            eligible &= mask
+        rows = np.nonzero(eligible)[0]
+        if rows.size == 0:
+            return 0
+
+        day = batch.day[rows]
+        reputation = batch.reputation[rows]
+        puzzle = (day - 1) % len(PUZZLE_TYPES)
+        base = 1 + (day % 3)
+        bonus = (reputation >= ContractsSystem.REPUTATION_THRESHOLD) & (base < 3)
+        difficulty = np.minimum(3, base + bonus)
+        day_offset = (day % 3) + 1
+        alternating = 1 + (day % 2)
+
+        materials = np.zeros((rows.size, len(KNOWN_MATERIALS)), dtype=np.int64)
+        gears = puzzle == _GEARS
+        pigments = puzzle == _PIGMENTS
+        anatomy = puzzle == _ANATOMY
+        materials[gears, _WOOD] = alternating[gears]
+        materials[gears, _METAL] = day_offset[gears]
+        materials[pigments, _WOOD] = 1
+        materials[pigments, _PIGMENT] = day_offset[pigments]
+        materials[anatomy, _PIGMENT] = alternating[anatomy]
+        materials[anatomy, _METAL] = 1
+
+        slots = batch.contract_count[rows]
+        batch.contract_id[rows, slots] = batch.next_contract_id[rows]
+        batch.contract_reward[rows, slots] = (120.0 + (difficulty * 60.0)) + (
+            np.maximum(0.0, reputation) * ContractsSystem.REPUTATION_REWARD_RATE
+        )
+        batch.contract_duration[rows, slots] = np.maximum(2, 5 - difficulty)
+        batch.contract_prestige[rows, slots] = 0.1 * difficulty
+        batch.contract_puzzle[rows, slots] = puzzle
+        batch.contract_difficulty[rows, slots] = difficulty
+        batch.contract_start_day[rows, slots] = day
+        batch.contract_materials[rows, slots] = materials
+        batch.contract_count[rows] += 1
+        batch.next_contract_id[rows] += 1
+        return int(rows.size)
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Optional, TYPE_CHECKING
+from typing import Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+from world.contract_pool import ContractPool
 
 if TYPE_CHECKING:
+    from systems.materials_system import MaterialsSystem
     from world.workshop_state import WorkshopState
 
 
@@ -17,8 +20,17 @@ class PuzzleType(str, Enum):
     ANATOMY = "anatomy"
 
 
-@dataclass
+CONTRACT_TITLES: Dict[PuzzleType, str] = {
+    PuzzleType.GEARS: "Workshop Mechanism",
+    PuzzleType.PIGMENTS: "Portrait Commission",
+    PuzzleType.ANATOMY: "Anatomical Study",
+}
+
+
+@dataclass(frozen=True, slots=True)
 class Contract:
+    """An offer from a patron. Immutable, so forked workshop states can share it."""
+
     id: int
     name: str
     reward_money: float
@@ -50,58 +62,240 @@ class Contract:
         if any(amount <= 0 for amount in self.materials_required.values()):
             raise ValueError("Material requirements must be positive values.")
 
+    @classmethod
+    def _trusted(
+        cls,
+        id: int,
+        name: str,
+        reward_money: float,
+        duration_days: int,
+        prestige: float,
+        materials_required: Dict[str, int],
+        puzzle_type: PuzzleType,
+        puzzle_difficulty: int,
+        start_day: int,
+        patron: Optional[str] = None,
+    ) -> "Contract":
+        """Build a contract from values already known to be valid, skipping ``__post_init__``.
+
+        Only for contracts produced by ``ContractsSystem`` itself; anything
+        supplied by players or loaded from disk must use the regular constructor.
+        """
+        contract = object.__new__(cls)
+        _set_id(contract, id)
+        _set_name(contract, name)
+        _set_reward_money(contract, reward_money)
+        _set_duration_days(contract, duration_days)
+        _set_prestige(contract, prestige)
+        _set_materials_required(contract, materials_required)
+        _set_puzzle_type(contract, puzzle_type)
+        _set_puzzle_difficulty(contract, puzzle_difficulty)
+        _set_start_day(contract, start_day)
+        _set_patron(contract, patron)
+        return contract
+
     def is_expired(self, current_day: int) -> bool:
         """Check whether the contract should expire based on the current day."""
         return current_day >= self.start_day + self.duration_days
 
 
+# Slot descriptors write fields directly, bypassing the frozen __setattr__;
+# noticeably cheaper than object.__setattr__ on the contract generation path.
+(
+    _set_id,
+    _set_name,
+    _set_reward_money,
+    _set_duration_days,
+    _set_prestige,
+    _set_materials_required,
+    _set_puzzle_type,
+    _set_puzzle_difficulty,
+    _set_start_day,
+    _set_patron,
+) = (getattr(Contract, name).__set__ for name in Contract.__slots__)
+
+
+class _ContractTemplate(NamedTuple):
+    """Everything about a generated contract that does not depend on its id."""
+
+    title: str
+    base_reward: float
+    duration_days: int
+    prestige: float
+    materials_required: Tuple[Tuple[str, int], ...]
+    puzzle_type: PuzzleType
+    puzzle_difficulty: int
+
+
 class ContractsSystem:
     """Manages active contracts, generation, and expiration."""
 
-    def __init__(self, max_active_contracts: int = 3) -> None:
+    # Generated contracts only depend on the day modulo this period and on
+    # whether reputation has reached REPUTATION_THRESHOLD.
+    TEMPLATE_PERIOD = 6
+    REPUTATION_THRESHOLD = 5.0
+    REPUTATION_REWARD_RATE = 15.0
+
+    def __init__(
+        self,
+        max_active_contracts: int = 3,
+        materials_system: Optional["MaterialsSystem"] = None,
+    ) -> None:
+        if materials_system is None:
+            # Imported here: the materials system depends on world modules
+            # that import this one.
+            from systems.materials_system import MaterialsSystem
+
+            materials_system = MaterialsSystem()
         self.max_active_contracts = max_active_contracts
+        self.materials_system = materials_system
         self._next_id = 1
+        self._templates = self._build_template_table()
+
+    @property
+    def next_contract_id(self) -> int:
+        """Id that will be given to the next generated contract."""
+        return self._next_id
 
-    def maybe_generate_daily_contracts(self, workshop_state: "WorkshopState") -> None:
-        """Generate at most one new contract if there is capacity."""
+    @next_contract_id.setter
+    def next_contract_id(self, value: int) -> None:
+        if value < 1:
+            raise ValueError("next_contract_id must be positive.")
+        self._next_id = value
+
+    def maybe_generate_daily_contracts(
+        self, workshop_state: "WorkshopState", day: Optional[int] = None
+    ) -> None:
+        """Generate at most one new contract if there is capacity, dated ``day`` or today."""
         if len(workshop_state.active_contracts) >= self.max_active_contracts:
             return
 
-        contract = self._build_contract_for_state(workshop_state)
+        contract = self._build_contract_for_state(
+            workshop_state, workshop_state.day if day is None else day
+        )
         if contract:
-            workshop_state.active_contracts.append(contract)
+            self._pool(workshop_state).append(contract)
+            workshop_state.notify_changed("contracts")
 
     def remove_expired_contracts(
         self, workshop_state: "WorkshopState", current_day: int
-    ) -> None:
-        """Remove contracts that have expired by the given day."""
-        workshop_state.active_contracts = [
-            contract
-            for contract in workshop_state.active_contracts
-            if not contract.is_expired(current_day)
+    ) -> List[Contract]:
+        """Remove and return contracts that have expired by the given day."""
+        expired = self._pool(workshop_state).expire(current_day)
+        if expired:
+            workshop_state.notify_changed("contracts")
+        return expired
+
+    def decline_contract(self, workshop_state: "WorkshopState", contract_id: int) -> Contract:
+        """
+        Drop an active contract the player does not want to pursue.
+
+        Raises:
+            ValueError: If no active contract has the given id.
+        """
+        contract = self._pool(workshop_state).pop_id(contract_id)
+        if contract is None:
+            raise ValueError(f"Contract {contract_id} is not active.")
+        workshop_state.notify_changed("contracts")
+        return contract
+
+    def complete_contract(self, workshop_state: "WorkshopState", contract_id: int) -> Contract:
+        """
+        Deliver an active contract: consume its materials, then collect the
+        reward and prestige.
+
+        Raises:
+            ValueError: If no active contract has the given id or the workshop
+            lacks the required materials; nothing is changed in that case.
+        """
+        pool = self._pool(workshop_state)
+        contract = pool.get(contract_id)
+        if contract is None:
+            raise ValueError(f"Contract {contract_id} is not active.")
+        self.materials_system.consume_materials(workshop_state, contract.materials_required)
+        pool.pop_id(contract_id)
+        workshop_state.money += contract.reward_money
+        workshop_state.reputation += contract.prestige
+        workshop_state.notify_changed("money", "reputation", "contracts")
+        return contract
+
+    def fast_forward(self, workshop_state: "WorkshopState", first_day: int, last_day: int) -> None:
+        """
+        Process the daily expire/generate cycle for ``first_day``..``last_day``.
+
+        Only days on which the contract list can change are visited: every day
+        while there is spare capacity, otherwise the next expiry day. The result
+        matches calling ``remove_expired_contracts`` and
+        ``maybe_generate_daily_contracts`` once per day. Each day is passed
+        explicitly and ``workshop_state.day`` is left alone: callers advance
+        time first, as ``Simulator`` does, and notify subscribers of the day.
+        """
+        day = first_day
+        while day <= last_day:
+            self.remove_expired_contracts(workshop_state, day)
+            self.maybe_generate_daily_contracts(workshop_state, day)
+            if len(workshop_state.active_contracts) < self.max_active_contracts:
+                day += 1
+                continue
+            next_expiry = self._next_expiry_day(workshop_state)
+            if next_expiry is None:
+                break
+            day = max(day + 1, next_expiry)
+
+    def _next_expiry_day(self, workshop_state: "WorkshopState") -> Optional[int]:
+        return self._pool(workshop_state).next_expiry_day()
+
+    def _pool(self, workshop_state: "WorkshopState") -> ContractPool:
+        # Callers may still assign a plain list to active_contracts.
+        contracts = workshop_state.active_contracts
+        if not isinstance(contracts, ContractPool):
+            contracts = workshop_state.active_contracts = ContractPool(contracts)
+        return contracts
+
+    def _build_template_table(self) -> Dict[Tuple[int, bool], _ContractTemplate]:
+        table: Dict[Tuple[int, bool], _ContractTemplate] = {}
+        for day in range(1, self.TEMPLATE_PERIOD + 1):
+            for reputation in (0.0, self.REPUTATION_THRESHOLD):
+                puzzle_type = self._pick_puzzle_type(day)
+                difficulty = self._pick_difficulty(reputation, day)
+                table[day % self.TEMPLATE_PERIOD, reputation >= self.REPUTATION_THRESHOLD] = (
+                    _ContractTemplate(
+                        title=CONTRACT_TITLES.get(puzzle_type, "Contract"),
+                        base_reward=self._reward_for_contract(difficulty, 0.0),
+                        duration_days=self._duration_for_contract(difficulty),
+                        prestige=0.1 * difficulty,
+                        materials_required=tuple(
+                            self._materials_for_puzzle(puzzle_type, day).items()
+                        ),
+                        puzzle_type=puzzle_type,
+                        puzzle_difficulty=difficulty,
+                    )
+                )
+        return table
+
+    def _build_contract_for_state(
+        self, workshop_state: "WorkshopState", current_day: int
+    ) -> Contract:
+        if current_day < 1:
+            raise ValueError("Start day must be positive.")
+        reputation = workshop_state.reputation
+        template = self._templates[
+            current_day % self.TEMPLATE_PERIOD, reputation >= self.REPUTATION_THRESHOLD
         ]
+        contract_id = self._next_id
 
-    def _build_contract_for_state(self, workshop_state: "WorkshopState") -> Contract:
-        current_day = workshop_state.day
-        puzzle_type = self._pick_puzzle_type(current_day)
-        difficulty = self._pick_difficulty(workshop_state.reputation, current_day)
-        materials_required = self._materials_for_puzzle(puzzle_type, current_day)
-        reward = self._reward_for_contract(difficulty, workshop_state.reputation)
-        duration = self._duration_for_contract(difficulty)
-        name = self._contract_name(puzzle_type)
-
-        contract = Contract(
-            id=self._next_id,
-            name=name,
-            reward_money=reward,
-            duration_days=duration,
-            prestige=0.1 * difficulty,
-            materials_required=materials_required,
-            puzzle_type=puzzle_type,
-            puzzle_difficulty=difficulty,
-            start_day=current_day,
+        contract = Contract._trusted(
+            contract_id,
+            f"{template.title} #{contract_id}",
+            template.base_reward + max(0.0, reputation) * self.REPUTATION_REWARD_RATE,
+            template.duration_days,
+            template.prestige,
+            dict(template.materials_required),
+            template.puzzle_type,
+            template.puzzle_difficulty,
+            current_day,
         )
-        self._next_id += 1
+        self._next_id = contract_id + 1
         return contract
 
     def _pick_puzzle_type(self, day: int) -> PuzzleType:
@@ -110,7 +304,7 @@ class ContractsSystem:
 
     def _pick_difficulty(self, reputation: float, day: int) -> int:
         base = 1 + (day % 3)
-        bonus = 1 if reputation >= 5.0 and base < 3 else 0
+        bonus = 1 if reputation >= self.REPUTATION_THRESHOLD and base < 3 else 0
         return min(3, base + bonus)
 
     def _materials_for_puzzle(self, puzzle_type: PuzzleType, day: int) -> Dict[str, int]:
@@ -123,16 +317,8 @@ class ContractsSystem:
 
     def _reward_for_contract(self, difficulty: int, reputation: float) -> float:
         base_reward = 120.0 + (difficulty * 60.0)
-        reputation_bonus = max(0.0, reputation) * 15.0
+        reputation_bonus = max(0.0, reputation) * self.REPUTATION_REWARD_RATE
         return base_reward + reputation_bonus
 
     def _duration_for_contract(self, difficulty: int) -> int:
         return max(2, 5 - difficulty)
-
-    def _contract_name(self, puzzle_type: PuzzleType) -> str:
-        titles = {
-            PuzzleType.GEARS: "Workshop Mechanism",
-            PuzzleType.PIGMENTS: "Portrait Commission",
-            PuzzleType.ANATOMY: "Anatomical Study",
-        }
-        return f"{titles.get(puzzle_type, 'Contract')} #{self._next_id}"
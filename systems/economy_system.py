@@ -6,10 +6,14 @@ from world.workshop_state import WorkshopState
 class EconomySystem:
     """Handles daily financial and inspiration adjustments."""
 
-    def apply_daily_upkeep(self, workshop_state: WorkshopState) -> float:
-        workshop_state.money -= workshop_state.daily_upkeep
+    def apply_daily_upkeep(self, workshop_state: WorkshopState, days: int = 1) -> float:
+        """Charge upkeep for the given number of days in a single step."""
+        workshop_state.money -= workshop_state.daily_upkeep * days
+        workshop_state.notify_changed("money")
         return workshop_state.money
 
-    def apply_inspiration_gain(self, workshop_state: WorkshopState) -> float:
-        workshop_state.inspiration += workshop_state.inspiration_gain
+    def apply_inspiration_gain(self, workshop_state: WorkshopState, days: int = 1) -> float:
+        """Accumulate inspiration for the given number of days in a single step."""
+        workshop_state.inspiration += workshop_state.inspiration_gain * days
+        workshop_state.notify_changed("inspiration")
         return workshop_state.inspiration
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Mapping, NamedTuple, Optional, Set, Tuple, TYPE_CHECKING
+
+from systems.contracts import KNOWN_MATERIALS, Contract
+from systems.materials_system import MaterialsSystem
+from world.inventory import material_vector
+
+if TYPE_CHECKING:
+    from world.workshop_state import WorkshopState
+
+
+class Shortfall(NamedTuple):
+    """Materials still needed for a contract and what buying them would cost."""
+
+    contract: Contract
+    missing: Dict[str, int]
+    cost: float
+
+
+def value_per_day(contract: Contract) -> float:
+    """Reward earned per day of the contract's duration."""
+    return contract.reward_money / contract.duration_days
+
+
+class _IndexedContract:
+    __slots__ = ("contract", "requirements", "value", "missing", "cost_key")
+
+    def __init__(self, contract: Contract, requirements: Tuple[int, ...], missing: int) -> None:
+        self.contract = contract
+        self.requirements = requirements
+        self.value = value_per_day(contract)
+        # Number of materials whose stock is below the requirement.
+        self.missing = missing
+        # Position in the cost order while the contract is short and priced.
+        self.cost_key: Optional[Tuple[float, float, int]] = None
+
+
+class FulfillmentIndex:
+    """Answers "which active contracts can I complete right now?" without rescanning.
+
+    Requirement vectors and reward-per-day values are computed once per
+    contract. For every material the index keeps contracts sorted by the
+    amount they need, so a stock change only revisits the contracts whose
+    requirement lies between the old and new stock. Contract changes are
+    read from the pool's change log, so only added and removed ids are
+    touched. Shortfall costs under the last prices asked for stay sorted
+    for ``cheapest_shortfall``. The index follows the workshop through
+    ``StateChanges`` subscriptions; call ``refresh`` after editing the state
+    without ``notify_changed``.
+    """
+
+    def __init__(
+        self,
+        workshop_state: "WorkshopState",
+        materials_system: Optional[MaterialsSystem] = None,
+    ) -> None:
+        self.workshop_state = workshop_state
+        self.materials_system = materials_system or MaterialsSystem()
+        self._entries: Dict[int, _IndexedContract] = {}
+        self._by_material: List[List[Tuple[int, int]]] = [[] for _ in KNOWN_MATERIALS]
+        self._by_value: List[Tuple[float, int]] = []
+        self._fulfillable: Set[int] = set()
+        self._stock: List[int] = list(workshop_state.materials.counts)
+        self._pool = workshop_state.active_contracts
+        self._pool_position = self._pool.change_position
+        # Per-material prices the costs were computed with; None until asked.
+        self._prices: Optional[Tuple[Optional[float], ...]] = None
+        # (cost, -value per day, id) for short contracts whose prices are known.
+        self._by_cost: List[Tuple[float, float, int]] = []
+        # Short contracts needing a material without a price.
+        self._unpriced: Set[int] = set()
+        self._subscriptions = [
+            workshop_state.changes.subscribe("contracts", self._on_contracts_changed),
+            workshop_state.changes.subscribe("materials", self._on_materials_changed),
+        ]
+        self.refresh()
+
+    def close(self) -> None:
+        """Stop following the workshop state."""
+        for subscription in self._subscriptions:
+            subscription.cancel()
+        self._subscriptions = []
+
+    def refresh(self) -> None:
+        """Rebuild the index from scratch."""
+        self._entries.clear()
+        for entries in self._by_material:
+            entries.clear()
+        self._by_value.clear()
+        self._fulfillable.clear()
+        self._by_cost.clear()
+        self._unpriced.clear()
+        self._stock = list(self.workshop_state.materials.counts)
+        self._pool = self.workshop_state.active_contracts
+        self._pool_position = self._pool.change_position
+        for contract in self._pool:
+            self._add(contract)
+
+    def is_fulfillable(self, contract_id: int) -> bool:
+        return contract_id in self._fulfillable
+
+    def fulfillable(self) -> List[Contract]:
+        """Active contracts that current stock covers, best reward per day first."""
+        fulfillable = self._fulfillable
+        return [
+            self._entries[contract_id].contract
+            for _, contract_id in self._by_value
+            if contract_id in fulfillable
+        ]
+
+    def top_k(self, k: int, fulfillable_only: bool = True) -> List[Contract]:
+        """Return up to ``k`` contracts with the highest reward per day."""
+        if k <= 0:
+            return []
+        top: List[Contract] = []
+        for _, contract_id in self._by_value:
+            if fulfillable_only and contract_id not in self._fulfillable:
+                continue
+            top.append(self._entries[contract_id].contract)
+            if len(top) == k:
+                break
+        return top
+
+    def shortfall(self, contract_id: int) -> Dict[str, int]:
+        """
+        Return the materials still missing for a contract.
+
+        Raises:
+            ValueError: If the contract is not indexed.
+        """
+        entry = self._entry(contract_id)
+        return {
+            KNOWN_MATERIALS[index]: required - have
+            for index, (required, have) in enumerate(zip(entry.requirements, self._stock))
+            if required > have
+        }
+
+    def cheapest_shortfall(self, prices_per_unit: Mapping[str, float]) -> Optional[Shortfall]:
+        """
+        Find the unfulfillable contract that is cheapest to complete by buying materials.
+
+        Returns None when every active contract is already fulfillable. Costs
+        are kept sorted between calls with the same prices, so repeated
+        queries do not revisit every contract.
+
+        Raises:
+            ValueError: If a missing material has no price.
+        """
+        prices = tuple(prices_per_unit.get(name) for name in KNOWN_MATERIALS)
+        if prices != self._prices:
+            self._prices = prices
+            self._by_cost.clear()
+            self._unpriced.clear()
+            for contract_id, entry in self._entries.items():
+                entry.cost_key = None
+                self._update_cost(contract_id, entry)
+        if self._unpriced:
+            contract_id = next(iter(self._unpriced))
+            name = next(name for name in self.shortfall(contract_id) if name not in prices_per_unit)
+            raise ValueError(f"No price given for material '{name}'.")
+        if not self._by_cost:
+            return None
+        cost, _, contract_id = self._by_cost[0]
+        return Shortfall(self._entries[contract_id].contract, self.shortfall(contract_id), cost)
+
+    def buy_shortfall(self, contract_id: int, prices_per_unit: Mapping[str, float]) -> Dict[str, int]:
+        """
+        Buy exactly the materials a contract is missing, as one transaction.
+
+        Raises:
+            ValueError: If the contract is not indexed or the purchase fails.
+        """
+        missing = self.shortfall(contract_id)
+        if missing:
+            self.materials_system.purchase_materials(
+                self.workshop_state, missing, prices_per_unit
+            )
+        return missing
+
+    def _entry(self, contract_id: int) -> _IndexedContract:
+        entry = self._entries.get(contract_id)
+        if entry is None:
+            raise ValueError(f"Contract {contract_id} is not active.")
+        return entry
+
+    def _add(self, contract: Contract) -> None:
+        requirements = material_vector(contract.materials_required)
+        missing = sum(1 for required, have in zip(requirements, self._stock) if required > have)
+        entry = _IndexedContract(contract, requirements, missing)
+        self._entries[contract.id] = entry
+        for index, required in enumerate(requirements):
+            if required:
+                insort(self._by_material[index], (required, contract.id))
+        insort(self._by_value, (-entry.value, contract.id))
+        if missing == 0:
+            self._fulfillable.add(contract.id)
+        self._update_cost(contract.id, entry)
+
+    def _remove(self, contract_id: int) -> None:
+        entry = self._entries.pop(contract_id)
+        for index, required in enumerate(entry.requirements):
+            if required:
+                _remove_sorted(self._by_material[index], (required, contract_id))
+        _remove_sorted(self._by_value, (-entry.value, contract_id))
+        self._fulfillable.discard(contract_id)
+        if entry.cost_key is not None:
+            _remove_sorted(self._by_cost, entry.cost_key)
+        self._unpriced.discard(contract_id)
+
+    def _update_cost(self, contract_id: int, entry: _IndexedContract) -> None:
+        prices = self._prices
+        if prices is None:
+            return
+        if entry.cost_key is not None:
+            _remove_sorted(self._by_cost, entry.cost_key)
+            entry.cost_key = None
+        self._unpriced.discard(contract_id)
+        if entry.missing == 0:
+            return
+        cost = 0.0
+        for required, have, price in zip(entry.requirements, self._stock, prices):
+            if required > have:
+                if price is None:
+                    self._unpriced.add(contract_id)
+                    return
+                cost += (required - have) * price
+        entry.cost_key = (cost, -entry.value, contract_id)
+        insort(self._by_cost, entry.cost_key)
+
+    def _on_contracts_changed(self, workshop_state: "WorkshopState", field_name: str) -> None:
+        pool = workshop_state.active_contracts
+        changed = pool.changed_since(self._pool_position) if pool is self._pool else None
+        if changed is None:
+            self.refresh()
+            return
+        self._pool_position = pool.change_position
+        for contract_id in dict.fromkeys(changed):
+            contract = pool.get(contract_id)
+            entry = self._entries.get(contract_id)
+            if entry is not None and entry.contract is not contract:
+                self._remove(contract_id)
+                entry = None
+            if entry is None and contract is not None:
+                self._add(contract)
+
+    def _on_materials_changed(self, workshop_state: "WorkshopState", field_name: str) -> None:
+        stock = list(workshop_state.materials.counts)
+        # Contracts needing more than the lower stock level cost a different amount now.
+        repriced: Set[int] = set()
+        for index, (old, new) in enumerate(zip(self._stock, stock)):
+            if old == new:
+                continue
+            # Only requirements in (low, high] change sides of the stock level.
+            low, high = (old, new) if old < new else (new, old)
+            entries = self._by_material[index]
+            start = bisect_right(entries, (low, float("inf")))
+            stop = bisect_right(entries, (high, float("inf")))
+            if self._prices is not None:
+                repriced.update(contract_id for _, contract_id in entries[start:])
+            change = -1 if new > old else 1
+            for _, contract_id in entries[start:stop]:
+                entry = self._entries[contract_id]
+                entry.missing += change
+                if entry.missing == 0:
+                    self._fulfillable.add(contract_id)
+                else:
+                    self._fulfillable.discard(contract_id)
+        self._stock = stock
+        for contract_id in repriced:
+            self._update_cost(contract_id, self._entries[contract_id])
+
+
+def _remove_sorted(entries: List[tuple], item: tuple) -> None:
+    position = bisect_left(entries, item)
+    if position < len(entries) and entries[position] == item:
+        del entries[position]
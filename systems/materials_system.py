@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from typing import Mapping
+
+from world.inventory import MaterialInventory, material_vector
 from world.workshop_state import WorkshopState
 
 
@@ -32,6 +35,7 @@ class MaterialsSystem:
 
         workshop_state.money -= total_cost
         workshop_state.materials[material_name] += amount
+        workshop_state.notify_changed("money", "materials")
         return workshop_state.materials[material_name]
 
     def remove_material(
@@ -53,8 +57,70 @@ class MaterialsSystem:
             raise ValueError("Not enough material available to remove.")
 
         workshop_state.materials[material_name] = current_amount - amount
+        workshop_state.notify_changed("materials")
         return workshop_state.materials[material_name]
 
+    def purchase_materials(
+        self,
+        workshop_state: WorkshopState,
+        amounts: Mapping[str, int],
+        prices_per_unit: Mapping[str, float],
+    ) -> MaterialInventory:
+        """
+        Purchase several materials in one all-or-nothing transaction.
+
+        Raises:
+            ValueError: If any amount is not positive, any price is missing or
+            negative, any material is unknown, or the total cost exceeds the
+            available money. Nothing is changed in that case.
+        """
+        total_cost = 0.0
+        for material_name, amount in amounts.items():
+            if amount <= 0:
+                raise ValueError("Amount to purchase must be positive.")
+            price = prices_per_unit.get(material_name)
+            if price is None:
+                raise ValueError(f"No price given for material '{material_name}'.")
+            if price < 0:
+                raise ValueError("Price per unit cannot be negative.")
+            total_cost += amount * price
+        delta = material_vector(amounts)
+        if workshop_state.money < total_cost:
+            raise ValueError("Not enough money to purchase materials.")
+
+        inventory = self._inventory(workshop_state)
+        inventory.apply(delta)
+        workshop_state.money -= total_cost
+        workshop_state.notify_changed("money", "materials")
+        return inventory
+
+    def consume_materials(
+        self, workshop_state: WorkshopState, requirements: Mapping[str, int]
+    ) -> MaterialInventory:
+        """
+        Remove a whole requirement, such as a contract's ``materials_required``, at once.
+
+        Raises:
+            ValueError: If any amount is not positive, any material is unknown,
+            or any material is short. Nothing is changed in that case.
+        """
+        if any(amount <= 0 for amount in requirements.values()):
+            raise ValueError("Amount to remove must be positive.")
+        delta = tuple(-amount for amount in material_vector(requirements))
+        inventory = self._inventory(workshop_state)
+        if not inventory.can_apply(delta):
+            raise ValueError("Not enough material available to remove.")
+        inventory.apply(delta)
+        workshop_state.notify_changed("materials")
+        return inventory
+
+    def _inventory(self, workshop_state: WorkshopState) -> MaterialInventory:
+        # Callers may still assign a plain dict to materials.
+        materials = workshop_state.materials
+        if not isinstance(materials, MaterialInventory):
+            materials = workshop_state.materials = MaterialInventory(materials)
+        return materials
+
     def _validate_material_exists(
         self, workshop_state: WorkshopState, material_name: str
     ) -> None:
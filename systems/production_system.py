@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from systems.contracts import Contract, PuzzleType
+from systems.materials_system import MaterialsSystem
+from world.workshop_state import WorkshopRoom, WorkshopState
+
+ROOM_FOR_PUZZLE: Dict[PuzzleType, WorkshopRoom] = {
+    PuzzleType.GEARS: WorkshopRoom.MECHANICAL_WORKSHOP,
+    PuzzleType.PIGMENTS: WorkshopRoom.PAINTING_STUDIO,
+    PuzzleType.ANATOMY: WorkshopRoom.LABORATORY,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    """An accepted contract waiting for or occupying a room."""
+
+    contract: Contract
+    room: WorkshopRoom
+    priority: int
+    work_days: int
+    accepted_day: int
+
+
+class ProductionSystem:
+    """Turns accepted contracts into jobs worked on in the matching room.
+
+    Each room runs up to its capacity of jobs at once; the rest wait in a
+    priority queue (higher priority first, then first accepted). A job's
+    length is fixed when it is accepted, from the puzzle difficulty and the
+    workshop's inspiration. Running jobs sit in one heap ordered by
+    completion day, so a day costs time proportional to the jobs finishing
+    on it, however many are in progress. A finished job pays its contract's
+    reward and prestige and frees its slot for the next queued job that day.
+    """
+
+    # Days of work at zero inspiration, by puzzle difficulty.
+    BASE_WORK_DAYS: Dict[int, int] = {1: 2, 2: 4, 3: 7}
+    # Each this much inspiration adds the base speed once more.
+    INSPIRATION_PER_SPEEDUP = 20.0
+    DEFAULT_ROOM_CAPACITY = 1
+
+    def __init__(
+        self,
+        room_capacity: Optional[Dict[WorkshopRoom, int]] = None,
+        materials_system: Optional[MaterialsSystem] = None,
+    ) -> None:
+        capacity = dict.fromkeys(WorkshopRoom, self.DEFAULT_ROOM_CAPACITY)
+        capacity.update(room_capacity or {})
+        if any(slots < 0 for slots in capacity.values()):
+            raise ValueError("Room capacity cannot be negative.")
+        self.room_capacity = capacity
+        self.materials_system = (
+            materials_system if materials_system is not None else MaterialsSystem()
+        )
+        self.jobs_completed = 0
+        # Bumped on every change to the jobs, so savers can skip quiet days.
+        self.version = 0
+        self._queues: Dict[WorkshopRoom, List[Tuple[int, int, Job]]] = {
+            room: [] for room in WorkshopRoom
+        }
+        self._running: Dict[WorkshopRoom, int] = dict.fromkeys(WorkshopRoom, 0)
+        # (completion day, sequence, job) for every running job.
+        self._completions: List[Tuple[int, int, Job]] = []
+        self._seq = 0
+
+    def work_days(self, contract: Contract, inspiration: float) -> int:
+        """Whole days a contract takes once started, at least one."""
+        speed = 1.0 + max(inspiration, 0.0) / self.INSPIRATION_PER_SPEEDUP
+        return max(1, math.ceil(self.BASE_WORK_DAYS[contract.puzzle_difficulty] / speed))
+
+    def accept_contract(
+        self, workshop_state: WorkshopState, contract_id: int, priority: int = 0
+    ) -> Job:
+        """
+        Take an active contract on as a job: consume its materials, remove it
+        from the offers and queue it in its room, starting it today if the
+        room has a free slot.
+
+        Raises:
+            ValueError: If the contract is not active, its room is missing or
+            has no capacity, or materials are short; nothing changes then.
+        """
+        contracts = workshop_state.active_contracts
+        contract = contracts.get(contract_id)
+        if contract is None:
+            raise ValueError(f"Contract {contract_id} is not active.")
+        room = ROOM_FOR_PUZZLE[contract.puzzle_type]
+        if room not in workshop_state.rooms:
+            raise ValueError(f"The workshop has no {room.value}.")
+        if self.room_capacity[room] == 0:
+            raise ValueError(f"The {room.value} has no capacity for jobs.")
+        self.materials_system.consume_materials(workshop_state, contract.materials_required)
+        contracts.pop_id(contract_id)
+        workshop_state.notify_changed("contracts")
+
+        job = Job(
+            contract,
+            room,
+            priority,
+            self.work_days(contract, workshop_state.inspiration),
+            workshop_state.day,
+        )
+        self._seq += 1
+        self.version += 1
+        heapq.heappush(self._queues[room], (-priority, self._seq, job))
+        self._start_queued(room, workshop_state.day)
+        return job
+
+    def advance(self, workshop_state: WorkshopState, day: int) -> List[Job]:
+        """
+        Finish every job due by ``day``, paying out and starting queued jobs
+        in the freed slots on the day each slot frees up.
+
+        Returns:
+            The finished jobs in completion order.
+        """
+        completions = self._completions
+        finished: List[Job] = []
+        while completions and completions[0][0] <= day:
+            finish_day, _, job = heapq.heappop(completions)
+            self._running[job.room] -= 1
+            workshop_state.money += job.contract.reward_money
+            workshop_state.reputation += job.contract.prestige
+            finished.append(job)
+            self._start_queued(job.room, finish_day)
+        if finished:
+            self.jobs_completed += len(finished)
+            self.version += 1
+            workshop_state.notify_changed("money", "reputation")
+        return finished
+
+    def next_completion_day(self) -> Optional[int]:
+        return self._completions[0][0] if self._completions else None
+
+    def queued_jobs(self, room: WorkshopRoom) -> List[Job]:
+        """Jobs waiting for the room, in the order they will start."""
+        return [job for _, _, job in sorted(self._queues[room])]
+
+    def running_jobs(self, room: WorkshopRoom) -> List[Tuple[int, Job]]:
+        """(completion day, job) for the jobs in progress in the room, soonest first."""
+        return [(day, job) for day, _, job in sorted(self._completions) if job.room == room]
+
+    def jobs(self) -> List[Job]:
+        """Every running and queued job."""
+        jobs = [job for _, _, job in self._completions]
+        for queue in self._queues.values():
+            jobs.extend(job for _, _, job in queue)
+        return jobs
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number given to the most recently accepted job."""
+        return self._seq
+
+    def job_entries(self) -> List[Tuple[int, Optional[int], Job]]:
+        """(sequence, completion day or None while queued, job) for every job, for saving."""
+        entries: List[Tuple[int, Optional[int], Job]] = [
+            (seq, day, job) for day, seq, job in self._completions
+        ]
+        for queue in self._queues.values():
+            entries.extend((seq, None, job) for _, seq, job in queue)
+        return entries
+
+    def restore(
+        self,
+        entries: Iterable[Tuple[int, Optional[int], Job]],
+        jobs_completed: int,
+        sequence: int,
+    ) -> None:
+        """
+        Replace every job with saved ``job_entries`` and counters.
+
+        Raises:
+            ValueError: If a sequence number repeats or is outside 1..``sequence``.
+        """
+        queues: Dict[WorkshopRoom, List[Tuple[int, int, Job]]] = {
+            room: [] for room in WorkshopRoom
+        }
+        running = dict.fromkeys(WorkshopRoom, 0)
+        completions: List[Tuple[int, int, Job]] = []
+        seen = set()
+        for seq, completion_day, job in entries:
+            if seq in seen or not 0 < seq <= sequence:
+                raise ValueError(f"Invalid job sequence number {seq}.")
+            seen.add(seq)
+            if completion_day is None:
+                queues[job.room].append((-job.priority, seq, job))
+            else:
+                running[job.room] += 1
+                completions.append((completion_day, seq, job))
+        for queue in queues.values():
+            heapq.heapify(queue)
+        heapq.heapify(completions)
+        self._queues = queues
+        self._running = running
+        self._completions = completions
+        self.jobs_completed = jobs_completed
+        self._seq = sequence
+        self.version += 1
+
+    def fork(self) -> "ProductionSystem":
+        """Independent copy for lookahead; jobs are immutable and shared."""
+        clone = ProductionSystem(self.room_capacity, self.materials_system)
+        clone._adopt(self)
+        return clone
+
+    def commit(self, branch: "ProductionSystem") -> None:
+        """Adopt a branch created by ``fork``."""
+        self.room_capacity = dict(branch.room_capacity)
+        self._adopt(branch)
+
+    def _adopt(self, other: "ProductionSystem") -> None:
+        self.jobs_completed = other.jobs_completed
+        # Past both histories, so savers notice the adopted jobs.
+        self.version = max(self.version, other.version) + 1
+        self._queues = {room: list(queue) for room, queue in other._queues.items()}
+        self._running = dict(other._running)
+        self._completions = list(other._completions)
+        self._seq = other._seq
+
+    def _start_queued(self, room: WorkshopRoom, day: int) -> None:
+        queue = self._queues[room]
+        while queue and self._running[room] < self.room_capacity[room]:
+            _, seq, job = heapq.heappop(queue)
+            self._running[room] += 1
+            self.version += 1
+            heapq.heappush(self._completions, (day + job.work_days, seq, job))
+
+    def __len__(self) -> int:
+        return len(self._completions) + sum(len(queue) for queue in self._queues.values())
@@ -1,28 +1,484 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+import random
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from systems.contracts import KNOWN_MATERIALS
+from systems.rng import RandomService
+from world.workshop_state import WorkshopRoom, WorkshopState
+
+
+@dataclass(frozen=True)
+class EventCondition:
+    """Preconditions on the workshop for an event to be drawable. None means unbounded."""
+
+    min_day: Optional[int] = None
+    max_day: Optional[int] = None
+    min_money: Optional[float] = None
+    max_money: Optional[float] = None
+    min_reputation: Optional[float] = None
+    required_room: Optional[WorkshopRoom] = None
+
+    def matches(self, workshop_state: WorkshopState) -> bool:
+        if self.min_day is not None and workshop_state.day < self.min_day:
+            return False
+        if self.max_day is not None and workshop_state.day > self.max_day:
+            return False
+        if self.min_money is not None and workshop_state.money < self.min_money:
+            return False
+        if self.max_money is not None and workshop_state.money > self.max_money:
+            return False
+        if self.min_reputation is not None and workshop_state.reputation < self.min_reputation:
+            return False
+        if self.required_room is not None and self.required_room not in workshop_state.rooms:
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class EventEffect:
+    """Changes applied to the workshop when an event fires."""
+
+    money: float = 0.0
+    reputation: float = 0.0
+    inspiration: float = 0.0
+    materials: Tuple[Tuple[str, int], ...] = ()
+
+    def __post_init__(self) -> None:
+        unknown = [name for name, _ in self.materials if name not in KNOWN_MATERIALS]
+        if unknown:
+            raise ValueError(f"Unknown materials in event effect: {', '.join(unknown)}.")
 
 
 @dataclass
 class RandomEvent:
-    """Placeholder for random workshop events."""
+    """A workshop event with a draw weight, preconditions and effects."""
 
     name: str
     description: str
+    weight: float = 1.0
+    condition: EventCondition = field(default_factory=EventCondition)
+    effect: EventEffect = field(default_factory=EventEffect)
+
+    def __post_init__(self) -> None:
+        if self.weight < 0:
+            raise ValueError("Event weight cannot be negative.")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RandomEvent":
+        """Build an event from a content-pack entry."""
+        condition = dict(data.get("condition", {}))
+        if condition.get("required_room") is not None:
+            condition["required_room"] = WorkshopRoom(condition["required_room"])
+        effect = dict(data.get("effect", {}))
+        effect["materials"] = tuple(
+            (name, int(amount)) for name, amount in effect.get("materials", {}).items()
+        )
+        return cls(
+            name=data["name"],
+            description=data.get("description", ""),
+            weight=float(data.get("weight", 1.0)),
+            condition=EventCondition(**condition),
+            effect=EventEffect(**effect),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Content-pack entry that ``from_dict`` turns back into an equal event."""
+        condition = {
+            name: getattr(self.condition, name)
+            for name in EventCondition.__dataclass_fields__
+            if getattr(self.condition, name) is not None
+        }
+        if "required_room" in condition:
+            condition["required_room"] = condition["required_room"].value
+        effect = self.effect
+        return {
+            "name": self.name,
+            "description": self.description,
+            "weight": self.weight,
+            "condition": condition,
+            "effect": {
+                "money": effect.money,
+                "reputation": effect.reputation,
+                "inspiration": effect.inspiration,
+                "materials": dict(effect.materials),
+            },
+        }
+
+
+class AliasTable:
+    """Walker/Vose alias table for O(1) sampling from fixed weights."""
+
+    __slots__ = ("_probability", "_alias")
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValueError("Alias table needs at least one positive weight.")
+        scaled = [weight * count / total for weight in weights]
+        self._probability = [1.0] * count
+        self._alias = list(range(count))
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self._probability[low] = scaled[low]
+            self._alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+        # Whatever remains is 1.0 up to rounding and keeps its default entries.
+
+    def sample(self, generator: random.Random) -> int:
+        column = int(generator.random() * len(self._probability))
+        if generator.random() < self._probability[column]:
+            return column
+        return self._alias[column]
+
+
+class _EventBucket:
+    """Events sharing one precondition, sampled through a single alias table."""
+
+    __slots__ = ("condition", "events", "total_weight", "table")
+
+    def __init__(self, condition: EventCondition) -> None:
+        self.condition = condition
+        self.events: List[RandomEvent] = []
+        self.total_weight = 0.0
+        self.table: Optional[AliasTable] = None
+
+    def rebuild(self) -> None:
+        self.total_weight = sum(event.weight for event in self.events)
+        self.table = AliasTable([event.weight for event in self.events])
+
+
+# (workshop attribute, lower bound field, upper bound field) for each ranged precondition.
+_RANGES: Tuple[Tuple[str, str, Optional[str]], ...] = (
+    ("day", "min_day", "max_day"),
+    ("money", "min_money", "max_money"),
+    ("reputation", "min_reputation", None),
+)
+_ROOMS = "rooms"
+
+
+def _meets(condition: EventCondition, attribute: str, value: Any) -> bool:
+    """Whether ``value`` satisfies the condition's precondition on ``attribute``."""
+    if attribute == _ROOMS:
+        return condition.required_room is None or condition.required_room in value
+    for name, low_field, high_field in _RANGES:
+        if name == attribute:
+            low = getattr(condition, low_field)
+            high = getattr(condition, high_field) if high_field is not None else None
+            return (low is None or value >= low) and (high is None or value <= high)
+    raise ValueError(f"Unknown precondition attribute '{attribute}'.")
+
+
+class _EligibilityIndex:
+    """Tracks which buckets a workshop state satisfies as the state moves.
+
+    Every bound of a ranged precondition is a point in a sorted list per
+    attribute, so a move from one value to another re-checks only the
+    buckets with a bound in between. Eligible buckets keep their weight in a
+    sum tree, and drawing walks the tree in O(log n) without visiting
+    ineligible buckets.
+    """
+
+    __slots__ = ("buckets", "_bounds", "_by_room", "_size", "_values", "_met", "_failing", "_tree")
+
+    def __init__(self, buckets: Sequence[_EventBucket]) -> None:
+        self.buckets = tuple(buckets)
+        self._bounds: Dict[str, Tuple[List[float], List[int]]] = {}
+        for attribute, low_field, high_field in _RANGES:
+            fields = [low_field] if high_field is None else [low_field, high_field]
+            pairs = sorted(
+                (value, index)
+                for index, bucket in enumerate(self.buckets)
+                for value in (getattr(bucket.condition, name) for name in fields)
+                if value is not None
+            )
+            self._bounds[attribute] = ([value for value, _ in pairs], [index for _, index in pairs])
+        self._by_room: Dict[WorkshopRoom, List[int]] = {}
+        for index, bucket in enumerate(self.buckets):
+            if bucket.condition.required_room is not None:
+                self._by_room.setdefault(bucket.condition.required_room, []).append(index)
+        self._size = 1 << max(len(self.buckets) - 1, 0).bit_length()
+        # Last values seen per attribute; None until the first sync.
+        self._values: Optional[Dict[str, Any]] = None
+        self._met: Dict[str, bytearray] = {}
+        self._failing: List[int] = []
+        self._tree: List[float] = []
+
+    def copy(self) -> "_EligibilityIndex":
+        """Index sharing the immutable bounds, with its own eligibility state."""
+        clone = _EligibilityIndex.__new__(_EligibilityIndex)
+        clone.buckets = self.buckets
+        clone._bounds = self._bounds
+        clone._by_room = self._by_room
+        clone._size = self._size
+        clone._values = None if self._values is None else dict(self._values)
+        clone._met = {attribute: bytearray(met) for attribute, met in self._met.items()}
+        clone._failing = list(self._failing)
+        clone._tree = list(self._tree)
+        return clone
+
+    def sync(self, workshop_state: WorkshopState) -> None:
+        """Bring eligibility up to date with the workshop's day, money, reputation and rooms."""
+        values = self._values
+        if values is None:
+            self._rebuild(workshop_state)
+            return
+        for attribute, _, _ in _RANGES:
+            value = getattr(workshop_state, attribute)
+            old = values[attribute]
+            if value == old:
+                continue
+            values[attribute] = value
+            points, owners = self._bounds[attribute]
+            low, high = (old, value) if old < value else (value, old)
+            for position in range(bisect_left(points, low), bisect_right(points, high)):
+                index = owners[position]
+                met = _meets(self.buckets[index].condition, attribute, value)
+                self._set_met(index, attribute, met)
+        rooms = frozenset(workshop_state.rooms)
+        if rooms != values[_ROOMS]:
+            for room in rooms ^ values[_ROOMS]:
+                for index in self._by_room.get(room, ()):
+                    self._set_met(index, _ROOMS, room in rooms)
+            values[_ROOMS] = rooms
+
+    def eligible(self) -> List[_EventBucket]:
+        return [bucket for bucket, failing in zip(self.buckets, self._failing) if not failing]
+
+    def sample(self, generator: random.Random) -> Optional[_EventBucket]:
+        """Draw an eligible bucket by total weight, or None when none is eligible."""
+        tree = self._tree
+        if tree[1] <= 0.0:
+            return None
+        target = generator.random() * tree[1]
+        position = 1
+        while position < self._size:
+            left = tree[2 * position]
+            right = tree[2 * position + 1]
+            # Never step into an empty subtree, whatever the float rounding.
+            if right <= 0.0 or (target < left and left > 0.0):
+                position = 2 * position
+            else:
+                target -= left
+                position = 2 * position + 1
+        return self.buckets[position - self._size]
+
+    def _rebuild(self, workshop_state: WorkshopState) -> None:
+        values: Dict[str, Any] = {
+            attribute: getattr(workshop_state, attribute) for attribute, _, _ in _RANGES
+        }
+        values[_ROOMS] = frozenset(workshop_state.rooms)
+        count = len(self.buckets)
+        self._met = {attribute: bytearray(count) for attribute in values}
+        self._failing = [0] * count
+        self._tree = [0.0] * (2 * self._size)
+        for index, bucket in enumerate(self.buckets):
+            for attribute, value in values.items():
+                met = _meets(bucket.condition, attribute, value)
+                self._met[attribute][index] = met
+                if not met:
+                    self._failing[index] += 1
+            if not self._failing[index]:
+                self._tree[self._size + index] = bucket.total_weight
+        for position in range(self._size - 1, 0, -1):
+            self._tree[position] = self._tree[2 * position] + self._tree[2 * position + 1]
+        self._values = values
+
+    def _set_met(self, index: int, attribute: str, met: bool) -> None:
+        flags = self._met[attribute]
+        if flags[index] == met:
+            return
+        flags[index] = met
+        was_eligible = not self._failing[index]
+        self._failing[index] += -1 if met else 1
+        if was_eligible != (not self._failing[index]):
+            weight = self.buckets[index].total_weight if met else 0.0
+            self._set_weight(index, weight)
+
+    def _set_weight(self, index: int, weight: float) -> None:
+        tree = self._tree
+        position = self._size + index
+        tree[position] = weight
+        position //= 2
+        while position:
+            # Recomputed from the children, so sums never drift.
+            tree[position] = tree[2 * position] + tree[2 * position + 1]
+            position //= 2
 
 
 class RandomEventSystem:
-    """Skeleton system for producing random events."""
+    """Weighted random events indexed by precondition.
 
-    def __init__(self) -> None:
-        self._event_pool: List[RandomEvent] = [
-            RandomEvent("Plague in the city", "Production slows as illness spreads."),
-            RandomEvent("Flooded streets", "Deliveries are delayed by high waters."),
-            RandomEvent("Eager students visit", "Inspiration rises after teaching."),
-            RandomEvent("War on the horizon", "Patrons hesitate to spend."),
-        ]
+    Events with identical preconditions share a bucket with a precomputed
+    alias table. An eligibility index keyed on the precondition thresholds
+    follows the workshop as its day, money and reputation move, so a draw
+    only re-checks buckets whose thresholds were crossed since the previous
+    draw, then picks an eligible bucket in O(log n) and an event in O(1).
+    """
+
+    def __init__(
+        self,
+        rng: Optional[RandomService] = None,
+        events: Optional[Iterable[RandomEvent]] = None,
+        daily_event_chance: float = 0.0,
+    ) -> None:
+        if not 0.0 <= daily_event_chance <= 1.0:
+            raise ValueError("daily_event_chance must be between 0 and 1.")
+        self._random = (rng if rng is not None else RandomService()).stream("random_events")
+        self.daily_event_chance = daily_event_chance
+        self._event_pool: List[RandomEvent] = []
+        self._buckets: Dict[EventCondition, _EventBucket] = {}
+        self._bucket_list: List[_EventBucket] = []
+        # Built on first use after the pool changes.
+        self._index: Optional[_EligibilityIndex] = None
+        self._all_buckets_table: Optional[AliasTable] = None
+        self.add_events(events if events is not None else default_events())
+
+    def add_events(self, events: Iterable[RandomEvent]) -> None:
+        """Add events, e.g. from a content pack, and refresh the affected indexes."""
+        touched = set()
+        for event in events:
+            self._event_pool.append(event)
+            if event.weight == 0:
+                continue
+            bucket = self._buckets.get(event.condition)
+            if bucket is None or id(bucket) not in touched:
+                # Buckets may be shared with forks, so changed ones are replaced, not edited.
+                bucket = self._replace_bucket(bucket, event.condition)
+                touched.add(id(bucket))
+            bucket.events.append(event)
+        for bucket in self._bucket_list:
+            if id(bucket) in touched:
+                bucket.rebuild()
+        self._index = None
+        self._all_buckets_table = None
+
+    def fork(self, rng: RandomService) -> "RandomEventSystem":
+        """Copy the system for a forked simulation, drawing from ``rng``'s stream."""
+        clone = RandomEventSystem.__new__(RandomEventSystem)
+        clone._random = rng.stream("random_events")
+        clone.daily_event_chance = self.daily_event_chance
+        clone._event_pool = list(self._event_pool)
+        clone._buckets = dict(self._buckets)
+        clone._bucket_list = list(self._bucket_list)
+        clone._index = self._index.copy() if self._index is not None else None
+        clone._all_buckets_table = self._all_buckets_table
+        return clone
+
+    def _replace_bucket(
+        self, bucket: Optional[_EventBucket], condition: EventCondition
+    ) -> _EventBucket:
+        replacement = _EventBucket(condition)
+        if bucket is None:
+            self._bucket_list.append(replacement)
+        else:
+            replacement.events = list(bucket.events)
+            self._bucket_list[self._bucket_list.index(bucket)] = replacement
+        self._buckets[condition] = replacement
+        return replacement
 
     def possible_events(self) -> List[RandomEvent]:
-        """Return currently available random events (placeholder)."""
+        """Return every event in the pool."""
         return list(self._event_pool)
+
+    def eligible_events(self, workshop_state: WorkshopState) -> List[RandomEvent]:
+        """Return the events whose preconditions the workshop currently meets."""
+        index = self._synced_index(workshop_state)
+        return [event for bucket in index.eligible() for event in bucket.events]
+
+    def draw_event(self, workshop_state: Optional[WorkshopState] = None) -> Optional[RandomEvent]:
+        """
+        Draw one event by weight, restricted to events eligible for the workshop.
+
+        Returns None when no event is eligible.
+        """
+        if workshop_state is None:
+            if not self._bucket_list:
+                return None
+            if self._all_buckets_table is None:
+                self._all_buckets_table = AliasTable(
+                    [bucket.total_weight for bucket in self._bucket_list]
+                )
+            bucket = self._bucket_list[self._all_buckets_table.sample(self._random)]
+        else:
+            bucket = self._synced_index(workshop_state).sample(self._random)
+            if bucket is None:
+                return None
+        return bucket.events[bucket.table.sample(self._random)]
+
+    def _synced_index(self, workshop_state: WorkshopState) -> _EligibilityIndex:
+        if self._index is None:
+            self._index = _EligibilityIndex(self._bucket_list)
+        self._index.sync(workshop_state)
+        return self._index
+
+    def maybe_trigger_daily_event(self, workshop_state: WorkshopState) -> Optional[RandomEvent]:
+        """Roll for today's event and apply it if one fires."""
+        if self.daily_event_chance <= 0.0:
+            return None
+        if self._random.random() >= self.daily_event_chance:
+            return None
+        event = self.draw_event(workshop_state)
+        if event is not None:
+            self.apply_event(workshop_state, event)
+        return event
+
+    def apply_event(self, workshop_state: WorkshopState, event: RandomEvent) -> None:
+        """Apply an event's effects; material stocks never drop below zero."""
+        effect = event.effect
+        changed = []
+        if effect.money:
+            workshop_state.money += effect.money
+            changed.append("money")
+        if effect.reputation:
+            workshop_state.reputation = max(0.0, workshop_state.reputation + effect.reputation)
+            changed.append("reputation")
+        if effect.inspiration:
+            workshop_state.inspiration = max(0.0, workshop_state.inspiration + effect.inspiration)
+            changed.append("inspiration")
+        if effect.materials:
+            materials = workshop_state.materials
+            for name, amount in effect.materials:
+                materials[name] = max(0, materials.get(name, 0) + amount)
+            changed.append("materials")
+        if changed:
+            workshop_state.notify_changed(*changed)
+
+
+def default_events() -> List[RandomEvent]:
+    """The built-in event pool."""
+    return [
+        RandomEvent(
+            "Plague in the city",
+            "Production slows as illness spreads.",
+            weight=1.0,
+            effect=EventEffect(inspiration=-0.5),
+        ),
+        RandomEvent(
+            "Flooded streets",
+            "Deliveries are delayed by high waters.",
+            weight=2.0,
+            effect=EventEffect(materials=(("wood", -1),)),
+        ),
+        RandomEvent(
+            "Eager students visit",
+            "Inspiration rises after teaching.",
+            weight=2.0,
+            condition=EventCondition(required_room=WorkshopRoom.LIBRARY),
+            effect=EventEffect(inspiration=1.0),
+        ),
+        RandomEvent(
+            "War on the horizon",
+            "Patrons hesitate to spend.",
+            weight=1.0,
+            condition=EventCondition(min_day=30),
+            effect=EventEffect(money=-10.0, reputation=-0.2),
+        ),
+    ]
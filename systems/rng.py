@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import hashlib
+import random
+from typing import Any, Dict, Mapping
+
+
+class RandomService:
+    """Single seeded source of randomness shared by every system.
+
+    Each system draws from its own named stream, derived from the master seed,
+    so adding draws in one system does not shift the sequence seen by another.
+    """
+
+    def __init__(self, seed: int = 0) -> None:
+        self.seed = seed
+        self._streams: Dict[str, random.Random] = {}
+
+    def stream(self, name: str) -> random.Random:
+        """Return the deterministic generator for the named stream."""
+        generator = self._streams.get(name)
+        if generator is None:
+            digest = hashlib.sha256(f"{self.seed}:{name}".encode("utf-8")).digest()
+            generator = self._streams[name] = random.Random(int.from_bytes(digest[:8], "big"))
+        return generator
+
+    def fork(self) -> "RandomService":
+        """Return an independent copy whose streams continue from their current positions."""
+        clone = RandomService(self.seed)
+        for name, generator in self._streams.items():
+            # A fixed seed skips the os.urandom call; setstate overwrites it anyway.
+            copy = clone._streams[name] = random.Random(0)
+            copy.setstate(generator.getstate())
+        return clone
+
+    def commit(self, branch: "RandomService") -> None:
+        """Move every stream to a forked service's position, keeping generator identity."""
+        for name, generator in branch._streams.items():
+            self.stream(name).setstate(generator.getstate())
+
+    def getstate(self) -> Dict[str, Any]:
+        """Positions of every stream drawn from so far, as JSON-friendly values."""
+        states: Dict[str, Any] = {}
+        for name, generator in self._streams.items():
+            version, internal, gauss_next = generator.getstate()
+            states[name] = [version, list(internal), gauss_next]
+        return states
+
+    def setstate(self, states: Mapping[str, Any]) -> None:
+        """Move streams to positions from ``getstate``, keeping generator identity."""
+        for name, (version, internal, gauss_next) in states.items():
+            self.stream(name).setstate((version, tuple(internal), gauss_next))
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import heapq
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+LEVELS = 4
+
+EventCallback = Callable[..., Any]
+
+
+class ScheduledEvent:
+    """Handle for a callback registered with a ``TimingWheel``; ``cancel`` withdraws it."""
+
+    __slots__ = ("time", "seq", "callback", "_wheel", "_level", "_slot")
+
+    def __init__(self, time: int, seq: int, callback: EventCallback, wheel: "TimingWheel") -> None:
+        self.time = time
+        self.seq = seq
+        self.callback = callback
+        self._wheel: Optional[TimingWheel] = wheel
+        # Level and slot while stored in the wheel; level None means the overflow heap.
+        self._level: Optional[int] = None
+        self._slot = 0
+
+    @property
+    def pending(self) -> bool:
+        return self._wheel is not None
+
+    def cancel(self) -> bool:
+        """
+        Withdraw the event if it has not fired yet.
+
+        Returns:
+            True if the event was pending.
+        """
+        if self._wheel is None:
+            return False
+        self._wheel._remove(self)
+        return True
+
+    def __repr__(self) -> str:
+        return f"ScheduledEvent(time={self.time}, seq={self.seq}, pending={self.pending})"
+
+
+class TimingWheel:
+    """Hierarchical timing wheel of callbacks keyed by integer time.
+
+    Level ``k`` has 64 slots of 64**k ticks each. An event is stored at the
+    level of the highest base-64 digit in which its time differs from
+    ``now``, so the lowest non-empty slot of the lowest non-empty level always
+    holds the next event. Moving ``now`` only redistributes the one slot that
+    the new time falls into, which keeps advancing proportional to the events
+    that come due rather than to everything pending. Times beyond the top
+    level wait in a heap until the wheel reaches them.
+    """
+
+    def __init__(self, now: int = 0) -> None:
+        self.now = now
+        self._slots: List[List[Dict[int, ScheduledEvent]]] = [
+            [{} for _ in range(SLOTS)] for _ in range(LEVELS)
+        ]
+        self._masks = [0] * LEVELS
+        self._overflow: List[Tuple[int, int, ScheduledEvent]] = []
+        self._count = 0
+        self._seq = 0
+
+    def schedule(self, time: int, callback: EventCallback) -> ScheduledEvent:
+        """
+        Register ``callback`` to fire at ``time``.
+
+        Raises:
+            ValueError: If time is before ``now``.
+        """
+        if time < self.now:
+            raise ValueError(f"Cannot schedule at {time}, before the current time {self.now}.")
+        self._seq += 1
+        event = ScheduledEvent(time, self._seq, callback, self)
+        self._insert(event)
+        self._count += 1
+        return event
+
+    def next_time(self) -> Optional[int]:
+        """Time of the earliest pending event, or None when nothing is scheduled."""
+        if not self._count:
+            return None
+        for level, mask in enumerate(self._masks):
+            if mask:
+                slot = (mask & -mask).bit_length() - 1
+                return min(event.time for event in self._slots[level][slot].values())
+        self._drop_cancelled_overflow()
+        return self._overflow[0][0]
+
+    def pop_next(self) -> List[ScheduledEvent]:
+        """
+        Move ``now`` to the earliest pending time and remove the events due then.
+
+        Returns:
+            The due events in scheduling order; empty when nothing is scheduled.
+        """
+        time = self.next_time()
+        if time is None:
+            return []
+        self.set_now(time)
+        slot = time & SLOT_MASK
+        bucket = self._slots[0][slot]
+        events = sorted(bucket.values(), key=lambda event: event.seq)
+        bucket.clear()
+        self._masks[0] &= ~(1 << slot)
+        self._count -= len(events)
+        for event in events:
+            event._wheel = None
+        return events
+
+    def set_now(self, time: int) -> None:
+        """
+        Move the current time to ``time``.
+
+        Moving forward past pending events, or backward at all, re-files every
+        event; the simulation only does that when a save is loaded.
+        """
+        old = self.now
+        if time == old:
+            return
+        next_time = self.next_time()
+        if time < old or (next_time is not None and next_time < time):
+            self._refile(time)
+            return
+        self.now = time
+        level = ((old ^ time).bit_length() - 1) // SLOT_BITS
+        if level < LEVELS:
+            # Only the slot the new time falls into holds events that now
+            # belong to lower levels.
+            self._cascade(level, (time >> (SLOT_BITS * level)) & SLOT_MASK)
+        self._pull_overflow()
+
+    def copy(self) -> "TimingWheel":
+        """Independent wheel with the same pending callbacks and new handles."""
+        clone = TimingWheel(self.now)
+        clone._seq = self._seq
+        for event in sorted(self._pending(), key=lambda event: event.seq):
+            copied = ScheduledEvent(event.time, event.seq, event.callback, clone)
+            clone._insert(copied)
+            clone._count += 1
+        return clone
+
+    def clear(self) -> None:
+        for event in self._pending():
+            event._wheel = None
+        for level in self._slots:
+            for bucket in level:
+                bucket.clear()
+        self._masks = [0] * LEVELS
+        self._overflow = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _insert(self, event: ScheduledEvent) -> None:
+        differing = (event.time ^ self.now).bit_length()
+        level = (differing - 1) // SLOT_BITS if differing else 0
+        if level >= LEVELS:
+            event._level = None
+            heapq.heappush(self._overflow, (event.time, event.seq, event))
+            return
+        slot = (event.time >> (SLOT_BITS * level)) & SLOT_MASK
+        event._level = level
+        event._slot = slot
+        self._slots[level][slot][event.seq] = event
+        self._masks[level] |= 1 << slot
+
+    def _remove(self, event: ScheduledEvent) -> None:
+        event._wheel = None
+        self._count -= 1
+        if event._level is None:
+            # Cancelled overflow entries are dropped lazily from the heap.
+            return
+        bucket = self._slots[event._level][event._slot]
+        del bucket[event.seq]
+        if not bucket:
+            self._masks[event._level] &= ~(1 << event._slot)
+
+    def _cascade(self, level: int, slot: int) -> None:
+        bucket = self._slots[level][slot]
+        if not bucket:
+            return
+        events = list(bucket.values())
+        bucket.clear()
+        self._masks[level] &= ~(1 << slot)
+        for event in events:
+            self._insert(event)
+
+    def _pull_overflow(self) -> None:
+        overflow = self._overflow
+        top_bits = SLOT_BITS * LEVELS
+        while overflow and (overflow[0][0] >> top_bits) == (self.now >> top_bits):
+            _, _, event = heapq.heappop(overflow)
+            if event._wheel is not None:
+                self._insert(event)
+
+    def _drop_cancelled_overflow(self) -> None:
+        overflow = self._overflow
+        while overflow and overflow[0][2]._wheel is None:
+            heapq.heappop(overflow)
+
+    def _pending(self) -> List[ScheduledEvent]:
+        events = [event for level in self._slots for bucket in level for event in bucket.values()]
+        events.extend(event for _, _, event in self._overflow if event._wheel is not None)
+        return events
+
+    def _refile(self, time: int) -> None:
+        events = self._pending()
+        for level in self._slots:
+            for bucket in level:
+                bucket.clear()
+        self._masks = [0] * LEVELS
+        self._overflow = []
+        self.now = time
+        for event in events:
+            # Overdue events become due immediately.
+            if event.time < time:
+                event.time = time
+            self._insert(event)
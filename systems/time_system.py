@@ -1,25 +1,144 @@
 from __future__ import annotations
 
+from typing import Callable, Optional
+
+from systems.scheduler import ScheduledEvent, TimingWheel
 from world.workshop_state import WorkshopState
 
+DayCallback = Callable[[WorkshopState], None]
+
 
 class TimeSystem:
-    """Simple time tracker that converts frame ticks into in-game days."""
+    """Simple time tracker that converts frame ticks into in-game days.
+
+    It also owns a ``TimingWheel`` of callbacks for future times. Times are
+    absolute ticks, ``day * ticks_per_day + tick_counter``; each callback is
+    called with the workshop state once time reaches it, with the state's
+    day and ``tick_counter`` set to the event's time.
+    """
 
     def __init__(self, ticks_per_day: int = 300) -> None:
         if ticks_per_day <= 0:
             raise ValueError("ticks_per_day must be a positive integer.")
         self.ticks_per_day: int = ticks_per_day
         self._tick_counter: int = 0
+        self.scheduler = TimingWheel()
+
+    def __copy__(self) -> "TimeSystem":
+        # Branches get their own schedule so firing or cancelling there leaves
+        # the original untouched.
+        clone = TimeSystem(self.ticks_per_day)
+        clone._tick_counter = self._tick_counter
+        clone.scheduler = self.scheduler.copy()
+        return clone
 
     @property
     def tick_counter(self) -> int:
         """Current progress toward the next in-game day."""
         return self._tick_counter
 
+    @tick_counter.setter
+    def tick_counter(self, value: int) -> None:
+        if not 0 <= value < self.ticks_per_day:
+            raise ValueError("tick_counter must be between 0 and ticks_per_day - 1.")
+        self._tick_counter = value
+
+    @property
+    def ticks_until_next_day(self) -> int:
+        """Number of ticks remaining before the workshop's day advances."""
+        return self.ticks_per_day - self._tick_counter
+
+    def now(self, workshop_state: WorkshopState) -> int:
+        """Current absolute time in ticks."""
+        return workshop_state.day * self.ticks_per_day + self._tick_counter
+
+    def time_of(self, day: int, tick: int = 0) -> int:
+        """Absolute time of ``tick`` ticks into ``day``."""
+        return day * self.ticks_per_day + tick
+
+    def schedule_at(self, time: int, callback: DayCallback) -> ScheduledEvent:
+        """
+        Call ``callback(workshop_state)`` when time reaches ``time``.
+
+        Raises:
+            ValueError: If time is before the time the system last advanced to.
+        """
+        return self.scheduler.schedule(time, callback)
+
+    def schedule_day(self, day: int, callback: DayCallback) -> ScheduledEvent:
+        """Call ``callback(workshop_state)`` as ``day`` begins, before its daily systems run."""
+        return self.schedule_at(self.time_of(day), callback)
+
+    def schedule_in(
+        self, workshop_state: WorkshopState, ticks: int, callback: DayCallback
+    ) -> ScheduledEvent:
+        """Call ``callback(workshop_state)`` ``ticks`` ticks from now."""
+        self._sync(workshop_state)
+        return self.schedule_at(self.now(workshop_state) + ticks, callback)
+
+    def ticks_until_next_event(self, workshop_state: WorkshopState) -> Optional[int]:
+        """Ticks until the next scheduled callback, or None when none is pending."""
+        if not self.scheduler:
+            return None
+        self._sync(workshop_state)
+        return self.scheduler.next_time() - self.now(workshop_state)
+
     def tick(self, workshop_state: WorkshopState) -> None:
         """Advance the internal counter and progress the workshop's day."""
+        if self.scheduler:
+            self.advance(workshop_state, 1)
+            return
         self._tick_counter += 1
         if self._tick_counter >= self.ticks_per_day:
             workshop_state.day += 1
             self._tick_counter = 0
+            workshop_state.notify_changed("day")
+
+    def advance(self, workshop_state: WorkshopState, ticks: int) -> int:
+        """
+        Advance by several ticks at once, equivalent to calling ``tick`` repeatedly.
+
+        Returns:
+            The number of in-game days that passed.
+
+        Raises:
+            ValueError: If ticks is negative.
+        """
+        if ticks < 0:
+            raise ValueError("ticks cannot be negative.")
+        if not self.scheduler:
+            days_passed, self._tick_counter = divmod(
+                self._tick_counter + ticks, self.ticks_per_day
+            )
+            if days_passed:
+                workshop_state.day += days_passed
+                workshop_state.notify_changed("day")
+            return days_passed
+
+        self._sync(workshop_state)
+        scheduler = self.scheduler
+        start_day = workshop_state.day
+        target = self.now(workshop_state) + ticks
+        # Jump from one due event to the next; empty stretches cost nothing.
+        while True:
+            due = scheduler.next_time()
+            if due is None or due > target:
+                break
+            events = scheduler.pop_next()
+            self._set_time(workshop_state, due)
+            for event in events:
+                event.callback(workshop_state)
+        self._set_time(workshop_state, target)
+        scheduler.set_now(target)
+        return workshop_state.day - start_day
+
+    def _set_time(self, workshop_state: WorkshopState, time: int) -> None:
+        day, self._tick_counter = divmod(time, self.ticks_per_day)
+        if day != workshop_state.day:
+            workshop_state.day = day
+            workshop_state.notify_changed("day")
+
+    def _sync(self, workshop_state: WorkshopState) -> None:
+        # The day can also change outside the time system (loading a save,
+        # committing a branch); keep the wheel's clock on the state's time.
+        self.scheduler.set_now(self.now(workshop_state))
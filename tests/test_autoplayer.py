@@ -0,0 +1,111 @@
+import pytest
+
+from core.autoplayer import WAIT, Action, Autoplayer, play_headless, state_key
+from core.replay import InputRecorder, Replayer, state_fingerprint
+from core.simulator import Simulator
+from systems.contracts import Contract, PuzzleType
+from world.workshop_state import WorkshopState
+
+PRICES = {"wood": 4.0, "metal": 10.0, "pigment": 7.0}
+
+
+def _contract(contract_id: int, reward: float, **materials: int) -> Contract:
+    return Contract(
+        id=contract_id,
+        name=f"Contract {contract_id}",
+        reward_money=reward,
+        duration_days=5,
+        prestige=0.1,
+        materials_required=materials,
+        puzzle_type=PuzzleType.GEARS,
+        puzzle_difficulty=1,
+        start_day=1,
+    )
+
+
+def test_legal_actions_skip_unaffordable_and_unprofitable_contracts() -> None:
+    state = WorkshopState(money=30.0, materials={"wood": 1})
+    state.active_contracts.extend(
+        [
+            _contract(1, 100.0, wood=1),
+            _contract(2, 100.0, wood=2, metal=2),
+            _contract(3, 100.0, metal=4),
+            _contract(4, 10.0, metal=2),
+        ]
+    )
+    actions = Autoplayer(prices=PRICES).legal_actions(Simulator(state))
+
+    assert actions == [
+        WAIT,
+        Action("complete", 1),
+        Action("complete", 2, (("wood", 1), ("metal", 2))),
+    ]
+
+
+def test_decide_picks_the_best_contract_and_leaves_the_real_state_alone() -> None:
+    state = WorkshopState(money=30.0)
+    state.active_contracts.extend(
+        [_contract(101, 50.0, wood=1), _contract(102, 300.0, metal=2)]
+    )
+    simulator = Simulator(state)
+    before = state_fingerprint(state)
+    autoplayer = Autoplayer(prices=PRICES, depth=2)
+
+    assert autoplayer.decide(simulator) == Action("complete", 102, (("metal", 2),))
+    assert state_fingerprint(state) == before
+    assert autoplayer.last_stats.depth_reached == 2
+
+    autoplayer.act(simulator)
+    assert state.money == pytest.approx(30.0 - 20.0 + 300.0)
+    assert [contract.id for contract in state.active_contracts] == [101]
+
+
+def test_transposition_table_reuses_expansions_across_decisions() -> None:
+    simulator = Simulator()
+    simulator.advance_days(3)
+    autoplayer = Autoplayer(depth=3)
+
+    autoplayer.decide(simulator)
+    first_nodes = autoplayer.last_stats.nodes
+    cached = len(autoplayer._expansions)
+    assert cached > 1
+    autoplayer.decide(simulator)
+    assert len(autoplayer._expansions) == cached
+    assert autoplayer.last_stats.nodes == first_nodes
+
+    key = state_key(simulator)
+    assert state_key(simulator.fork()) == key
+
+
+def test_node_and_time_budgets_stop_the_search() -> None:
+    simulator = Simulator()
+    simulator.advance_days(3)
+
+    limited = Autoplayer(depth=5, max_nodes=1)
+    limited.decide(simulator)
+    assert limited.last_stats.budget_exhausted
+    assert limited.last_stats.depth_reached == 1
+
+    ticks = iter(range(100))
+    timed = Autoplayer(depth=5, time_budget=0.5, clock=lambda: next(ticks))
+    timed.decide(simulator)
+    assert timed.last_stats.budget_exhausted
+
+
+def test_autoplayed_games_replay_exactly() -> None:
+    simulator = Simulator()
+    recorder = InputRecorder.attach(simulator)
+    summary = Autoplayer(depth=2).play(simulator, 20)
+    recording = recorder.finish(simulator)
+
+    assert summary["contracts_completed"] > 0
+    assert summary["final_money"] > 150.0
+    assert Replayer(recording).verify()
+
+
+def test_play_headless_is_deterministic() -> None:
+    first = play_headless(15, seed=4, daily_event_chance=0.3, depth=2)
+    second = play_headless(15, seed=4, daily_event_chance=0.3, depth=2)
+    for summary in (first, second):
+        summary.pop("seconds")
+    assert first == second
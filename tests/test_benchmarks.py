@@ -0,0 +1,30 @@
+from benchmarks.run_benchmarks import compare, run_benchmarks
+
+
+def test_compare_flags_only_drops_beyond_threshold() -> None:
+    baseline = {"a": 100.0, "b": 100.0, "c": 100.0}
+    current = {"a": 95.0, "b": 80.0, "c": 130.0}
+
+    regressions = compare(current, baseline, threshold=0.1)
+
+    assert [metric for metric, *_ in regressions] == ["b"]
+
+
+def test_compare_flags_missing_metrics_outside_only() -> None:
+    baseline = {"pipeline.ticks_per_sec": 100.0, "render.frames_per_sec": 50.0}
+    current = {"pipeline.ticks_per_sec": 100.0}
+
+    assert compare(current, baseline) == [("render.frames_per_sec", 50.0, 0.0, 0.0)]
+    assert compare(current, baseline, only=["pipeline"]) == []
+
+
+def test_small_benchmark_run_reports_rates() -> None:
+    report = run_benchmarks(["pipeline", "contracts", "materials"], scale=0.001, repeat=1)
+
+    assert set(report["results"]) == {
+        "pipeline.ticks_per_sec",
+        "pipeline.days_per_sec",
+        "contracts.churn_days_per_sec",
+        "materials.ops_per_sec",
+    }
+    assert all(rate > 0 for rate in report["results"].values())
@@ -0,0 +1,105 @@
+import pytest
+
+from systems.contracts import Contract, ContractsSystem, PuzzleType
+from world.contract_pool import ContractPool
+from world.workshop_state import WorkshopState
+
+
+def _contract(contract_id: int, start_day: int, duration_days: int) -> Contract:
+    return Contract(
+        id=contract_id,
+        name=f"Contract {contract_id}",
+        reward_money=100.0,
+        duration_days=duration_days,
+        prestige=0.1,
+        materials_required={"wood": 1},
+        puzzle_type=PuzzleType.GEARS,
+        puzzle_difficulty=1,
+        start_day=start_day,
+    )
+
+
+def test_pool_expires_only_due_contracts_and_keeps_order() -> None:
+    first = _contract(1, start_day=1, duration_days=5)
+    second = _contract(2, start_day=1, duration_days=2)
+    third = _contract(3, start_day=2, duration_days=4)
+    pool = ContractPool([first, second, third])
+
+    assert pool.next_expiry_day() == 3
+    assert pool.expire(2) == []
+    assert pool.expire(3) == [second]
+    assert pool == [first, third]
+    assert pool[0] is first
+    assert pool.next_expiry_day() == 6
+
+
+def test_pool_lookup_and_removal_by_id() -> None:
+    contract = _contract(7, start_day=1, duration_days=3)
+    pool = ContractPool([contract])
+
+    assert pool.get(7) is contract
+    assert contract in pool
+    assert pool.pop_id(7) is contract
+    assert pool.get(7) is None
+    assert pool.expire(10) == []
+    assert pool.next_expiry_day() is None
+
+
+def test_pool_rejects_duplicate_ids() -> None:
+    pool = ContractPool([_contract(1, start_day=1, duration_days=3)])
+
+    with pytest.raises(ValueError):
+        pool.append(_contract(1, start_day=2, duration_days=3))
+
+
+def test_contracts_system_accepts_plain_list_assignment() -> None:
+    state = WorkshopState()
+    state.active_contracts = [_contract(1, start_day=1, duration_days=2)]
+
+    expired = ContractsSystem().remove_expired_contracts(state, 3)
+
+    assert [contract.id for contract in expired] == [1]
+    assert isinstance(state.active_contracts, ContractPool)
+    assert state.active_contracts == []
+
+
+def test_forked_pools_copy_storage_only_on_write() -> None:
+    pool = ContractPool([_contract(1, 1, 3), _contract(2, 1, 5)])
+    branch = pool.fork()
+
+    branch.append(_contract(3, 2, 2))
+    assert [contract.id for contract in pool] == [1, 2]
+    assert [contract.id for contract in branch] == [1, 2, 3]
+
+    assert [contract.id for contract in pool.expire(4)] == [1]
+    assert [contract.id for contract in branch] == [1, 2, 3]
+    assert branch.next_expiry_day() == 4
+
+    pool.share_from(branch)
+    assert [contract.id for contract in pool] == [1, 2, 3]
+    branch.pop_id(2)
+    assert [contract.id for contract in pool] == [1, 2, 3]
+    assert [contract.id for contract in branch] == [1, 3]
+
+
+def test_change_log_reports_ids_and_follows_committed_forks() -> None:
+    pool = ContractPool([_contract(1, 1, 3)])
+    position = pool.change_position
+    pool.append(_contract(2, 1, 5))
+    pool.pop_id(1)
+    assert pool.changed_since(position) == [2, 1]
+
+    position = pool.change_position
+    branch = pool.fork()
+    branch.append(_contract(3, 2, 2))
+    branch.expire(4)
+    pool.share_from(branch)
+    assert pool.changed_since(position) == [3, 3]
+
+    position = pool.change_position
+    stale = pool.fork()
+    pool.append(_contract(4, 2, 2))
+    pool.share_from(stale)
+    assert pool.changed_since(position) is None
+    pool.clear()
+    assert pool.changed_since(pool.change_position) == []
@@ -50,3 +50,108 @@ def test_remove_expired_contracts() -> None:
     contracts_system.remove_expired_contracts(state, state.day)
 
     assert not state.active_contracts
+
+
+@pytest.mark.parametrize("reputation", [0.0, 4.9, 5.0, 12.5])
+def test_template_contracts_match_validated_construction(reputation: float) -> None:
+    contracts_system = ContractsSystem(max_active_contracts=1)
+
+    for day in range(1, 13):
+        state = WorkshopState(day=day, reputation=reputation)
+        contracts_system.maybe_generate_daily_contracts(state)
+        generated = state.active_contracts[0]
+
+        difficulty = contracts_system._pick_difficulty(reputation, day)
+        puzzle_type = contracts_system._pick_puzzle_type(day)
+        expected = Contract(
+            id=generated.id,
+            name=generated.name,
+            reward_money=contracts_system._reward_for_contract(difficulty, reputation),
+            duration_days=contracts_system._duration_for_contract(difficulty),
+            prestige=0.1 * difficulty,
+            materials_required=contracts_system._materials_for_puzzle(puzzle_type, day),
+            puzzle_type=puzzle_type,
+            puzzle_difficulty=difficulty,
+            start_day=day,
+        )
+        assert generated == expected
+
+
+def test_generated_contracts_do_not_share_materials() -> None:
+    contracts_system = ContractsSystem(max_active_contracts=2)
+    state = WorkshopState(day=1)
+    contracts_system.maybe_generate_daily_contracts(state)
+    state.day += contracts_system.TEMPLATE_PERIOD
+    contracts_system.maybe_generate_daily_contracts(state)
+
+    first, second = state.active_contracts
+    assert first.materials_required == second.materials_required
+    assert first.materials_required is not second.materials_required
+    assert first.name.endswith("#1") and second.name.endswith("#2")
+
+
+def _user_contract(**overrides) -> Contract:
+    fields = dict(
+        id=1,
+        name="Test",
+        reward_money=10.0,
+        duration_days=1,
+        prestige=0.1,
+        materials_required={"wood": 1},
+        puzzle_type=PuzzleType.GEARS,
+        puzzle_difficulty=1,
+        start_day=1,
+    )
+    fields.update(overrides)
+    return Contract(**fields)
+
+
+def test_contract_uses_slots_and_validates_user_input() -> None:
+    assert not hasattr(_user_contract(), "__dict__")
+
+    with pytest.raises(ValueError):
+        _user_contract(materials_required={"stone": 1})
+
+
+def test_complete_contract_consumes_materials_and_pays_reward() -> None:
+    state = WorkshopState(money=0.0, materials={"wood": 1, "metal": 1})
+    contracts_system = ContractsSystem()
+    contract = Contract(
+        id=7,
+        name="Bridge Model",
+        reward_money=200.0,
+        duration_days=3,
+        prestige=0.2,
+        materials_required={"wood": 1, "metal": 2},
+        puzzle_type=PuzzleType.GEARS,
+        puzzle_difficulty=2,
+        start_day=1,
+    )
+    state.active_contracts.append(contract)
+
+    with pytest.raises(ValueError):
+        contracts_system.complete_contract(state, 7)
+    assert state.active_contracts == [contract]
+    assert state.materials == {"wood": 1, "metal": 1, "pigment": 0}
+
+    state.materials["metal"] = 2
+    assert contracts_system.complete_contract(state, 7) is contract
+    assert state.active_contracts == []
+    assert state.money == 200.0
+    assert state.reputation == pytest.approx(0.2)
+    assert state.materials == {"wood": 0, "metal": 0, "pigment": 0}
+    with pytest.raises(ValueError):
+        contracts_system.complete_contract(state, 7)
+
+
+def test_fast_forward_leaves_the_day_to_the_caller() -> None:
+    state = WorkshopState()
+    contracts_system = ContractsSystem(max_active_contracts=2)
+    day_version = state.changes.version("day")
+
+    contracts_system.fast_forward(state, 1, 10)
+
+    assert state.day == 1
+    assert state.changes.version("day") == day_version
+    assert state.active_contracts
+    assert all(1 <= contract.start_day <= 10 for contract in state.active_contracts)
@@ -0,0 +1,146 @@
+import pytest
+
+from systems.contracts import Contract, ContractsSystem, PuzzleType
+from systems.fulfillment_index import FulfillmentIndex
+from systems.materials_system import MaterialsSystem
+from world.workshop_state import WorkshopState
+
+PRICES = {"wood": 2.0, "metal": 5.0, "pigment": 3.0}
+
+
+def make_contract(contract_id: int, reward: float, duration: int, **materials: int) -> Contract:
+    return Contract(
+        id=contract_id,
+        name=f"Contract #{contract_id}",
+        reward_money=reward,
+        duration_days=duration,
+        prestige=0.1,
+        materials_required=materials,
+        puzzle_type=PuzzleType.GEARS,
+        puzzle_difficulty=1,
+        start_day=1,
+    )
+
+
+def brute_force_fulfillable(state: WorkshopState) -> set:
+    return {
+        contract.id
+        for contract in state.active_contracts
+        if all(state.materials[name] >= amount for name, amount in contract.materials_required.items())
+    }
+
+
+def test_index_tracks_material_and_contract_changes() -> None:
+    state = WorkshopState(money=500.0, materials={"wood": 2})
+    index = FulfillmentIndex(state)
+    contracts_system = ContractsSystem()
+    materials_system = MaterialsSystem()
+
+    state.active_contracts.extend(
+        [
+            make_contract(1, 100.0, 4, wood=2),
+            make_contract(2, 300.0, 2, wood=1, metal=2),
+            make_contract(3, 90.0, 3, pigment=1),
+        ]
+    )
+    state.notify_changed("contracts")
+    assert [contract.id for contract in index.fulfillable()] == [1]
+
+    materials_system.purchase_material(state, "metal", 2, PRICES["metal"])
+    assert [contract.id for contract in index.fulfillable()] == [2, 1]
+    assert [contract.id for contract in index.top_k(1)] == [2]
+    assert [contract.id for contract in index.top_k(5, fulfillable_only=False)] == [2, 3, 1]
+
+    materials_system.remove_material(state, "wood", 1)
+    assert index.fulfillable()[0].id == 2
+    assert not index.is_fulfillable(1)
+
+    contracts_system.complete_contract(state, 2)
+    assert index.fulfillable() == []
+    assert index.shortfall(1) == {"wood": 2}
+    assert brute_force_fulfillable(state) == set()
+
+
+def test_cheapest_shortfall_and_buy() -> None:
+    state = WorkshopState(money=100.0, materials={"wood": 1})
+    state.active_contracts.extend(
+        [make_contract(1, 100.0, 4, metal=2), make_contract(2, 80.0, 4, wood=3)]
+    )
+    index = FulfillmentIndex(state)
+
+    best = index.cheapest_shortfall(PRICES)
+    assert best.contract.id == 2
+    assert best.missing == {"wood": 2}
+    assert best.cost == 4.0
+
+    assert index.buy_shortfall(2, PRICES) == {"wood": 2}
+    assert state.money == 96.0
+    assert index.is_fulfillable(2)
+    assert index.cheapest_shortfall(PRICES).contract.id == 1
+
+    with pytest.raises(ValueError):
+        index.cheapest_shortfall({"wood": 1.0})
+    with pytest.raises(ValueError):
+        index.shortfall(99)
+
+
+def test_index_matches_brute_force_through_simulated_days() -> None:
+    from core.simulator import Simulator
+
+    simulator = Simulator(contracts_system=ContractsSystem(max_active_contracts=5))
+    state = simulator.workshop_state
+    index = FulfillmentIndex(state)
+    materials_system = MaterialsSystem()
+
+    for day in range(40):
+        simulator.advance_days(1)
+        material = ("wood", "metal", "pigment")[day % 3]
+        if state.money >= PRICES[material]:
+            materials_system.purchase_material(state, material, 1, PRICES[material])
+        for contract in index.fulfillable()[:1]:
+            if day % 4 == 0:
+                simulator.contracts_system.complete_contract(state, contract.id)
+        assert {contract.id for contract in index.fulfillable()} == brute_force_fulfillable(state)
+
+    index.close()
+    state.materials["wood"] += 10
+    state.notify_changed("materials")
+    index.refresh()
+    assert {contract.id for contract in index.fulfillable()} == brute_force_fulfillable(state)
+
+
+def brute_force_cheapest(state: WorkshopState, prices: dict) -> tuple:
+    costs = [
+        (
+            sum(
+                (amount - state.materials[name]) * prices[name]
+                for name, amount in contract.materials_required.items()
+                if amount > state.materials[name]
+            ),
+            contract.id,
+        )
+        for contract in state.active_contracts
+        if contract.id not in brute_force_fulfillable(state)
+    ]
+    return min(costs)[0] if costs else None
+
+
+def test_index_updates_only_changed_contracts_and_keeps_costs_sorted(monkeypatch) -> None:
+    from core.simulator import Simulator
+
+    simulator = Simulator(contracts_system=ContractsSystem(max_active_contracts=6))
+    state = simulator.workshop_state
+    index = FulfillmentIndex(state)
+    materials_system = MaterialsSystem()
+    monkeypatch.setattr(index, "refresh", lambda: pytest.fail("index rescanned the pool"))
+
+    for day in range(30):
+        simulator.advance_days(1)
+        material = ("wood", "metal", "pigment")[day % 3]
+        if state.money >= PRICES[material]:
+            materials_system.purchase_material(state, material, 1, PRICES[material])
+        best = index.cheapest_shortfall(PRICES)
+        assert (best.cost if best else None) == brute_force_cheapest(state, PRICES)
+        if best is not None and day % 5 == 0 and state.money >= best.cost:
+            index.buy_shortfall(best.contract.id, PRICES)
+        assert {contract.id for contract in index.fulfillable()} == brute_force_fulfillable(state)
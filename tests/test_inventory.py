@@ -0,0 +1,75 @@
+import pytest
+
+from systems.materials_system import MaterialsSystem
+from world.inventory import MaterialInventory, material_vector
+from world.workshop_state import WorkshopState
+
+
+def test_inventory_behaves_like_fixed_key_dict() -> None:
+    inventory = MaterialInventory({"wood": 2})
+    inventory["metal"] += 3
+
+    assert inventory == {"wood": 2, "metal": 3, "pigment": 0}
+    assert inventory.vector() == (2, 3, 0)
+    assert "stone" not in inventory
+    with pytest.raises(KeyError):
+        inventory["stone"] = 1
+    with pytest.raises(ValueError):
+        inventory["wood"] = -1
+
+
+def test_inventory_apply_is_all_or_nothing() -> None:
+    inventory = MaterialInventory({"wood": 2, "metal": 1})
+
+    with pytest.raises(ValueError):
+        inventory.apply((-1, -2, 0))
+
+    assert inventory.vector() == (2, 1, 0)
+    inventory.apply((-1, -1, 4))
+    assert inventory.vector() == (1, 0, 4)
+
+
+def test_purchase_materials_charges_total_atomically() -> None:
+    state = WorkshopState(money=20.0)
+    materials_system = MaterialsSystem()
+    prices = {"wood": 2.0, "metal": 3.0, "pigment": 5.0}
+
+    materials_system.purchase_materials(state, {"wood": 2, "metal": 1}, prices)
+    assert state.money == 13.0
+    assert state.materials == {"wood": 2, "metal": 1, "pigment": 0}
+
+    with pytest.raises(ValueError):
+        materials_system.purchase_materials(state, {"wood": 1, "pigment": 3}, prices)
+    with pytest.raises(ValueError):
+        materials_system.purchase_materials(state, {"wood": 1, "stone": 1}, prices)
+
+    assert state.money == 13.0
+    assert state.materials == {"wood": 2, "metal": 1, "pigment": 0}
+
+
+def test_consume_materials_leaves_state_untouched_on_shortfall() -> None:
+    state = WorkshopState(materials={"wood": 3, "metal": 1, "pigment": 0})
+    materials_system = MaterialsSystem()
+
+    with pytest.raises(ValueError):
+        materials_system.consume_materials(state, {"wood": 2, "metal": 2})
+    assert state.materials.vector() == (3, 1, 0)
+
+    materials_system.consume_materials(state, {"wood": 2, "metal": 1})
+    assert state.materials.vector() == (1, 0, 0)
+    assert material_vector({"metal": 2}) == (0, 2, 0)
+
+
+def test_forked_inventory_copies_counts_on_first_write() -> None:
+    inventory = MaterialInventory({"wood": 2})
+    branch = inventory.fork()
+    assert branch.counts is inventory.counts
+
+    branch["wood"] = 5
+    inventory.apply((0, 1, 0))
+    assert inventory.vector() == (2, 1, 0)
+    assert branch.vector() == (5, 0, 0)
+
+    inventory.share_from(branch)
+    branch["metal"] = 4
+    assert inventory.vector() == (5, 0, 0)
@@ -0,0 +1,37 @@
+import pytest
+
+from core.loop import MAX_TIME_SCALE, FixedTimestep
+
+
+def test_steps_follow_accumulated_time_not_frame_count() -> None:
+    timestep = FixedTimestep(step_seconds=0.01)
+
+    assert timestep.steps_for_frame(0.025) == 2
+    assert timestep.steps_for_frame(0.004) == 0
+    assert timestep.steps_for_frame(0.001) == 1
+    assert timestep.alpha == pytest.approx(0.0)
+
+
+def test_time_scale_multiplies_steps_per_frame() -> None:
+    timestep = FixedTimestep(step_seconds=0.01, time_scale=10.0)
+
+    assert timestep.steps_for_frame(0.05) == 50
+
+
+def test_catch_up_is_capped_and_backlog_dropped() -> None:
+    timestep = FixedTimestep(step_seconds=0.01, max_steps_per_frame=5, max_frame_seconds=1.0)
+
+    assert timestep.steps_for_frame(0.2) == 5
+    assert timestep.dropped_steps == 15
+    assert timestep.steps_for_frame(0.01) == 1
+
+
+def test_max_time_scale_runs_the_step_cap_every_frame() -> None:
+    timestep = FixedTimestep(max_steps_per_frame=1_000, time_scale=MAX_TIME_SCALE)
+
+    assert timestep.steps_for_frame(0.0) == 1_000
+
+
+def test_time_scale_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        FixedTimestep(time_scale=0.0)
@@ -0,0 +1,113 @@
+import csv
+import io
+import zipfile
+
+import pytest
+
+from core.metrics import COLUMNS, MetricsRecorder
+from core.simulator import Simulator
+from systems.time_system import TimeSystem
+from world.workshop_state import WorkshopState
+
+
+def _record_days(recorder: MetricsRecorder, moneys) -> None:
+    state = WorkshopState()
+    for day, money in enumerate(moneys, start=1):
+        state.day = day
+        state.money = money
+        recorder.record(state)
+
+
+def test_ring_buffer_keeps_the_latest_days_in_order() -> None:
+    recorder = MetricsRecorder(capacity=4, overflow="ring")
+    _record_days(recorder, [10, 20, 30, 40, 50, 60])
+
+    assert len(recorder) == 4
+    assert recorder.total_days == 6
+    assert recorder.values("day") == [3, 4, 5, 6]
+    assert recorder.values("money_mean") == [30.0, 40.0, 50.0, 60.0]
+    assert [len(segment) for segment in recorder.segments("money_mean")] == [2, 2]
+
+
+def test_downsampling_keeps_min_max_and_mean_per_bucket() -> None:
+    moneys = [float((day * 37) % 101) for day in range(1, 51)]
+    recorder = MetricsRecorder(capacity=5, overflow="downsample")
+    _record_days(recorder, moneys)
+
+    assert len(recorder) <= 5
+    assert recorder.total_days == 50
+    days = recorder.values("days")
+    assert sum(days) == 50
+    start = 0
+    for first_day, width, low, high, mean in zip(
+        recorder.values("day"),
+        days,
+        recorder.values("money_min"),
+        recorder.values("money_max"),
+        recorder.values("money_mean"),
+    ):
+        bucket = moneys[start : start + width]
+        assert first_day == start + 1
+        assert low == min(bucket)
+        assert high == max(bucket)
+        assert mean == pytest.approx(sum(bucket) / len(bucket))
+        start += width
+
+
+def test_segments_share_the_recorder_memory() -> None:
+    recorder = MetricsRecorder(capacity=8)
+    _record_days(recorder, [1, 2, 3])
+
+    (view,) = recorder.segments("money_mean")
+    _record_days(recorder, [4])
+
+    assert view.obj is recorder.segments("money_mean")[0].obj
+    with pytest.raises(ValueError):
+        recorder.segments("gold_mean")
+
+
+def test_csv_export_streams_one_line_per_row() -> None:
+    recorder = MetricsRecorder(capacity=3)
+    _record_days(recorder, [5, 6, 7, 8])
+
+    lines = list(recorder.iter_csv())
+    rows = list(csv.reader(io.StringIO("".join(lines))))
+
+    assert len(lines) == 4
+    assert tuple(rows[0]) == COLUMNS
+    assert [float(row[COLUMNS.index("money_mean")]) for row in rows[1:]] == [6.0, 7.0, 8.0]
+
+
+def test_npz_export_matches_the_columns(tmp_path) -> None:
+    recorder = MetricsRecorder(capacity=3)
+    _record_days(recorder, [5, 6, 7, 8])
+    path = tmp_path / "metrics.npz"
+    recorder.write_npz(str(path))
+
+    with zipfile.ZipFile(path) as archive:
+        assert sorted(archive.namelist()) == sorted(f"{name}.npy" for name in COLUMNS)
+
+    numpy = pytest.importorskip("numpy")
+    with numpy.load(path) as data:
+        assert data["money_mean"].tolist() == [6.0, 7.0, 8.0]
+        assert data["day"].tolist() == [2, 3, 4]
+
+
+def test_attached_recorder_sees_every_fast_forwarded_day() -> None:
+    simulator = Simulator(time_system=TimeSystem(ticks_per_day=5))
+    recorder = MetricsRecorder(capacity=64).attach(simulator)
+    simulator.fast_forward_days(30)
+
+    assert recorder.values("day") == list(range(2, 32))
+    assert recorder.values("money_mean")[-1] == simulator.workshop_state.money
+
+    recorder.detach()
+    simulator.advance_days(3)
+    assert recorder.total_days == 30
+
+
+def test_invalid_configuration_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        MetricsRecorder(capacity=1)
+    with pytest.raises(ValueError):
+        MetricsRecorder(overflow="drop")
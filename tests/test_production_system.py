@@ -0,0 +1,199 @@
+import pytest
+
+from core.commands import accept_contract
+from core.simulator import Simulator
+from systems.contracts import Contract, ContractsSystem, PuzzleType
+from systems.production_system import ProductionSystem
+from systems.time_system import TimeSystem
+from core.replay import InputRecorder, Replayer
+from world.save_game import SaveGame
+from world.workshop_state import WorkshopRoom, WorkshopState
+
+
+def _contract(contract_id: int, puzzle_type: PuzzleType, difficulty: int = 1) -> Contract:
+    return Contract(
+        id=contract_id,
+        name=f"Job {contract_id}",
+        reward_money=10.0 * contract_id,
+        duration_days=30,
+        prestige=1.0,
+        materials_required={"wood": 1},
+        puzzle_type=puzzle_type,
+        puzzle_difficulty=difficulty,
+        start_day=1,
+    )
+
+
+def _state(*contracts: Contract) -> WorkshopState:
+    return WorkshopState(inspiration=0.0, materials={"wood": 100}, active_contracts=list(contracts))
+
+
+def test_jobs_route_to_rooms_and_queue_by_priority() -> None:
+    gears = [_contract(i, PuzzleType.GEARS) for i in (1, 2, 3)]
+    state = _state(*gears, _contract(4, PuzzleType.ANATOMY))
+    production = ProductionSystem()
+
+    for contract_id, priority in ((1, 0), (2, 0), (3, 5), (4, 0)):
+        production.accept_contract(state, contract_id, priority)
+
+    assert list(state.active_contracts) == []
+    assert state.materials["wood"] == 96
+    workshop = WorkshopRoom.MECHANICAL_WORKSHOP
+    assert [job.contract.id for _, job in production.running_jobs(workshop)] == [1]
+    assert [job.contract.id for job in production.queued_jobs(workshop)] == [3, 2]
+    assert [job.contract.id for _, job in production.running_jobs(WorkshopRoom.LABORATORY)] == [4]
+    assert len(production) == 4
+
+
+def test_completion_pays_out_and_starts_the_next_job_that_day() -> None:
+    state = _state(_contract(1, PuzzleType.PIGMENTS), _contract(2, PuzzleType.PIGMENTS, 2))
+    production = ProductionSystem()
+    production.accept_contract(state, 1)
+    production.accept_contract(state, 2)
+    money = state.money
+
+    assert production.advance(state, 2) == []
+    assert [job.contract.id for job in production.advance(state, 3)] == [1]
+    assert state.money == money + 10.0
+    assert production.running_jobs(WorkshopRoom.PAINTING_STUDIO)[0][0] == 3 + 4
+    assert [job.contract.id for job in production.advance(state, 100)] == [2]
+    assert state.reputation == 2.0
+    assert production.next_completion_day() is None
+
+
+def test_inspiration_shortens_work() -> None:
+    production = ProductionSystem()
+    contract = _contract(1, PuzzleType.GEARS, difficulty=3)
+
+    assert production.work_days(contract, 0.0) == 7
+    assert production.work_days(contract, 20.0) == 4
+    assert production.work_days(contract, 1_000.0) == 1
+
+
+def test_rejected_acceptances_change_nothing() -> None:
+    state = _state(_contract(1, PuzzleType.ANATOMY))
+    state.rooms.remove(WorkshopRoom.LABORATORY)
+    production = ProductionSystem()
+
+    with pytest.raises(ValueError):
+        production.accept_contract(state, 1)
+    with pytest.raises(ValueError):
+        production.accept_contract(state, 99)
+    state.rooms.append(WorkshopRoom.LABORATORY)
+    state.materials["wood"] = 0
+    with pytest.raises(ValueError):
+        production.accept_contract(state, 1)
+
+    assert [contract.id for contract in state.active_contracts] == [1]
+    assert len(production) == 0
+
+
+def test_thousands_of_concurrent_jobs_finish_in_order() -> None:
+    contracts = [_contract(i, PuzzleType.GEARS, 1 + i % 3) for i in range(1, 5_001)]
+    state = _state(*contracts)
+    state.materials["wood"] = 5_000
+    production = ProductionSystem({WorkshopRoom.MECHANICAL_WORKSHOP: 1_000})
+    for contract in contracts:
+        production.accept_contract(state, contract.id)
+
+    finished = []
+    for day in range(1, 60):
+        finished.extend(production.advance(state, day))
+
+    assert len(finished) == 5_000 == production.jobs_completed
+    assert len(production) == 0
+
+
+def test_simulator_fast_forward_matches_stepping_with_jobs() -> None:
+    def run(fast: bool) -> WorkshopState:
+        simulator = Simulator(
+            time_system=TimeSystem(ticks_per_day=5),
+            contracts_system=ContractsSystem(max_active_contracts=3),
+        )
+        simulator.workshop_state.materials.update({"wood": 50, "metal": 50, "pigment": 50})
+        for _ in range(4):
+            simulator.advance_days(3)
+            for contract in list(simulator.workshop_state.active_contracts):
+                simulator.execute(accept_contract(contract.id))
+            if fast:
+                simulator.fast_forward_days(40)
+            else:
+                simulator.advance_days(40)
+        return simulator
+
+    stepped, fast = run(fast=False), run(fast=True)
+
+    assert stepped.production_system.jobs_completed > 0
+    assert fast.production_system.jobs_completed == stepped.production_system.jobs_completed
+    assert fast.workshop_state.money == pytest.approx(stepped.workshop_state.money)
+    assert fast.workshop_state.reputation == pytest.approx(stepped.workshop_state.reputation)
+    assert [c.id for c in fast.workshop_state.active_contracts] == [
+        c.id for c in stepped.workshop_state.active_contracts
+    ]
+
+
+def test_forked_simulations_keep_separate_jobs() -> None:
+    simulator = Simulator(time_system=TimeSystem(ticks_per_day=5))
+    simulator.workshop_state.materials.update({"wood": 50, "metal": 50, "pigment": 50})
+    simulator.advance_days(1)
+    contract = simulator.workshop_state.active_contracts[0]
+
+    branch = simulator.fork()
+    branch.execute(accept_contract(contract.id))
+
+    assert len(branch.production_system) == 1
+    assert len(simulator.production_system) == 0
+    simulator.commit(branch)
+    assert len(simulator.production_system) == 1
+
+
+def _busy_simulator() -> Simulator:
+    simulator = Simulator(time_system=TimeSystem(ticks_per_day=5))
+    simulator.workshop_state.materials.update({"wood": 50, "metal": 50, "pigment": 50})
+    simulator.advance_days(3)
+    for contract in list(simulator.workshop_state.active_contracts):
+        simulator.execute(accept_contract(contract.id))
+    return simulator
+
+
+def _production_state(production: ProductionSystem):
+    return sorted(production.job_entries(), key=lambda entry: entry[0]), production.jobs_completed
+
+
+def test_save_game_keeps_running_and_queued_jobs(tmp_path) -> None:
+    simulator = _busy_simulator()
+    save_game = SaveGame(str(tmp_path / "workshop.sav"))
+    systems = (simulator.time_system, simulator.contracts_system, simulator.production_system)
+    save_game.autosave(simulator.workshop_state, *systems)
+    for _ in range(6):
+        simulator.advance_days(1)
+        for contract in list(simulator.workshop_state.active_contracts):
+            simulator.execute(accept_contract(contract.id, priority=contract.id))
+        save_game.autosave(simulator.workshop_state, *systems)
+    assert save_game.journal_records == 6
+
+    production = ProductionSystem()
+    time_system = TimeSystem(ticks_per_day=5)
+    contracts_system = ContractsSystem()
+    state = SaveGame(save_game.snapshot_path).load(time_system, contracts_system, production)
+    assert _production_state(production) == _production_state(simulator.production_system)
+
+    reloaded = Simulator(
+        state,
+        time_system=time_system,
+        contracts_system=contracts_system,
+        production_system=production,
+    )
+    simulator.advance_days(30)
+    reloaded.advance_days(30)
+    assert reloaded.workshop_state.money == simulator.workshop_state.money
+    assert production.jobs_completed == simulator.production_system.jobs_completed
+
+
+def test_replay_from_a_snapshot_with_jobs_in_progress() -> None:
+    simulator = _busy_simulator()
+    assert len(simulator.production_system) > 0
+    recorder = InputRecorder.attach(simulator)
+    simulator.advance_days(20)
+
+    assert Replayer(recorder.finish(simulator)).verify()
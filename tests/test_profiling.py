@@ -0,0 +1,49 @@
+import json
+
+from core.profiling import Profiler
+from core.simulator import Simulator
+from systems.time_system import TimeSystem
+
+
+def test_disabled_profiler_records_nothing() -> None:
+    profiler = Profiler()
+    simulator = Simulator(time_system=TimeSystem(ticks_per_day=2), profiler=profiler)
+
+    profiler.begin_frame()
+    with profiler.section("update"):
+        simulator.advance_days(5)
+    profiler.end_frame()
+
+    assert profiler.sections() == []
+    assert not profiler.counters
+
+
+def test_enabled_profiler_tracks_sections_and_daily_counters() -> None:
+    profiler = Profiler(enabled=True)
+    simulator = Simulator(time_system=TimeSystem(ticks_per_day=2), profiler=profiler)
+
+    for _ in range(3):
+        profiler.begin_frame()
+        simulator.advance_days(10)
+        profiler.end_frame()
+
+    assert profiler.counters["days_processed"] == 30
+    assert profiler.counters["contracts_generated"] > 0
+    assert profiler.per_day("contracts_generated") <= 1.0
+    assert {"frame", "economy", "contracts.expire", "simulation.days"} <= set(
+        profiler.sections()
+    )
+    stats = profiler.percentiles()
+    assert 0.0 < stats["p50"] <= stats["p95"] <= stats["p99"]
+
+
+def test_chrome_trace_export(tmp_path) -> None:
+    profiler = Profiler(enabled=True)
+    with profiler.section("render"):
+        pass
+    path = tmp_path / "trace.json"
+
+    profiler.export_chrome_trace(str(path))
+
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [(event["name"], event["ph"]) for event in events] == [("render", "X")]
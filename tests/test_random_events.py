@@ -0,0 +1,139 @@
+import random
+from collections import Counter
+
+import pytest
+
+from core import commands
+from core.replay import InputRecorder, Replayer
+from core.simulator import Simulator
+from systems.random_events import (
+    AliasTable,
+    EventCondition,
+    EventEffect,
+    RandomEvent,
+    RandomEventSystem,
+)
+from systems.rng import RandomService
+from systems.time_system import TimeSystem
+from world.workshop_state import WorkshopRoom, WorkshopState
+
+
+def test_alias_table_follows_weights() -> None:
+    table = AliasTable([1.0, 3.0, 0.0, 6.0])
+    generator = random.Random(3)
+
+    counts = Counter(table.sample(generator) for _ in range(20_000))
+
+    assert counts[2] == 0
+    assert counts[0] / 20_000 == pytest.approx(0.1, abs=0.02)
+    assert counts[3] / 20_000 == pytest.approx(0.6, abs=0.02)
+
+
+def test_draw_respects_preconditions() -> None:
+    events = [
+        RandomEvent("Late", "", condition=EventCondition(min_day=10)),
+        RandomEvent("Rich", "", condition=EventCondition(min_money=1_000.0)),
+        RandomEvent("Library", "", condition=EventCondition(required_room=WorkshopRoom.LIBRARY)),
+    ]
+    events += [
+        RandomEvent(f"Late {index}", "", condition=EventCondition(min_day=10))
+        for index in range(500)
+    ]
+    system = RandomEventSystem(RandomService(1), events=events)
+
+    early = WorkshopState(day=1, rooms=[WorkshopRoom.LIBRARY])
+    assert {system.draw_event(early).name for _ in range(50)} == {"Library"}
+    assert system.draw_event(WorkshopState(day=1, rooms=[])) is None
+
+    late = WorkshopState(day=20, rooms=[])
+    assert all(system.draw_event(late).name.startswith("Late") for _ in range(50))
+    assert len(system.eligible_events(late)) == 501
+
+
+def test_daily_event_applies_effects_and_clamps_materials() -> None:
+    event = RandomEvent(
+        "Windfall",
+        "",
+        effect=EventEffect(money=25.0, inspiration=1.0, materials=(("wood", -3), ("metal", 2))),
+    )
+    system = RandomEventSystem(events=[event], daily_event_chance=1.0)
+    state = WorkshopState()
+
+    assert system.maybe_trigger_daily_event(state) is event
+    assert state.money == 175.0
+    assert state.materials == {"wood": 0, "metal": 2, "pigment": 0}
+    assert state.changes.version("materials") == 1
+
+
+def test_content_pack_entries_and_validation() -> None:
+    event = RandomEvent.from_dict(
+        {
+            "name": "Guild fair",
+            "weight": 3,
+            "condition": {"min_reputation": 2.0, "required_room": "Library"},
+            "effect": {"money": 40, "materials": {"pigment": 2}},
+        }
+    )
+
+    assert event.condition.required_room is WorkshopRoom.LIBRARY
+    assert event.effect.materials == (("pigment", 2),)
+    with pytest.raises(ValueError):
+        EventEffect(materials=(("stone", 1),))
+
+
+def test_replay_with_random_events_enabled() -> None:
+    rng = RandomService(11)
+    simulator = Simulator(
+        time_system=TimeSystem(ticks_per_day=3),
+        rng=rng,
+        random_event_system=RandomEventSystem(rng, daily_event_chance=0.5),
+    )
+    recorder = InputRecorder.attach(simulator)
+    simulator.execute(commands.purchase_material("wood", 5, price_per_unit=1.0))
+    simulator.fast_forward_days(60)
+    recording = recorder.finish(simulator)
+
+    assert simulator.workshop_state.inspiration != pytest.approx(5.0 + 60 * 0.1)
+    assert Replayer(recording).verify()
+
+
+def test_eligibility_index_follows_a_drifting_workshop() -> None:
+    generator = random.Random(5)
+    rooms = list(WorkshopRoom)
+    events = []
+    for index in range(400):
+        low_day = generator.randint(1, 200)
+        events.append(
+            RandomEvent(
+                f"Event {index}",
+                "",
+                weight=generator.uniform(0.5, 3.0),
+                condition=EventCondition(
+                    min_day=low_day,
+                    max_day=low_day + generator.randint(0, 80),
+                    min_money=generator.choice([None, generator.uniform(-50.0, 300.0)]),
+                    max_money=generator.choice([None, generator.uniform(100.0, 500.0)]),
+                    min_reputation=generator.choice([None, generator.uniform(0.0, 5.0)]),
+                    required_room=generator.choice([None, *rooms]),
+                ),
+            )
+        )
+    system = RandomEventSystem(RandomService(2), events=events)
+    branch = None
+    state = WorkshopState()
+    for step in range(300):
+        state.day += generator.randint(0, 3)
+        state.money += generator.uniform(-40.0, 40.0)
+        state.reputation = max(0.0, state.reputation + generator.uniform(-0.5, 0.6))
+        if step % 50 == 0:
+            state.rooms = generator.sample(rooms, generator.randint(0, len(rooms)))
+        if step == 150:
+            branch = system.fork(RandomService(9))
+
+        expected = {event.name for event in events if event.condition.matches(state)}
+        assert {event.name for event in system.eligible_events(state)} == expected
+        drawn = system.draw_event(state)
+        assert (drawn is None) == (not expected)
+        assert drawn is None or drawn.name in expected
+        if branch is not None:
+            assert {event.name for event in branch.eligible_events(state)} == expected
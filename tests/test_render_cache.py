@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from systems.contracts import ContractsSystem
+from ui.render_cache import TextCache
+from ui.workshop_scene import WorkshopScene
+from world.workshop_state import WorkshopState
+
+
+@pytest.fixture(autouse=True)
+def _pygame():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def test_text_cache_memoizes_and_evicts_least_recently_used() -> None:
+    font = pygame.font.Font(None, 20)
+    color = pygame.Color("white")
+    cache = TextCache(max_entries=2)
+
+    first = cache.render(font, "a", color)
+    cache.render(font, "b", color)
+    assert cache.render(font, "a", color) is first
+    cache.render(font, "c", color)
+
+    assert len(cache) == 2
+    assert cache.hits == 1
+    assert cache.render(font, "a", color) is first
+    assert cache.misses == 3
+    cache.render(font, "b", color)
+    assert cache.misses == 4
+
+
+def test_workshop_scene_reports_only_changed_regions() -> None:
+    surface = pygame.Surface((640, 360))
+    state = WorkshopState()
+    scene = WorkshopScene(state)
+
+    assert scene.render(surface) is None
+    assert scene.render(surface) == []
+
+    state.money -= 10
+    state.notify_changed("money")
+    dirty = scene.render(surface)
+    assert len(dirty) == 1
+    assert dirty[0].top == 50
+
+    ContractsSystem().maybe_generate_daily_contracts(state)
+    dirty = scene.render(surface)
+    assert dirty and all(rect.top >= 360 - scene.panel_height for rect in dirty)
+
+
+def test_workshop_scene_redraws_fully_after_resize() -> None:
+    scene = WorkshopScene(WorkshopState())
+    scene.render(pygame.Surface((640, 360)))
+
+    assert scene.render(pygame.Surface((800, 600))) is None
+
+
+def test_history_graph_redraws_only_when_a_day_is_recorded() -> None:
+    from core.metrics import MetricsRecorder
+
+    surface = pygame.Surface((640, 360))
+    state = WorkshopState()
+    metrics = MetricsRecorder(capacity=16)
+    scene = WorkshopScene(state, metrics=metrics)
+    scene.render(surface)
+    assert scene.render(surface) == []
+
+    for money in (90.0, 120.0, 80.0):
+        state.money = money
+        metrics.record(state)
+    dirty = scene.render(surface)
+
+    assert dirty == [pygame.Rect(scene.history_rect)]
+    assert scene.render(surface) == []
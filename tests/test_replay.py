@@ -0,0 +1,71 @@
+from core import commands
+from core.replay import InputRecorder, Recording, Replayer
+from core.simulator import Simulator
+from systems.random_events import EventEffect, RandomEvent, RandomEventSystem
+from systems.rng import RandomService
+from systems.time_system import TimeSystem
+
+
+def _record_session() -> Recording:
+    simulator = Simulator(time_system=TimeSystem(ticks_per_day=20), rng=RandomService(7))
+    simulator.advance_ticks(33)
+    recorder = InputRecorder.attach(simulator)
+
+    simulator.execute(commands.purchase_material("wood", 3, price_per_unit=2.0))
+    simulator.advance_days(4)
+    first_contract = simulator.workshop_state.active_contracts[0]
+    simulator.execute(commands.decline_contract(first_contract.id))
+    simulator.advance_ticks(57)
+    simulator.execute(commands.remove_material("wood", 1))
+    simulator.advance_days(10)
+    return recorder.finish(simulator)
+
+
+def test_replay_reproduces_final_state(tmp_path) -> None:
+    recording = _record_session()
+    path = str(tmp_path / "session.jsonl")
+    recording.save(path)
+
+    loaded = Recording.load(path)
+
+    assert len(loaded.inputs) == 3
+    assert Replayer(loaded).verify()
+
+
+def test_replay_detects_divergence() -> None:
+    recording = _record_session()
+    recording.inputs[0].command.args["amount"] = 4
+
+    assert not Replayer(recording).verify()
+
+
+def test_named_streams_are_seeded_and_independent() -> None:
+    first = RandomService(42)
+    second = RandomService(42)
+    second.stream("other").random()
+
+    first_events = RandomEventSystem(first)
+    second_events = RandomEventSystem(second)
+
+    assert [first_events.draw_event().name for _ in range(5)] == [
+        second_events.draw_event().name for _ in range(5)
+    ]
+
+
+def test_replay_restores_stream_positions_and_custom_events(tmp_path) -> None:
+    rng = RandomService(3)
+    events = RandomEventSystem(
+        rng,
+        [RandomEvent("Windfall", "A patron pays early.", effect=EventEffect(money=25.0))],
+        daily_event_chance=0.5,
+    )
+    simulator = Simulator(
+        time_system=TimeSystem(ticks_per_day=20), rng=rng, random_event_system=events
+    )
+    simulator.advance_days(10)
+    recorder = InputRecorder.attach(simulator)
+    simulator.advance_days(30)
+    path = str(tmp_path / "session.jsonl")
+    recorder.finish(simulator).save(path)
+
+    assert Replayer(Recording.load(path)).verify()
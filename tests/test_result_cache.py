@@ -0,0 +1,100 @@
+import multiprocessing
+import os
+
+import pytest
+
+from core.metrics import MetricsRecorder
+from core.result_cache import ResultCache, cache_key, code_version
+from core.simulator import main as simulator_main
+from core.sweep import grid, run_sweep
+from world.workshop_state import WorkshopState
+
+
+def test_cache_key_covers_config_days_seed_and_version() -> None:
+    key = cache_key("sweep", {"money": 100.0, "daily_upkeep": 1.0}, 30)
+
+    assert key == cache_key("sweep", {"daily_upkeep": 1.0, "money": 100.0}, 30)
+    assert key != cache_key("sweep", {"money": 100.0, "daily_upkeep": 1.0}, 31)
+    assert key != cache_key("sweep", {"money": 100.0, "daily_upkeep": 1.0}, 30, seed=1)
+    assert key != cache_key("sweep", {"money": 100.0, "daily_upkeep": 1.0}, 30, version="old")
+    assert len(code_version()) == 64
+    with pytest.raises(ValueError):
+        cache_key("sweep", {"money": object()}, 30)
+
+
+def test_entries_round_trip_with_metrics(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path))
+    recorder = MetricsRecorder(capacity=4, overflow="downsample")
+    state = WorkshopState()
+    for day in range(1, 10):
+        state.day = day
+        state.money = float(day * day)
+        recorder.record(state)
+    key = cache_key("test", {}, 9)
+
+    assert cache.get(key) is None
+    cache.put(key, {"final_money": 81.0}, recorder)
+
+    assert cache.get(key) == {"final_money": 81.0}
+    assert (cache.hits, cache.misses) == (1, 1)
+    loaded = cache.get_metrics(key)
+    assert loaded.values("money_max") == recorder.values("money_max")
+    assert loaded.values("days") == recorder.values("days")
+    assert loaded.total_days == 9
+    assert not [name for name in os.listdir(tmp_path / key[:2]) if name.startswith(".tmp-")]
+
+
+def test_eviction_drops_least_recently_used_entries(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path))
+    keys = [cache_key("test", {"run": run}, 1) for run in range(4)]
+    for age, key in enumerate(keys):
+        cache.put(key, {"padding": "x" * 3_000})
+        os.utime(cache._path(key, ".json"), (1_000 + age, 1_000 + age))
+    cache.get(keys[0])
+
+    cache.max_bytes = 10_000
+    assert cache.evict() == 1
+
+    assert cache.size() <= 10_000
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def _put_from_worker(arguments) -> None:
+    directory, run = arguments
+    cache = ResultCache(directory)
+    cache.put(cache_key("test", {"run": run % 4}, 1), {"run": run % 4})
+
+
+def test_concurrent_writers_leave_complete_entries(tmp_path) -> None:
+    with multiprocessing.Pool(4) as pool:
+        pool.map(_put_from_worker, [(str(tmp_path), run) for run in range(32)])
+
+    cache = ResultCache(str(tmp_path))
+    assert len(cache) == 4
+    assert [cache.get(cache_key("test", {"run": run}, 1)) for run in range(4)] == [
+        {"run": run} for run in range(4)
+    ]
+
+
+def test_sweep_reuses_cached_runs(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path))
+    configs = list(grid({"money": [5.0, 500.0], "daily_upkeep": [1.0, 2.0]}))
+
+    first = sorted(run_sweep(configs, days=30, workers=1, cache=cache), key=lambda r: r["run"])
+    assert cache.hits == 0
+    second = sorted(run_sweep(configs, days=30, workers=1, cache=cache), key=lambda r: r["run"])
+
+    assert cache.hits == 4
+    assert second == first
+
+
+def test_simulator_cli_caches_stepping_and_fast_forward_separately(tmp_path, capsys) -> None:
+    arguments = ["--days", "20", "--cache-dir", str(tmp_path)]
+    simulator_main(arguments)
+    simulator_main(arguments + ["--fast-forward"])
+    assert "Loaded" not in capsys.readouterr().out
+
+    simulator_main(arguments + ["--fast-forward"])
+    assert "Loaded 20 simulated days" in capsys.readouterr().out
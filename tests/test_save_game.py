@@ -0,0 +1,137 @@
+from dataclasses import replace
+
+import pytest
+
+from core.simulator import Simulator
+from systems.contracts import Contract, ContractsSystem, PuzzleType
+from systems.time_system import TimeSystem
+from world.save_game import SaveGame
+from world.workshop_state import WorkshopRoom, WorkshopState
+
+
+def _assert_same_state(loaded: WorkshopState, expected: WorkshopState) -> None:
+    assert loaded == expected
+    assert list(loaded.active_contracts) == list(expected.active_contracts)
+
+
+def test_snapshot_round_trip_restores_state_and_counters(tmp_path) -> None:
+    simulator = Simulator(time_system=TimeSystem(ticks_per_day=10))
+    simulator.advance_ticks(10 * 12 + 4)
+    state = simulator.workshop_state
+    state.materials["metal"] = 7
+    state.rooms = [WorkshopRoom.LIBRARY, WorkshopRoom.LABORATORY]
+    state.active_contracts.append(
+        Contract(
+            id=999,
+            name="Fresco for the chapel",
+            reward_money=300.0,
+            duration_days=10,
+            prestige=0.5,
+            materials_required={"pigment": 4},
+            puzzle_type=PuzzleType.PIGMENTS,
+            puzzle_difficulty=2,
+            start_day=state.day,
+            patron="Medici",
+        )
+    )
+    save_game = SaveGame(str(tmp_path / "workshop.sav"))
+    save_game.save_snapshot(state, simulator.time_system, simulator.contracts_system)
+
+    time_system = TimeSystem(ticks_per_day=10)
+    contracts_system = ContractsSystem()
+    loaded = SaveGame(str(tmp_path / "workshop.sav")).load(time_system, contracts_system)
+
+    assert loaded.rooms == [WorkshopRoom.LABORATORY, WorkshopRoom.LIBRARY]
+    loaded.rooms = state.rooms
+    _assert_same_state(loaded, state)
+    assert time_system.tick_counter == 4
+    assert contracts_system.next_contract_id == simulator.contracts_system.next_contract_id
+
+
+def test_journal_replays_daily_deltas(tmp_path) -> None:
+    simulator = Simulator(time_system=TimeSystem(ticks_per_day=5))
+    save_game = SaveGame(str(tmp_path / "workshop.sav"), compact_after=1_000)
+    save_game.autosave(simulator.workshop_state, simulator.time_system, simulator.contracts_system)
+    for _ in range(30):
+        simulator.advance_days(1)
+        save_game.autosave(
+            simulator.workshop_state, simulator.time_system, simulator.contracts_system
+        )
+    assert save_game.journal_records == 30
+
+    contracts_system = ContractsSystem()
+    loaded = SaveGame(str(tmp_path / "workshop.sav")).load(contracts_system=contracts_system)
+
+    _assert_same_state(loaded, simulator.workshop_state)
+    assert contracts_system.next_contract_id == simulator.contracts_system.next_contract_id
+
+
+def test_journal_records_upkeep_rooms_and_contracts_changed_in_place(tmp_path) -> None:
+    simulator = Simulator(time_system=TimeSystem(ticks_per_day=5))
+    simulator.advance_days(1)
+    state = simulator.workshop_state
+    save_game = SaveGame(str(tmp_path / "workshop.sav"))
+    save_game.save_snapshot(state)
+    original = next(iter(state.active_contracts))
+
+    state.daily_upkeep = 7.5
+    state.inspiration_gain = 0.25
+    state.rooms = [WorkshopRoom.LIBRARY]
+    state.active_contracts.pop_id(original.id)
+    state.active_contracts.append(replace(original, reward_money=original.reward_money * 2))
+    state.notify_changed("contracts")
+    save_game.append_delta(state)
+
+    _assert_same_state(SaveGame(save_game.snapshot_path).load(), state)
+
+
+def test_torn_journal_record_is_ignored_and_truncated(tmp_path) -> None:
+    simulator = Simulator(time_system=TimeSystem(ticks_per_day=5))
+    save_game = SaveGame(str(tmp_path / "workshop.sav"))
+    save_game.save_snapshot(simulator.workshop_state)
+    simulator.advance_days(1)
+    save_game.append_delta(simulator.workshop_state)
+    expected_money = simulator.workshop_state.money
+    with open(save_game.journal_path, "ab") as journal:
+        journal.write(b"\x40\x00\x00\x00garbage")
+
+    reloaded = SaveGame(save_game.snapshot_path)
+    loaded = reloaded.load()
+    loaded.money -= 1.0
+    reloaded.append_delta(loaded)
+
+    assert SaveGame(save_game.snapshot_path).load().money == expected_money - 1.0
+
+
+def test_load_rejects_foreign_files(tmp_path) -> None:
+    path = tmp_path / "not_a_save.sav"
+    path.write_bytes(b"PK\x03\x04" + b"\x00" * 200)
+
+    with pytest.raises(ValueError):
+        SaveGame(str(path)).load()
+
+
+def test_deltas_diff_only_logged_contracts_and_sync_to_disk(tmp_path, monkeypatch) -> None:
+    import os
+
+    simulator = Simulator(
+        time_system=TimeSystem(ticks_per_day=5),
+        contracts_system=ContractsSystem(max_active_contracts=8),
+    )
+    state = simulator.workshop_state
+    save_game = SaveGame(str(tmp_path / "workshop.sav"), compact_after=1_000)
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    save_game.save_snapshot(state, simulator.time_system, simulator.contracts_system)
+    assert len(synced) == 2
+
+    monkeypatch.setattr(
+        save_game, "_diff_all_contracts", lambda pool: pytest.fail("delta rescanned the pool")
+    )
+    for _ in range(20):
+        simulator.advance_days(1)
+        save_game.append_delta(state, simulator.time_system, simulator.contracts_system)
+    assert len(synced) == 22
+
+    _assert_same_state(SaveGame(save_game.snapshot_path).load(), state)
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from systems.scheduler import TimingWheel
+
+
+def _drain(wheel: TimingWheel, until: int):
+    fired = []
+    while wheel.next_time() is not None and wheel.next_time() <= until:
+        fired.extend((event.time, event.seq) for event in wheel.pop_next())
+    wheel.set_now(until)
+    return fired
+
+
+def test_events_fire_in_time_then_scheduling_order() -> None:
+    generator = random.Random(7)
+    wheel = TimingWheel(now=1_000)
+    expected = []
+    for _ in range(500):
+        # Spread times over every level and into the overflow heap.
+        time = 1_000 + int(generator.expovariate(1.0) * 10 ** generator.randint(0, 8))
+        event = wheel.schedule(time, lambda: None)
+        expected.append((event.time, event.seq))
+
+    fired = _drain(wheel, 5_000) + _drain(wheel, 10 ** 10)
+
+    assert fired == sorted(expected)
+    assert len(wheel) == 0
+    assert wheel.next_time() is None
+
+
+def test_cancelled_events_never_fire() -> None:
+    wheel = TimingWheel()
+    near = wheel.schedule(10, lambda: None)
+    far = wheel.schedule(10 ** 9, lambda: None)
+    kept = wheel.schedule(20, lambda: None)
+
+    assert near.cancel() and far.cancel()
+    assert not near.cancel()
+    assert len(wheel) == 1
+    assert wheel.next_time() == 20
+    assert _drain(wheel, 10 ** 10) == [(20, kept.seq)]
+    assert not kept.pending
+
+
+def test_copy_is_independent_and_past_times_are_rejected() -> None:
+    wheel = TimingWheel(now=50)
+    event = wheel.schedule(70, lambda: None)
+    clone = wheel.copy()
+    event.cancel()
+
+    assert [e.time for e in clone.pop_next()] == [70]
+    assert wheel.next_time() is None
+    with pytest.raises(ValueError):
+        wheel.schedule(49, lambda: None)
+
+
+def test_moving_time_past_pending_events_makes_them_due() -> None:
+    wheel = TimingWheel()
+    wheel.schedule(100, lambda: None)
+    wheel.set_now(5_000)
+
+    assert wheel.next_time() == 5_000
@@ -0,0 +1,204 @@
+import asyncio
+
+import pytest
+
+from core.session_server import SessionClient, SessionServer
+from core.simulator import Simulator
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=20))
+
+
+async def _start(**options):
+    server = SessionServer(**options)
+    port = await server.start()
+    return server, port
+
+
+def test_session_round_trip() -> None:
+    async def scenario():
+        server, port = await _start()
+        client = await SessionClient.connect("127.0.0.1", port)
+        try:
+            state = await client.request("state")
+            assert state["day"] == 1
+
+            advanced = await client.request("advance", days=3)
+            assert advanced["day"] == 4
+            assert advanced["days_processed"] == 3
+
+            bought = await client.request("buy", material="wood", amount=2, price=1.5)
+            assert bought == {"amount": 2, "money": advanced["money"] - 3.0}
+
+            contracts = await client.request("contracts")
+            assert contracts and {"id", "reward_money", "expires_day"} <= set(contracts[0])
+            await client.request("decline", contract_id=contracts[0]["id"])
+            assert len(await client.request("contracts")) == len(contracts) - 1
+
+            with pytest.raises(ValueError, match="Unknown op"):
+                await client.request("teleport")
+            with pytest.raises(ValueError, match="not active"):
+                await client.request("complete", contract_id=999)
+
+            stats = await client.request("stats")
+            assert stats["count"] == 8
+            assert server.stats()["latency"][client.session_id]["count"] == 9
+        finally:
+            await client.close()
+            await server.close()
+
+    run(scenario())
+
+
+def test_idle_sessions_are_cheap_and_running_sessions_advance() -> None:
+    async def scenario():
+        server, port = await _start(tick_rate=6_000.0, tick_interval=0.01)
+        clients = [await SessionClient.connect("127.0.0.1", port) for _ in range(50)]
+        try:
+            assert server.stats()["sessions"] == 50
+            assert server.stats()["started"] == 0
+
+            runner = clients[0]
+            await runner.request("run", time_scale=1.0)
+            await asyncio.sleep(0.2)
+            state = await runner.request("state")
+            assert state["tick"] > 0
+
+            await runner.request("run", time_scale=0.0)
+            paused_tick = (await runner.request("state"))["tick"]
+            await asyncio.sleep(0.05)
+            assert (await runner.request("state"))["tick"] == paused_tick
+            assert server.stats()["started"] == 1
+        finally:
+            for client in clients:
+                await client.close()
+            await server.close()
+
+    run(scenario())
+
+
+def test_pipelined_requests_are_answered_in_order_within_queue_bounds() -> None:
+    async def scenario():
+        server, port = await _start(queue_size=4, outbox_size=4)
+        client = await SessionClient.connect("127.0.0.1", port)
+        try:
+            request_ids = [client.send("advance", ticks=60) for _ in range(300)]
+            client.writer.write(b"not json\n")
+            await client.writer.drain()
+            session = server.sessions[client.session_id]
+            replies = []
+            for _ in range(301):
+                assert session.inbox.qsize() <= 4
+                assert session.outbox.qsize() <= 4
+                replies.append(await client.receive())
+
+            assert [reply["id"] for reply in replies[:300]] == request_ids
+            assert replies[299]["result"]["day"] == 61
+            assert replies[300] == {"id": None, "ok": False, "error": "Request is not valid JSON."}
+        finally:
+            await client.close()
+            await server.close()
+
+    run(scenario())
+
+
+def test_server_rejects_sessions_beyond_limit() -> None:
+    async def scenario():
+        server, port = await _start(max_sessions=1)
+        client = await SessionClient.connect("127.0.0.1", port)
+        try:
+            with pytest.raises(ConnectionError, match="full"):
+                await SessionClient.connect("127.0.0.1", port)
+        finally:
+            await client.close()
+            await server.close()
+        assert server.sessions == {}
+
+    run(scenario())
+
+
+def test_malformed_requests_get_error_replies_and_the_server_keeps_serving() -> None:
+    async def scenario():
+        server, port = await _start(max_advance_days=10, max_time_scale=100.0)
+        client = await SessionClient.connect("127.0.0.1", port)
+        try:
+            client.writer.write(b'{"id": 1, "op": ["state"]}\n')
+            client.writer.write(b'{"id": 2, "op": "advance", "days": 1e400}\n')
+            await client.writer.drain()
+            unhashable, overflow = await client.receive(), await client.receive()
+            assert unhashable["id"] == 1 and "Unknown op" in unhashable["error"]
+            assert overflow["id"] == 2 and not overflow["ok"]
+
+            with pytest.raises(ValueError, match="between 0 and 10"):
+                await client.request("advance", days=11)
+            with pytest.raises(ValueError, match="between 0 and 3000"):
+                await client.request("advance", ticks=3001)
+            for time_scale in ("inf", "nan", 101.0, -1.0):
+                with pytest.raises(ValueError, match="time_scale"):
+                    await client.request("run", time_scale=time_scale)
+            assert server.stats()["running"] == 0
+            assert (await client.request("advance", days=10))["day"] == 11
+        finally:
+            await client.close()
+            await server.close()
+
+    run(scenario())
+
+
+def test_overlong_request_gets_an_error_reply_and_the_session_is_dropped() -> None:
+    async def scenario():
+        server, port = await _start(max_request_bytes=1024)
+        client = await SessionClient.connect("127.0.0.1", port)
+        try:
+            client.writer.write(b'{"op": "state", "pad": "' + b"x" * 4096 + b'"}\n')
+            await client.writer.drain()
+            assert await client.receive() == {
+                "id": None,
+                "ok": False,
+                "error": "Request too long.",
+            }
+            assert await client.reader.readline() == b""
+            assert server.sessions == {}
+        finally:
+            await client.close()
+            await server.close()
+
+    run(scenario())
+
+
+def test_failing_running_session_is_stopped_and_others_keep_running() -> None:
+    created = []
+
+    def factory() -> Simulator:
+        simulator = Simulator()
+        if not created:
+            simulator.advance_ticks = lambda ticks: 1 / 0
+        created.append(simulator)
+        return simulator
+
+    async def scenario():
+        server, port = await _start(
+            simulator_factory=factory, tick_rate=6_000.0, tick_interval=0.01
+        )
+        broken = await SessionClient.connect("127.0.0.1", port)
+        healthy = await SessionClient.connect("127.0.0.1", port)
+        try:
+            # Simulators are created lazily; the first one built is the broken one.
+            await broken.request("state")
+            await broken.request("run", time_scale=1.0)
+            await healthy.request("run", time_scale=1.0)
+            stopped = await broken.receive()
+            assert stopped["id"] is None and "division by zero" in stopped["error"]
+            assert (await broken.request("state"))["time_scale"] == 0.0
+
+            first_tick = (await healthy.request("state"))["tick"]
+            await asyncio.sleep(0.05)
+            assert (await healthy.request("state"))["tick"] > first_tick
+            assert server.stats()["running"] == 1
+        finally:
+            await broken.close()
+            await healthy.close()
+            await server.close()
+
+    run(scenario())
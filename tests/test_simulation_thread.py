@@ -0,0 +1,117 @@
+import time
+
+import pytest
+
+from core.commands import purchase_material
+from core.loop import FixedTimestep
+from core.metrics import MetricsRecorder
+from core.simulation_thread import SimulationThread
+from core.simulator import Simulator
+from systems.time_system import TimeSystem
+from world.workshop_state import WorkshopState
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached in time")
+        time.sleep(0.001)
+
+
+def _thread(**options) -> SimulationThread:
+    simulator = Simulator(time_system=TimeSystem(ticks_per_day=5))
+    return SimulationThread(simulator, timestep=FixedTimestep(time_scale=600.0), **options)
+
+
+def test_snapshots_stay_fixed_while_the_worker_runs() -> None:
+    thread = _thread()
+    first = thread.latest()
+    before = (
+        first.state.day,
+        first.state.money,
+        list(first.state.active_contracts),
+        tuple(first.state.materials.counts),
+    )
+
+    thread.start()
+    try:
+        _wait_for(lambda: thread.latest().state.day >= first.state.day + 20)
+    finally:
+        thread.stop()
+
+    latest = thread.latest()
+    assert latest.sequence > first.sequence
+    assert latest.state is not thread.simulator.workshop_state
+    assert (
+        first.state.day,
+        first.state.money,
+        list(first.state.active_contracts),
+        tuple(first.state.materials.counts),
+    ) == before
+
+
+def test_commands_are_queued_to_the_worker() -> None:
+    thread = _thread()
+    thread.start()
+    try:
+        future = thread.execute(purchase_material("wood", 3, 2.0))
+        assert future.result(timeout=5.0) == 3
+        _wait_for(lambda: thread.latest().state.materials["wood"] == 3)
+        failing = thread.execute(purchase_material("gold", 1, 1.0))
+        with pytest.raises(ValueError):
+            failing.result(timeout=5.0)
+    finally:
+        thread.stop()
+
+    with pytest.raises(RuntimeError):
+        thread.call(lambda simulator: None).result(timeout=1.0)
+
+
+def test_worker_errors_surface_on_the_render_thread() -> None:
+    def explode(simulator, days) -> None:
+        raise ValueError("autosave failed")
+
+    thread = _thread(on_days=explode)
+    thread.start()
+    _wait_for(lambda: not thread.running)
+
+    with pytest.raises(RuntimeError) as excinfo:
+        thread.latest()
+    assert isinstance(excinfo.value.__cause__, ValueError)
+
+
+def test_state_snapshot_keeps_change_versions() -> None:
+    state = WorkshopState()
+    state.money += 5
+    state.notify_changed("money")
+    snapshot = state.snapshot()
+
+    assert snapshot.changes.version() == state.changes.version()
+    state.materials["wood"] = 4
+    assert snapshot.materials["wood"] == 0
+
+
+def test_deferred_metrics_are_written_only_by_flush() -> None:
+    thread = _thread()
+    recorder = MetricsRecorder(capacity=8, overflow="ring").attach(
+        thread.simulator, deferred=True
+    )
+    thread.start()
+    try:
+        _wait_for(lambda: thread.latest().state.day >= 20)
+        assert len(recorder) == 0 and recorder.total_days == 0
+
+        def flushed_twenty_days() -> bool:
+            recorder.flush()
+            return recorder.total_days >= 20
+
+        _wait_for(flushed_twenty_days)
+    finally:
+        thread.stop()
+    recorder.flush()
+
+    days = recorder.values("day")
+    assert days == list(range(days[0], days[0] + 8))
+    assert days[-1] == thread.simulator.workshop_state.day
+    assert recorder.total_days == days[-1] - 1
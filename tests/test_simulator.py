@@ -0,0 +1,144 @@
+import pytest
+
+from core.simulator import Simulator
+from systems.contracts import ContractsSystem
+from systems.time_system import TimeSystem
+from world.workshop_state import WorkshopState
+
+
+def _contract_fields(state: WorkshopState):
+    return [
+        (c.id, c.name, c.reward_money, c.start_day, c.duration_days)
+        for c in state.active_contracts
+    ]
+
+
+def test_advance_ticks_matches_ticking_one_frame_at_a_time() -> None:
+    stepped = Simulator(time_system=TimeSystem(ticks_per_day=7))
+    for _ in range(7 * 25 + 3):
+        stepped.step()
+
+    fast = Simulator(time_system=TimeSystem(ticks_per_day=7))
+    fast.advance_ticks(7 * 25 + 3)
+
+    assert fast.workshop_state.day == stepped.workshop_state.day == 26
+    assert fast.time_system.tick_counter == stepped.time_system.tick_counter == 3
+    assert fast.workshop_state.money == stepped.workshop_state.money
+    assert fast.workshop_state.inspiration == stepped.workshop_state.inspiration
+    assert _contract_fields(fast.workshop_state) == _contract_fields(stepped.workshop_state)
+
+
+def test_advance_days_processes_each_day_once() -> None:
+    simulator = Simulator(time_system=TimeSystem(ticks_per_day=10))
+    simulator.advance_ticks(4)
+
+    processed = simulator.advance_days(5)
+
+    assert processed == 5
+    assert simulator.workshop_state.day == 6
+    assert simulator.time_system.tick_counter == 0
+    assert simulator.workshop_state.money == 150.0 - 5 * 1.0
+
+
+def test_time_system_advance_rejects_negative_ticks() -> None:
+    with pytest.raises(ValueError):
+        TimeSystem().advance(WorkshopState(), -1)
+
+
+@pytest.mark.parametrize("max_active_contracts", [0, 1, 3, 10])
+@pytest.mark.parametrize("reputation", [0.0, 6.0])
+def test_fast_forward_matches_day_by_day(max_active_contracts: int, reputation: float) -> None:
+    def build() -> Simulator:
+        return Simulator(
+            WorkshopState(reputation=reputation),
+            time_system=TimeSystem(ticks_per_day=5),
+            contracts_system=ContractsSystem(max_active_contracts=max_active_contracts),
+        )
+
+    stepped = build()
+    stepped.advance_ticks(3)
+    stepped.advance_days(250)
+
+    skipped = build()
+    skipped.advance_ticks(3)
+    skipped.fast_forward_days(250)
+
+    assert skipped.workshop_state.day == stepped.workshop_state.day
+    assert skipped.time_system.tick_counter == stepped.time_system.tick_counter
+    assert skipped.workshop_state.money == stepped.workshop_state.money
+    assert skipped.workshop_state.inspiration == pytest.approx(stepped.workshop_state.inspiration)
+    assert _contract_fields(skipped.workshop_state) == _contract_fields(stepped.workshop_state)
+
+    skipped.advance_days(7)
+    stepped.advance_days(7)
+    assert _contract_fields(skipped.workshop_state) == _contract_fields(stepped.workshop_state)
+
+
+def test_fast_forward_never_shows_contract_subscribers_an_earlier_day() -> None:
+    simulator = Simulator(
+        time_system=TimeSystem(ticks_per_day=5),
+        contracts_system=ContractsSystem(max_active_contracts=2),
+    )
+    seen = []
+    simulator.workshop_state.changes.subscribe(
+        "contracts", lambda state, _: seen.append((state.day, state.money))
+    )
+    simulator.fast_forward_days(40)
+
+    assert seen
+    assert all(day == simulator.workshop_state.day for day, _ in seen)
+    assert all(money == simulator.workshop_state.money for _, money in seen)
+
+
+def test_fork_runs_like_the_original_and_can_be_committed() -> None:
+    from core.replay import state_fingerprint
+    from systems.random_events import RandomEventSystem
+    from systems.rng import RandomService
+
+    rng = RandomService(seed=3)
+    simulator = Simulator(
+        rng=rng, random_event_system=RandomEventSystem(rng, daily_event_chance=0.5)
+    )
+    simulator.advance_days(5)
+    before = state_fingerprint(simulator.workshop_state)
+
+    branch = simulator.fork()
+    branch.advance_days(12)
+    assert state_fingerprint(simulator.workshop_state) == before
+
+    discarded = simulator.fork()
+    discarded.advance_days(30)
+    simulator.advance_days(12)
+    assert state_fingerprint(simulator.workshop_state) == state_fingerprint(branch.workshop_state)
+
+    simulator.commit(discarded)
+    simulator.advance_days(4)
+    discarded.advance_days(4)
+    assert simulator.workshop_state.day == 1 + 5 + 30 + 4
+    assert state_fingerprint(simulator.workshop_state) == state_fingerprint(
+        discarded.workshop_state
+    )
+
+
+def test_fast_forward_fires_scheduled_events_on_settled_days() -> None:
+    def run(fast: bool):
+        simulator = Simulator(time_system=TimeSystem(ticks_per_day=5))
+        seen = []
+
+        def record(state: WorkshopState) -> None:
+            seen.append((state.day, state.money, len(state.active_contracts)))
+
+        for day in (4, 40, 400):
+            simulator.time_system.schedule_day(day, record)
+        if fast:
+            simulator.fast_forward_days(500)
+        else:
+            simulator.advance_days(500)
+        return seen, simulator.workshop_state.money
+
+    stepped, stepped_money = run(fast=False)
+    fast, fast_money = run(fast=True)
+
+    assert [day for day, _, _ in fast] == [4, 40, 400]
+    assert fast == pytest.approx(stepped)
+    assert fast_money == pytest.approx(stepped_money)
@@ -0,0 +1,67 @@
+import io
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from core.startup import StartupReport
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_logic_modules_do_not_import_pygame() -> None:
+    code = (
+        "import sys\n"
+        "import core.game, core.replay, core.scene, core.simulator, core.sweep, main\n"
+        "import systems.contracts, systems.fulfillment_index, systems.random_events\n"
+        "import world.save_game, world.workshop_state\n"
+        "print('pygame' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_startup_report_records_phases_in_order() -> None:
+    ticks = iter([0.0, 1.0, 1.5, 2.0, 2.25, 3.0])
+    output = io.StringIO()
+    report = StartupReport(output=output, clock=lambda: next(ticks))
+
+    with report.phase("import"):
+        pass
+    report.record("display_init", 0.25)
+    with report.phase("first_frame"):
+        pass
+    report.complete()
+    report.complete()
+
+    assert report.as_dict() == {"import": 0.5, "display_init": 0.25, "first_frame": 0.25}
+    lines = output.getvalue().splitlines()
+    assert [line.split()[0] for line in lines] == [
+        "Startup:",
+        "import",
+        "display_init",
+        "first_frame",
+        "total",
+    ]
+    assert lines[-1].split()[1] == "3000.0"
+
+
+def test_asset_registry_shares_fonts_until_pygame_quits() -> None:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame = pytest.importorskip("pygame")
+    from ui.assets import AssetRegistry
+
+    registry = AssetRegistry()
+    pygame.init()
+    try:
+        font = registry.font(24)
+        assert registry.font(24) is font
+        assert registry.font(28) is not font
+        assert len(registry) == 2
+    finally:
+        pygame.quit()
+    assert len(registry) == 0
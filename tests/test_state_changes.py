@@ -0,0 +1,39 @@
+import pytest
+
+from systems.contracts import ContractsSystem
+from systems.economy_system import EconomySystem
+from systems.materials_system import MaterialsSystem
+from systems.time_system import TimeSystem
+from world.workshop_state import WorkshopState
+
+
+def test_systems_bump_versions_of_fields_they_change() -> None:
+    state = WorkshopState()
+    before = state.changes.versions()
+
+    EconomySystem().apply_daily_upkeep(state)
+    MaterialsSystem().purchase_material(state, "wood", 1, price_per_unit=1.0)
+    ContractsSystem().maybe_generate_daily_contracts(state)
+
+    assert sorted(state.changes.changed_since(before)) == ["contracts", "materials", "money"]
+    assert state.changes.version("money") == 2
+
+
+def test_subscribers_are_notified_until_cancelled() -> None:
+    state = WorkshopState()
+    time_system = TimeSystem(ticks_per_day=2)
+    seen = []
+    subscription = state.changes.subscribe("day", lambda s, name: seen.append((s.day, name)))
+
+    time_system.tick(state)
+    time_system.tick(state)
+    subscription.cancel()
+    time_system.advance(state, 2)
+
+    assert seen == [(2, "day")]
+    assert state.day == 3
+
+
+def test_unknown_field_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        WorkshopState().changes.subscribe("weather", lambda state, name: None)
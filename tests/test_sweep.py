@@ -0,0 +1,44 @@
+import io
+import json
+
+import pytest
+
+from core.sweep import ResultWriter, grid, random_samples, run_configuration, run_sweep
+
+
+def test_grid_and_random_samples() -> None:
+    configs = list(grid({"money": [100.0, 200.0], "max_active_contracts": [1, 2, 3]}))
+    assert len(configs) == 6
+    assert configs[0] == {"money": 100.0, "max_active_contracts": 1}
+
+    ranges = {"ticks_per_day": (10, 20), "daily_upkeep": (0.5, 2.0)}
+    samples = list(random_samples(ranges, 5))
+    assert samples == list(random_samples(ranges, 5))
+    assert all(10 <= sample["ticks_per_day"] <= 20 for sample in samples)
+
+    with pytest.raises(ValueError):
+        list(grid({"weather": [1]}))
+
+
+def test_run_configuration_reports_bankruptcy_day() -> None:
+    result = run_configuration({"money": 10.0, "daily_upkeep": 1.0, "ticks_per_day": 5}, days=20)
+
+    assert result["bankruptcy_day"] == 12
+    assert result["final_money"] == 10.0 - 20
+    assert result["contracts_seen"] > 0
+
+
+def test_sweep_streams_results_from_worker_pool() -> None:
+    configs = list(grid({"money": [5.0, 500.0], "daily_upkeep": [1.0, 2.0]}))
+    output = io.StringIO()
+    writer = ResultWriter(output)
+
+    for result in run_sweep(configs, days=30, workers=2, chunksize=1):
+        writer.write(result)
+
+    rows = sorted(
+        (json.loads(line) for line in output.getvalue().splitlines()), key=lambda row: row["run"]
+    )
+    assert [row["run"] for row in rows] == [0, 1, 2, 3]
+    assert rows[0]["bankruptcy_day"] is not None
+    assert rows[2]["bankruptcy_day"] is None
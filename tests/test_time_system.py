@@ -17,3 +17,27 @@ def test_time_system_advances_days_and_resets_counter() -> None:
 
     assert workshop_state.day == 3
     assert time_system.tick_counter == 0
+
+
+def test_scheduled_callbacks_fire_at_their_time() -> None:
+    workshop_state = WorkshopState()
+    time_system = TimeSystem(ticks_per_day=10)
+    fired = []
+
+    def record(state: WorkshopState) -> None:
+        fired.append((state.day, time_system.tick_counter))
+
+    time_system.schedule_day(3, record)
+    time_system.schedule_in(workshop_state, 5, record)
+    cancelled = time_system.schedule_day(2, record)
+    cancelled.cancel()
+
+    for _ in range(12):
+        time_system.tick(workshop_state)
+    assert fired == [(1, 5)]
+    assert time_system.ticks_until_next_event(workshop_state) == 8
+
+    assert time_system.advance(workshop_state, 100) == 10
+    assert fired == [(1, 5), (3, 0)]
+    assert (workshop_state.day, time_system.tick_counter) == (12, 2)
+    assert time_system.ticks_until_next_event(workshop_state) is None
@@ -0,0 +1,86 @@
+import dataclasses
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.batch_simulator import BatchSimulator
+from core.simulator import Simulator
+from systems.batch_systems import BatchContractsSystem, BatchTimeSystem
+from systems.contracts import ContractsSystem
+from systems.time_system import TimeSystem
+from world.workshop_batch import WorkshopBatch
+from world.workshop_state import WorkshopState
+
+
+def _contract_fields(state: WorkshopState):
+    return [
+        (
+            c.id,
+            c.name,
+            c.reward_money,
+            c.duration_days,
+            c.puzzle_type,
+            c.puzzle_difficulty,
+            c.start_day,
+            c.materials_required,
+        )
+        for c in state.active_contracts
+    ]
+
+
+def test_batch_matches_scalar_simulation() -> None:
+    reputations = [0.0, 2.5, 5.0, 7.5]
+    states = [WorkshopState(reputation=reputation) for reputation in reputations]
+    batch = WorkshopBatch.from_states(states)
+    batch_simulator = BatchSimulator(
+        batch,
+        time_system=BatchTimeSystem(ticks_per_day=4),
+        contracts_system=BatchContractsSystem(max_active_contracts=3),
+    )
+    batch_simulator.advance_days(40)
+
+    for index, reputation in enumerate(reputations):
+        simulator = Simulator(
+            WorkshopState(reputation=reputation),
+            time_system=TimeSystem(ticks_per_day=4),
+            contracts_system=ContractsSystem(max_active_contracts=3),
+        )
+        simulator.advance_days(40)
+        expected = simulator.workshop_state
+        extracted = batch.extract_state(index)
+
+        assert extracted.day == expected.day
+        assert extracted.money == expected.money
+        assert extracted.inspiration == pytest.approx(expected.inspiration)
+        assert _contract_fields(extracted) == _contract_fields(expected)
+
+
+def test_write_and_extract_round_trip() -> None:
+    state = WorkshopState(money=42.0, materials={"wood": 2, "metal": 0, "pigment": 5})
+    ContractsSystem().maybe_generate_daily_contracts(state)
+    generated = state.active_contracts.pop_id(state.active_contracts[0].id)
+    state.active_contracts.append(
+        dataclasses.replace(generated, name="Custom commission", patron="Medici")
+    )
+
+    batch = WorkshopBatch(2)
+    batch.write_state(1, state)
+    restored = batch.extract_state(1)
+
+    assert restored.money == 42.0
+    assert restored.materials == state.materials
+    assert restored.rooms == state.rooms
+    assert restored.active_contracts == state.active_contracts
+
+
+def test_write_state_rejects_too_many_contracts() -> None:
+    state = WorkshopState()
+    contracts_system = ContractsSystem(max_active_contracts=2)
+    for _ in range(2):
+        contracts_system.maybe_generate_daily_contracts(state)
+        state.day += 1
+
+    batch = WorkshopBatch(1, max_contracts=1)
+    with pytest.raises(ValueError):
+        batch.write_state(0, state)
@@ -8,3 +8,29 @@ def test_workshop_state_defaults() -> None:
     assert state.reputation >= 0
     assert state.inspiration > 0
     assert state.active_contracts == []
+
+
+def test_fork_is_independent_and_commit_notifies_changed_fields() -> None:
+    from systems.contracts import ContractsSystem
+
+    state = WorkshopState(materials={"wood": 3})
+    ContractsSystem().maybe_generate_daily_contracts(state)
+    notified = []
+    state.changes.subscribe("money", lambda _, name: notified.append(name))
+    state.changes.subscribe("materials", lambda _, name: notified.append(name))
+    state.changes.subscribe("contracts", lambda _, name: notified.append(name))
+
+    branch = state.fork()
+    branch.money -= 40.0
+    branch.materials["wood"] -= 1
+    branch.notify_changed("money", "materials")
+    assert notified == []
+    assert state.money == 150.0
+    assert state.materials["wood"] == 3
+    assert branch.active_contracts[0] is state.active_contracts[0]
+
+    state.commit(branch)
+    assert notified == ["money", "materials"]
+    assert state.money == 110.0
+    assert state.materials["wood"] == 2
+    assert state == branch
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pygame
+
+
+class AssetRegistry:
+    """Shared cache of fonts and images, each loaded on first use.
+
+    Nothing touches pygame until an asset is requested, so scenes can be
+    built before SDL's font module is initialized, and every scene asking for
+    the same font gets the same object back.
+    """
+
+    def __init__(self) -> None:
+        self._fonts: Dict[Tuple[Optional[str], int], "pygame.font.Font"] = {}
+        self._images: Dict[str, "pygame.Surface"] = {}
+        self.load_seconds = 0.0
+        self._quit_registered = False
+
+    def font(self, size: int, name: Optional[str] = None) -> "pygame.font.Font":
+        """Return the font at ``size``; ``name`` None selects pygame's default font."""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            import pygame
+
+            started = time.perf_counter()
+            self._watch_quit(pygame)
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self._fonts[key] = pygame.font.Font(name, size)
+            self.load_seconds += time.perf_counter() - started
+        return font
+
+    def image(self, path: str) -> "pygame.Surface":
+        """Return the image at ``path``, converted for fast blitting when a display exists."""
+        image = self._images.get(path)
+        if image is None:
+            import pygame
+
+            started = time.perf_counter()
+            self._watch_quit(pygame)
+            image = pygame.image.load(path)
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            self._images[path] = image
+            self.load_seconds += time.perf_counter() - started
+        return image
+
+    def clear(self) -> None:
+        self._fonts.clear()
+        self._images.clear()
+
+    def _watch_quit(self, pygame: Any) -> None:
+        # Loaded fonts and surfaces do not survive pygame.quit(), so forget them
+        # then and reload on the next request.
+        if not self._quit_registered:
+            pygame.register_quit(self._on_quit)
+            self._quit_registered = True
+
+    def _on_quit(self) -> None:
+        self.clear()
+        self._quit_registered = False
+
+    def __len__(self) -> int:
+        return len(self._fonts) + len(self._images)
+
+
+_shared_registry: Optional[AssetRegistry] = None
+
+
+def shared_assets() -> AssetRegistry:
+    """The process-wide registry used by scenes that are not given their own."""
+    global _shared_registry
+    if _shared_registry is None:
+        _shared_registry = AssetRegistry()
+    return _shared_registry
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import pygame
+
+from core.metrics import METRICS, MetricsRecorder
+
+
+class HistoryGraph:
+    """Line graph of one recorded metric, read straight from the recorder's columns.
+
+    The mean is drawn as a line, with the min/max envelope when rows cover
+    several days. Columns are sampled down to one point per pixel through the
+    recorder's memoryview segments, so drawing never copies the history.
+    """
+
+    def __init__(
+        self,
+        recorder: MetricsRecorder,
+        metric: str = "money",
+        color: Tuple[int, int, int] = (214, 180, 92),
+        envelope_color: Tuple[int, int, int] = (110, 96, 60),
+    ) -> None:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}'.")
+        self.recorder = recorder
+        self.metric = metric
+        self.color = pygame.Color(color)
+        self.envelope_color = pygame.Color(envelope_color)
+
+    def key(self) -> Tuple[str, int, int]:
+        """Changes whenever the graph would look different."""
+        return (self.metric, self.recorder.total_days, len(self.recorder))
+
+    def value_range(self) -> Tuple[float, float]:
+        """Lowest minimum and highest maximum recorded, or (0, 0) when empty."""
+        lows = self.recorder.segments(f"{self.metric}_min")
+        highs = self.recorder.segments(f"{self.metric}_max")
+        if not any(len(segment) for segment in lows):
+            return 0.0, 0.0
+        low = min(min(segment) for segment in lows if len(segment))
+        high = max(max(segment) for segment in highs if len(segment))
+        return low, high
+
+    def points(self, rect: pygame.Rect, stat: str = "mean") -> List[Tuple[int, int]]:
+        """Screen points for ``stat``, at most one per horizontal pixel of ``rect``."""
+        segments = self.recorder.segments(f"{self.metric}_{stat}")
+        rows = sum(len(segment) for segment in segments)
+        samples = min(rows, rect.width)
+        if samples == 0:
+            return []
+        low, high = self.value_range()
+        span = high - low or 1.0
+        head = len(segments[0])
+        points = []
+        for sample in range(samples):
+            if samples == 1:
+                row = column = 0
+            else:
+                row = sample * (rows - 1) // (samples - 1)
+                column = sample * (rect.width - 1) // (samples - 1)
+            value = segments[0][row] if row < head else segments[1][row - head]
+            y = rect.bottom - 1 - round((value - low) / span * (rect.height - 1))
+            points.append((rect.left + column, y))
+        return points
+
+    def draw(self, surface: pygame.Surface, rect: pygame.Rect) -> None:
+        if self.recorder.bucket_days > 1:
+            for stat in ("min", "max"):
+                envelope = self.points(rect, stat)
+                if len(envelope) > 1:
+                    pygame.draw.lines(surface, self.envelope_color, False, envelope)
+        points = self.points(rect)
+        if len(points) > 1:
+            pygame.draw.lines(surface, self.color, False, points)
+        elif points:
+            surface.set_at(points[0], self.color)
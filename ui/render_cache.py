@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import pygame
+
+ColorKey = Tuple[int, int, int, int]
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by font, string and color."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive.")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._surfaces: "OrderedDict[Tuple[pygame.font.Font, str, ColorKey], pygame.Surface]" = (
+            OrderedDict()
+        )
+
+    def render(self, font: pygame.font.Font, text: str, color: pygame.Color) -> pygame.Surface:
+        """Return the rendered surface for ``text``, rasterizing it only on a miss."""
+        key = (font, text, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+
+class RenderCache:
+    """Static background layer plus per-slot text tracking for dirty-rect rendering.
+
+    A frame is drawn between ``begin_frame`` and ``end_frame``. Text slots whose
+    string is unchanged since the previous frame are left untouched on the
+    target surface; changed slots are restored from the static layer and
+    redrawn, and their rectangles are reported as dirty.
+    """
+
+    def __init__(
+        self,
+        build_static_layer: Callable[[Tuple[int, int]], pygame.Surface],
+        text_cache: Optional[TextCache] = None,
+    ) -> None:
+        self._build_static_layer = build_static_layer
+        self.text_cache = text_cache if text_cache is not None else TextCache()
+        self._static_layer: Optional[pygame.Surface] = None
+        self._slots: Dict[Hashable, Tuple[Hashable, pygame.Rect]] = {}
+        self._drawn_this_frame: Dict[Hashable, Tuple[Hashable, pygame.Rect]] = {}
+        self._dirty: List[pygame.Rect] = []
+        self._full_redraw = True
+
+    def invalidate(self) -> None:
+        """Force the next frame to rebuild the static layer and redraw everything."""
+        self._static_layer = None
+
+    def begin_frame(self, surface: pygame.Surface) -> None:
+        size = surface.get_size()
+        self._full_redraw = self._static_layer is None or self._static_layer.get_size() != size
+        if self._full_redraw:
+            self._static_layer = self._build_static_layer(size)
+            surface.blit(self._static_layer, (0, 0))
+            self._slots = {}
+        self._drawn_this_frame = {}
+        self._dirty = []
+
+    def draw_text(
+        self,
+        surface: pygame.Surface,
+        slot: Hashable,
+        font: pygame.font.Font,
+        text: str,
+        color: pygame.Color,
+        position: Tuple[int, int],
+    ) -> None:
+        previous = self._slots.get(slot)
+        if previous is not None and previous[0] == text and previous[1].topleft == position:
+            self._drawn_this_frame[slot] = previous
+            return
+
+        text_surf = self.text_cache.render(font, text, color)
+        rect = text_surf.get_rect(topleft=position)
+        dirty = rect
+        if previous is not None:
+            surface.blit(self._static_layer, previous[1], area=previous[1])
+            dirty = rect.union(previous[1])
+        surface.blit(text_surf, rect)
+        self._drawn_this_frame[slot] = (text, rect)
+        self._mark_dirty(dirty)
+
+    def draw_region(
+        self,
+        surface: pygame.Surface,
+        slot: Hashable,
+        key: Hashable,
+        rect: pygame.Rect,
+        draw: Callable[[pygame.Surface, pygame.Rect], None],
+    ) -> None:
+        """Redraw a fixed area with ``draw`` only when ``key`` or the area changed."""
+        rect = pygame.Rect(rect)
+        previous = self._slots.get(slot)
+        if previous is not None and previous[0] == key and previous[1] == rect:
+            self._drawn_this_frame[slot] = previous
+            return
+
+        dirty = rect
+        if previous is not None:
+            surface.blit(self._static_layer, previous[1], area=previous[1])
+            dirty = rect.union(previous[1])
+        surface.blit(self._static_layer, rect, area=rect)
+        draw(surface, rect)
+        self._drawn_this_frame[slot] = (key, rect)
+        self._mark_dirty(dirty)
+
+    def end_frame(self, surface: pygame.Surface) -> Optional[List[pygame.Rect]]:
+        """Finish the frame.
+
+        Returns:
+            The dirty rectangles, or None when the whole surface was redrawn.
+        """
+        for slot, (_, rect) in self._slots.items():
+            if slot not in self._drawn_this_frame:
+                self._restore(surface, rect)
+        self._slots = self._drawn_this_frame
+        if self._full_redraw:
+            return None
+        return self._dirty
+
+    def _restore(self, surface: pygame.Surface, rect: pygame.Rect) -> None:
+        surface.blit(self._static_layer, rect, area=rect)
+        self._mark_dirty(rect)
+
+    def _mark_dirty(self, rect: pygame.Rect) -> None:
+        if not self._full_redraw:
+            self._dirty.append(rect.copy())
@@ -1,35 +1,133 @@
 from __future__ import annotations
 
+from typing import List, Optional, Tuple
+
 import pygame
 
+from core.metrics import MetricsRecorder
+from core.profiling import FRAME, Profiler
 from core.scene import Scene
+from ui.assets import AssetRegistry, shared_assets
+from ui.history_graph import HistoryGraph
+from ui.render_cache import RenderCache
 from world.workshop_state import WorkshopState
 
 
 class WorkshopScene(Scene):
     """Simple overview scene showing the workshop status."""
 
-    def __init__(self, workshop_state: WorkshopState) -> None:
+    panel_height = 140
+    panel_padding = 12
+    overlay_width = 330
+    overlay_refresh_seconds = 0.5
+    history_rect = (20, 190, 420, 120)
+
+    font_size = 28
+    panel_font_size = 24
+
+    def __init__(
+        self,
+        workshop_state: WorkshopState,
+        profiler: Optional[Profiler] = None,
+        assets: Optional[AssetRegistry] = None,
+        metrics: Optional[MetricsRecorder] = None,
+    ) -> None:
         self.workshop_state = workshop_state
-        self.font = pygame.font.Font(None, 28)
-        self.panel_font = pygame.font.Font(None, 24)
+        self.profiler = profiler
+        self.assets = assets if assets is not None else shared_assets()
         self.text_color = pygame.Color("white")
         self.bg_color = pygame.Color(26, 24, 22)
         self.panel_color = pygame.Color(45, 42, 38)
         self.should_quit = False
+        self.render_cache = RenderCache(self._build_static_layer)
+        self.history_graph = HistoryGraph(metrics) if metrics is not None else None
+        self._lines_version: Optional[int] = None
+        self._stats_lines_cache: List[str] = []
+        self._contract_lines_cache: List[str] = []
+        self._overlay_lines: List[str] = []
+        self._overlay_age = self.overlay_refresh_seconds
+
+    @property
+    def font(self) -> pygame.font.Font:
+        return self.assets.font(self.font_size)
+
+    @property
+    def panel_font(self) -> pygame.font.Font:
+        return self.assets.font(self.panel_font_size)
 
     def handle_event(self, event: pygame.event.Event) -> None:
         if event.type == pygame.QUIT:
             self.should_quit = True
 
+    def show_state(self, workshop_state: WorkshopState) -> None:
+        self.workshop_state = workshop_state
+
     def update(self, dt: float) -> None:
         # Placeholder for future update logic (contracts, events, etc.).
         if self.should_quit:
             pygame.event.post(pygame.event.Event(pygame.QUIT))
+        if self.history_graph is not None:
+            # Days sampled by a simulation thread land in the graph's columns here.
+            self.history_graph.recorder.flush()
+        if self.profiler is not None and self.profiler.enabled:
+            # Refresh the overlay text a few times a second so it stays readable
+            # and does not rasterize new strings every frame.
+            self._overlay_age += dt
+            if self._overlay_age >= self.overlay_refresh_seconds:
+                self._overlay_lines = self._profiler_lines()
+                self._overlay_age = 0.0
+        elif self._overlay_lines:
+            self._overlay_lines = []
+
+    def render(self, surface: pygame.Surface) -> Optional[List[pygame.Rect]]:
+        cache = self.render_cache
+        cache.begin_frame(surface)
+
+        # Lines are only re-formatted when the state reports a change.
+        version = self.workshop_state.changes.version()
+        if version != self._lines_version:
+            self._stats_lines_cache = self._stats_lines()
+            self._contract_lines_cache = self._contract_lines()
+            self._lines_version = version
+
+        for index, line in enumerate(self._stats_lines_cache):
+            cache.draw_text(
+                surface, ("stats", index), self.font, line, self.text_color, (20, 20 + index * 30)
+            )
+
+        if self.history_graph is not None:
+            # Redrawn once per recorded day rather than every frame.
+            cache.draw_region(
+                surface,
+                "history",
+                self.history_graph.key(),
+                pygame.Rect(self.history_rect),
+                self.history_graph.draw,
+            )
+
+        panel_rect = self._panel_rect(surface.get_size())
+        text_x = panel_rect.left + self.panel_padding
+        text_y = panel_rect.top + self.panel_padding
+        for index, line in enumerate(self._contract_lines_cache):
+            cache.draw_text(
+                surface, ("panel", index), self.panel_font, line, self.text_color, (text_x, text_y)
+            )
+            text_y += 26
 
-    def render(self, surface: pygame.Surface) -> None:
-        surface.fill(self.bg_color)
+        overlay_x = surface.get_width() - self.overlay_width
+        for index, line in enumerate(self._overlay_lines):
+            cache.draw_text(
+                surface,
+                ("profiler", index),
+                self.panel_font,
+                line,
+                self.text_color,
+                (overlay_x, 20 + index * 22),
+            )
+
+        return cache.end_frame(surface)
 
+    def _stats_lines(self) -> List[str]:
         stats_lines = [
             f"Day: {self.workshop_state.day}",
             f"Florins: {self.workshop_state.money:.0f}",
@@ -43,37 +141,47 @@ class WorkshopScene(Scene):
             f"metal={materials.get('metal', 0)}, "
             f"pigment={materials.get('pigment', 0)}"
         )
+        return stats_lines
 
-        for index, line in enumerate(stats_lines):
-            text_surf = self.font.render(line, True, self.text_color)
-            surface.blit(text_surf, (20, 20 + index * 30))
+    def _contract_lines(self) -> List[str]:
+        contracts = self.workshop_state.active_contracts
+        if not contracts:
+            return ["No active contracts"]
+        lines = []
+        for index, contract in enumerate(contracts, start=1):
+            puzzle_label = (
+                contract.puzzle_type.value
+                if hasattr(contract.puzzle_type, "value")
+                else str(contract.puzzle_type)
+            )
+            lines.append(
+                f"{index}) {contract.name} - {int(contract.reward_money)} florins "
+                f"[{puzzle_label}]"
+            )
+        return lines
 
-        panel_height = 140
-        panel_rect = pygame.Rect(
-            0, surface.get_height() - panel_height, surface.get_width(), panel_height
+    def _profiler_lines(self) -> List[str]:
+        profiler = self.profiler
+        lines = []
+        for name in [FRAME] + [name for name in profiler.sections() if name != FRAME]:
+            stats = profiler.percentiles(name)
+            lines.append(
+                f"{name}: {stats['p50']:.2f}/{stats['p95']:.2f}/{stats['p99']:.2f} ms"
+            )
+        lines.append(
+            f"contracts/day: +{profiler.per_day('contracts_generated'):.2f} "
+            f"-{profiler.per_day('contracts_expired'):.2f}"
         )
-        pygame.draw.rect(surface, self.panel_color, panel_rect)
-        pygame.draw.rect(surface, pygame.Color("dimgray"), panel_rect, width=2)
+        return lines
 
-        panel_padding = 12
-        text_y = panel_rect.top + panel_padding
-        contracts = self.workshop_state.active_contracts
-        if contracts:
-            for index, contract in enumerate(contracts, start=1):
-                puzzle_label = (
-                    contract.puzzle_type.value
-                    if hasattr(contract.puzzle_type, "value")
-                    else str(contract.puzzle_type)
-                )
-                line = (
-                    f"{index}) {contract.name} - {int(contract.reward_money)} florins "
-                    f"[{puzzle_label}]"
-                )
-                panel_text = self.panel_font.render(line, True, self.text_color)
-                surface.blit(panel_text, (panel_rect.left + panel_padding, text_y))
-                text_y += 26
-        else:
-            panel_text = self.panel_font.render(
-                "No active contracts", True, self.text_color
-            )
-            surface.blit(panel_text, (panel_rect.left + panel_padding, text_y))
+    def _panel_rect(self, size: Tuple[int, int]) -> pygame.Rect:
+        width, height = size
+        return pygame.Rect(0, height - self.panel_height, width, self.panel_height)
+
+    def _build_static_layer(self, size: Tuple[int, int]) -> pygame.Surface:
+        layer = pygame.Surface(size)
+        layer.fill(self.bg_color)
+        panel_rect = self._panel_rect(size)
+        pygame.draw.rect(layer, self.panel_color, panel_rect)
+        pygame.draw.rect(layer, pygame.Color("dimgray"), panel_rect, width=2)
+        return layer
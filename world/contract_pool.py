@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING, Union, overload
+
+if TYPE_CHECKING:
+    from systems.contracts import Contract
+
+# Pools forked from one another share a lineage, so their log positions compare.
+_lineages = itertools.count()
+
+
+class ContractPool(Sequence):
+    """Active contracts indexed by id and by expiry day.
+
+    Behaves like the list it replaces: iteration, indexing and ``len`` follow
+    insertion order. Expiring a day only pops the contracts that are due from a
+    min-heap instead of re-checking every contract. ``fork`` shares the index
+    and heap, which are copied by whichever side changes first.
+
+    Every added or removed id is also appended to a short change log, so
+    indexes over the pool can catch up with ``changed_since`` instead of
+    rescanning it.
+    """
+
+    __slots__ = (
+        "_by_id", "_expiry_heap", "_list_cache", "_shared", "_log", "_log_start", "_lineage"
+    )
+
+    def __init__(self, contracts: Iterable["Contract"] = ()) -> None:
+        self._by_id: Dict[int, "Contract"] = {}
+        self._expiry_heap: List[Tuple[int, int]] = []
+        self._list_cache: Optional[List["Contract"]] = None
+        self._shared = False
+        self._log: List[int] = []
+        # Change position of the first id in the log.
+        self._log_start = 0
+        self._lineage = next(_lineages)
+        for contract in contracts:
+            self.append(contract)
+
+    def append(self, contract: "Contract") -> None:
+        """
+        Add a contract to the end of the pool.
+
+        Raises:
+            ValueError: If a contract with the same id is already active.
+        """
+        if contract.id in self._by_id:
+            raise ValueError(f"Contract {contract.id} is already active.")
+        if self._shared:
+            self._own()
+        self._by_id[contract.id] = contract
+        heapq.heappush(
+            self._expiry_heap, (contract.start_day + contract.duration_days, contract.id)
+        )
+        self._list_cache = None
+        self._log_change(contract.id)
+
+    def extend(self, contracts: Iterable["Contract"]) -> None:
+        for contract in contracts:
+            self.append(contract)
+
+    def get(self, contract_id: int) -> Optional["Contract"]:
+        """Return the active contract with the given id, if any."""
+        return self._by_id.get(contract_id)
+
+    def pop_id(self, contract_id: int) -> Optional["Contract"]:
+        """Remove and return the contract with the given id, if it is active."""
+        if contract_id not in self._by_id:
+            return None
+        contract = self._own().pop(contract_id)
+        self._list_cache = None
+        self._compact_heap()
+        self._log_change(contract_id)
+        return contract
+
+    def remove(self, contract: "Contract") -> None:
+        """
+        Remove a contract from the pool.
+
+        Raises:
+            ValueError: If the contract is not active.
+        """
+        if self._by_id.get(contract.id) is not contract:
+            raise ValueError(f"Contract {contract.id} is not active.")
+        self.pop_id(contract.id)
+
+    def clear(self) -> None:
+        self._by_id = {}
+        self._expiry_heap = []
+        self._list_cache = None
+        self._shared = False
+        self._forget_log()
+
+    @property
+    def change_position(self) -> int:
+        """Count of changes so far; pass it to ``changed_since`` later."""
+        return self._log_start + len(self._log)
+
+    def changed_since(self, position: int) -> Optional[List[int]]:
+        """
+        Ids added or removed since ``change_position`` was ``position``, oldest first.
+
+        Returns None when the log no longer reaches back that far, after
+        ``clear`` or ``share_from`` for example; the caller must then rescan.
+        """
+        offset = position - self._log_start
+        if offset < 0 or offset > len(self._log):
+            return None
+        return self._log[offset:]
+
+    def fork(self) -> "ContractPool":
+        """Return a copy-on-write copy sharing this pool's storage until either side changes."""
+        clone = ContractPool.__new__(ContractPool)
+        clone._by_id = self._by_id
+        clone._expiry_heap = self._expiry_heap
+        clone._list_cache = self._list_cache
+        clone._shared = self._shared = True
+        clone._log = []
+        clone._log_start = self.change_position
+        clone._lineage = self._lineage
+        return clone
+
+    def share_from(self, other: "ContractPool") -> None:
+        """
+        Take over another pool's contracts, sharing storage copy-on-write.
+
+        When ``other`` was forked from this pool and this pool has not changed
+        since, the fork's log carries on this one; otherwise the log restarts.
+        """
+        self._by_id = other._by_id
+        self._expiry_heap = other._expiry_heap
+        self._list_cache = other._list_cache
+        self._shared = other._shared = True
+        if other._lineage == self._lineage and other._log_start == self.change_position:
+            for contract_id in other._log:
+                self._log_change(contract_id)
+        else:
+            self._forget_log()
+
+    def expire(self, current_day: int) -> List["Contract"]:
+        """Remove and return every contract that has expired by ``current_day``."""
+        heap = self._expiry_heap
+        expired: List["Contract"] = []
+        if not heap or heap[0][0] > current_day:
+            return expired
+        self._own()
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= current_day:
+            expiry_day, contract_id = heapq.heappop(heap)
+            contract = self._by_id.get(contract_id)
+            if contract is not None and contract.start_day + contract.duration_days == expiry_day:
+                del self._by_id[contract_id]
+                expired.append(contract)
+                self._log_change(contract_id)
+        if expired:
+            self._list_cache = None
+        return expired
+
+    def next_expiry_day(self) -> Optional[int]:
+        """Earliest day on which an active contract expires, or None if empty."""
+        heap = self._expiry_heap
+        while heap:
+            expiry_day, contract_id = heap[0]
+            contract = self._by_id.get(contract_id)
+            if contract is not None and contract.start_day + contract.duration_days == expiry_day:
+                return expiry_day
+            if self._shared:
+                self._own()
+                heap = self._expiry_heap
+            heapq.heappop(heap)
+        return None
+
+    def _compact_heap(self) -> None:
+        # Removed contracts are left in the heap lazily; rebuild once stale
+        # entries dominate so the heap stays proportional to the pool.
+        if len(self._expiry_heap) > 2 * len(self._by_id) + 16:
+            self._expiry_heap = [
+                (contract.start_day + contract.duration_days, contract.id)
+                for contract in self._by_id.values()
+            ]
+            heapq.heapify(self._expiry_heap)
+
+    def _log_change(self, contract_id: int) -> None:
+        log = self._log
+        log.append(contract_id)
+        # Readers that fall this far behind rescan instead.
+        if len(log) > 2 * len(self._by_id) + 64:
+            drop = len(log) // 2
+            del log[:drop]
+            self._log_start += drop
+
+    def _forget_log(self) -> None:
+        # Skip past every earlier position so stale readers rescan.
+        self._log_start = self.change_position + 1
+        self._log = []
+
+    def _own(self) -> Dict[int, "Contract"]:
+        # Copy shared storage before the first write after a fork.
+        if self._shared:
+            self._by_id = dict(self._by_id)
+            self._expiry_heap = list(self._expiry_heap)
+            self._shared = False
+        return self._by_id
+
+    def _as_list(self) -> List["Contract"]:
+        if self._list_cache is None:
+            self._list_cache = list(self._by_id.values())
+        return self._list_cache
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator["Contract"]:
+        return iter(self._as_list())
+
+    @overload
+    def __getitem__(self, index: int) -> "Contract": ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List["Contract"]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union["Contract", List["Contract"]]:
+        return self._as_list()[index]
+
+    def __contains__(self, contract: object) -> bool:
+        contract_id = getattr(contract, "id", None)
+        return contract_id in self._by_id and self._by_id[contract_id] == contract
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (ContractPool, list, tuple)):
+            return self._as_list() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ContractPool({self._as_list()!r})"
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from systems.contracts import KNOWN_MATERIALS
+
+MATERIAL_INDEX: Dict[str, int] = {name: index for index, name in enumerate(KNOWN_MATERIALS)}
+
+
+def material_vector(amounts: Mapping) -> Tuple[int, ...]:
+    """
+    Convert a ``{material: amount}`` mapping into a vector in ``KNOWN_MATERIALS`` order.
+
+    Raises:
+        ValueError: If a material is not tracked.
+    """
+    vector = [0] * len(KNOWN_MATERIALS)
+    for name, amount in amounts.items():
+        index = MATERIAL_INDEX.get(name)
+        if index is None:
+            raise ValueError(f"Material '{name}' is not tracked.")
+        vector[index] += amount
+    return tuple(vector)
+
+
+class MaterialInventory(MutableMapping):
+    """Material stock keyed by ``KNOWN_MATERIALS`` position, stored in an int array.
+
+    Reads and writes like the ``{material: amount}`` dict it replaces, but the
+    key set is fixed and ``apply`` updates several materials as one
+    all-or-nothing transaction. ``fork`` shares the counts until either side
+    writes.
+    """
+
+    __slots__ = ("_counts", "_shared")
+
+    def __init__(self, amounts: Optional[Mapping] = None) -> None:
+        self._counts = array("q", [0] * len(KNOWN_MATERIALS))
+        self._shared = False
+        if amounts is not None:
+            for name, amount in amounts.items():
+                self[name] = amount
+
+    @property
+    def counts(self) -> array:
+        """The underlying counts in ``KNOWN_MATERIALS`` order; read without copying."""
+        return self._counts
+
+    def vector(self) -> Tuple[int, ...]:
+        return tuple(self._counts)
+
+    def can_apply(self, delta: Sequence[int]) -> bool:
+        """Check whether adding ``delta`` would keep every count non-negative."""
+        return all(count + change >= 0 for count, change in zip(self._counts, delta))
+
+    def apply(self, delta: Sequence[int]) -> None:
+        """
+        Add a delta vector to every material at once.
+
+        Raises:
+            ValueError: If the vector has the wrong length or any count would
+            become negative; nothing is changed in that case.
+        """
+        if len(delta) != len(self._counts):
+            raise ValueError("Material delta must have one entry per known material.")
+        if not self.can_apply(delta):
+            raise ValueError("Not enough material available.")
+        counts = self._own()
+        for index, change in enumerate(delta):
+            if change:
+                counts[index] += change
+
+    def copy(self) -> "MaterialInventory":
+        clone = MaterialInventory()
+        clone._counts = array("q", self._counts)
+        return clone
+
+    def fork(self) -> "MaterialInventory":
+        """Return a copy-on-write copy; the counts are duplicated on the first write."""
+        clone = MaterialInventory.__new__(MaterialInventory)
+        clone._counts = self._counts
+        clone._shared = self._shared = True
+        return clone
+
+    def share_from(self, other: "MaterialInventory") -> None:
+        """Take over another inventory's counts, sharing them copy-on-write."""
+        self._counts = other._counts
+        self._shared = other._shared = True
+
+    def _own(self) -> array:
+        if self._shared:
+            self._counts = array("q", self._counts)
+            self._shared = False
+        return self._counts
+
+    def __getitem__(self, name: str) -> int:
+        index = MATERIAL_INDEX.get(name)
+        if index is None:
+            raise KeyError(name)
+        return self._counts[index]
+
+    def __setitem__(self, name: str, amount: int) -> None:
+        index = MATERIAL_INDEX.get(name)
+        if index is None:
+            raise KeyError(name)
+        if amount < 0:
+            raise ValueError("Material amounts cannot be negative.")
+        self._own()[index] = amount
+
+    def __delitem__(self, name: str) -> None:
+        raise TypeError("Materials cannot be removed from the inventory; set them to 0.")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(KNOWN_MATERIALS)
+
+    def __len__(self) -> int:
+        return len(KNOWN_MATERIALS)
+
+    def __repr__(self) -> str:
+        return f"MaterialInventory({dict(self)!r})"
@@ -0,0 +1,697 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from systems.contracts import CONTRACT_TITLES, KNOWN_MATERIALS, Contract, PuzzleType
+from systems.production_system import Job
+from world.contract_pool import ContractPool
+from world.workshop_state import WorkshopRoom, WorkshopState
+
+if TYPE_CHECKING:
+    from systems.contracts import ContractsSystem
+    from systems.production_system import ProductionSystem
+    from systems.time_system import TimeSystem
+
+FORMAT_VERSION = 3
+SNAPSHOT_MAGIC = b"LWSV"
+JOURNAL_MAGIC = b"LWJN"
+
+PUZZLE_TYPES: Tuple[PuzzleType, ...] = tuple(PuzzleType)
+ROOMS: Tuple[WorkshopRoom, ...] = tuple(WorkshopRoom)
+
+# magic, version, material count, day, tick counter, next contract id, money,
+# reputation, inspiration, daily upkeep, inspiration gain, rooms mask,
+# contract count, last job sequence, jobs completed, job count.
+_SNAPSHOT_HEADER = struct.Struct("<4sHHqqqdddddIIqqI")
+# magic, version, checksum of the snapshot the journal extends.
+_JOURNAL_HEADER = struct.Struct("<4sHI")
+# payload length, crc32 of payload.
+_RECORD_HEADER = struct.Struct("<II")
+# day, tick counter, next contract id, money, reputation, inspiration,
+# daily upkeep, inspiration gain, rooms mask, removed contract count, added
+# contract count, last job sequence, jobs completed, removed job count, added
+# job count. A contract or job that changed is written as removed and added.
+_DELTA_HEADER = struct.Struct("<qqqdddddIIIqqII")
+# id, reward, duration, prestige, puzzle index, difficulty, start day,
+# name string index (-1 for the generated name), patron string index (-1 for none).
+_CONTRACT_RECORD = struct.Struct("<qdidBBqii")
+# sequence, completion day (-1 while queued), room index, priority, work days,
+# accepted day; followed by the job's contract record.
+_JOB_RECORD = struct.Struct("<qqBqiq")
+_MATERIALS = struct.Struct(f"<{len(KNOWN_MATERIALS)}q")
+_COUNT = struct.Struct("<I")
+_CONTRACT_ID = struct.Struct("<q")
+_JOB_SEQUENCE = struct.Struct("<q")
+
+_GENERATED_NAME = -1
+_NO_PATRON = -1
+_QUEUED = -1
+
+# Job sequence -> (completion day or None while queued, job).
+JobEntries = Dict[int, Tuple[Optional[int], Job]]
+
+
+class SaveGame:
+    """Versioned binary snapshot of a workshop plus an append-only journal of deltas.
+
+    ``save_snapshot`` writes the full state and starts a fresh journal;
+    ``autosave`` appends only what changed since the last write, and compacts
+    into a new snapshot once the journal holds ``compact_after`` records.
+    ``load`` memory-maps the snapshot and replays the journal tail.
+    Production jobs are saved and restored when a ``ProductionSystem`` is
+    passed alongside the state.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        journal_path: Optional[str] = None,
+        compact_after: int = 512,
+    ) -> None:
+        if compact_after <= 0:
+            raise ValueError("compact_after must be positive.")
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path if journal_path is not None else snapshot_path + ".journal"
+        self.compact_after = compact_after
+        self.journal_records = 0
+        self._snapshot_checksum: Optional[int] = None
+        self._persisted_contracts: Dict[int, Contract] = {}
+        self._persisted_contracts_version: Optional[int] = None
+        # Pool and change position the persisted contracts were read at.
+        self._persisted_pool: Optional[ContractPool] = None
+        self._persisted_pool_position = 0
+        self._persisted_jobs: JobEntries = {}
+        self._persisted_production_version: Optional[int] = None
+
+    def save_snapshot(
+        self,
+        workshop_state: WorkshopState,
+        time_system: Optional["TimeSystem"] = None,
+        contracts_system: Optional["ContractsSystem"] = None,
+        production_system: Optional["ProductionSystem"] = None,
+    ) -> None:
+        """Write a full snapshot atomically and reset the journal."""
+        data = encode_snapshot(workshop_state, time_system, contracts_system, production_system)
+        _atomic_write(self.snapshot_path, data)
+        self._snapshot_checksum = zlib.crc32(data)
+        self._reset_journal()
+        self._remember_contracts(workshop_state)
+        self._remember_jobs(production_system)
+
+    def autosave(
+        self,
+        workshop_state: WorkshopState,
+        time_system: Optional["TimeSystem"] = None,
+        contracts_system: Optional["ContractsSystem"] = None,
+        production_system: Optional["ProductionSystem"] = None,
+    ) -> None:
+        """Persist the changes since the last save, compacting the journal when it grows."""
+        if self._snapshot_checksum is None or self.journal_records >= self.compact_after:
+            self.save_snapshot(workshop_state, time_system, contracts_system, production_system)
+            return
+        self.append_delta(workshop_state, time_system, contracts_system, production_system)
+
+    def append_delta(
+        self,
+        workshop_state: WorkshopState,
+        time_system: Optional["TimeSystem"] = None,
+        contracts_system: Optional["ContractsSystem"] = None,
+        production_system: Optional["ProductionSystem"] = None,
+    ) -> None:
+        """
+        Append one journal record with the scalars, materials, contract and job changes.
+
+        Contracts and jobs are only diffed when their change version moved
+        since the last write, so a quiet day costs a fixed-size record. Only
+        the contract ids in the pool's change log are compared, unless the log
+        no longer reaches the last write. Both are compared by value, so a
+        contract replaced under the same id or a queued job that started is
+        rewritten.
+
+        Raises:
+            RuntimeError: If no snapshot has been written or loaded yet.
+        """
+        if self._snapshot_checksum is None:
+            raise RuntimeError("Write or load a snapshot before appending to the journal.")
+
+        added: List[Contract] = []
+        removed: List[int] = []
+        contracts_version = workshop_state.changes.version("contracts")
+        if contracts_version != self._persisted_contracts_version:
+            pool = workshop_state.active_contracts
+            changed = (
+                pool.changed_since(self._persisted_pool_position)
+                if pool is self._persisted_pool
+                else None
+            )
+            if changed is None:
+                removed, added = self._diff_all_contracts(pool)
+            else:
+                removed, added = self._diff_contracts(pool, changed)
+            self._persisted_contracts_version = contracts_version
+            self._persisted_pool = pool
+            self._persisted_pool_position = pool.change_position
+
+        added_jobs: JobEntries = {}
+        removed_jobs: List[int] = []
+        if (
+            production_system is not None
+            and production_system.version != self._persisted_production_version
+        ):
+            persisted_jobs = self._persisted_jobs
+            current_jobs = _job_entries(production_system)
+            removed_jobs = sorted(
+                seq for seq, entry in persisted_jobs.items() if current_jobs.get(seq) != entry
+            )
+            added_jobs = {
+                seq: entry
+                for seq, entry in current_jobs.items()
+                if persisted_jobs.get(seq) != entry
+            }
+            self._persisted_jobs = current_jobs
+            self._persisted_production_version = production_system.version
+
+        strings = _StringTable()
+        parts = [
+            _DELTA_HEADER.pack(
+                workshop_state.day,
+                time_system.tick_counter if time_system is not None else 0,
+                contracts_system.next_contract_id if contracts_system is not None else 0,
+                workshop_state.money,
+                workshop_state.reputation,
+                workshop_state.inspiration,
+                workshop_state.daily_upkeep,
+                workshop_state.inspiration_gain,
+                _rooms_mask(workshop_state),
+                len(removed),
+                len(added),
+                production_system.sequence if production_system is not None else 0,
+                production_system.jobs_completed if production_system is not None else 0,
+                len(removed_jobs),
+                len(added_jobs),
+            ),
+            _encode_materials(workshop_state),
+        ]
+        parts.extend(_CONTRACT_ID.pack(contract_id) for contract_id in removed)
+        parts.extend(_encode_contract(contract, strings) for contract in added)
+        parts.extend(_JOB_SEQUENCE.pack(seq) for seq in removed_jobs)
+        parts.extend(_encode_job(seq, entry, strings) for seq, entry in added_jobs.items())
+        parts.append(strings.encode())
+        payload = b"".join(parts)
+
+        with open(self.journal_path, "ab") as journal:
+            journal.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)))
+            journal.write(payload)
+            journal.flush()
+            os.fsync(journal.fileno())
+        self.journal_records += 1
+
+    def _diff_all_contracts(self, pool: ContractPool) -> Tuple[List[int], List[Contract]]:
+        persisted = self._persisted_contracts
+        current = {contract.id: contract for contract in pool}
+        removed = sorted(
+            contract_id
+            for contract_id, contract in persisted.items()
+            if current.get(contract_id) != contract
+        )
+        added = [
+            contract
+            for contract_id, contract in current.items()
+            if persisted.get(contract_id) != contract
+        ]
+        self._persisted_contracts = current
+        return removed, added
+
+    def _diff_contracts(
+        self, pool: ContractPool, changed: List[int]
+    ) -> Tuple[List[int], List[Contract]]:
+        persisted = self._persisted_contracts
+        removed: List[int] = []
+        added: List[Contract] = []
+        # By each id's last change, which is the order they now sit in the pool.
+        for contract_id in reversed(dict.fromkeys(reversed(changed))):
+            contract = pool.get(contract_id)
+            previous = persisted.get(contract_id)
+            if contract == previous:
+                continue
+            if previous is not None:
+                removed.append(contract_id)
+                del persisted[contract_id]
+            if contract is not None:
+                added.append(contract)
+                persisted[contract_id] = contract
+        return sorted(removed), added
+
+    def load(
+        self,
+        time_system: Optional["TimeSystem"] = None,
+        contracts_system: Optional["ContractsSystem"] = None,
+        production_system: Optional["ProductionSystem"] = None,
+    ) -> WorkshopState:
+        """
+        Load the snapshot and replay any journal records written after it.
+
+        Counters are restored into ``time_system`` and ``contracts_system``, and
+        jobs into ``production_system``, when given. A truncated trailing
+        journal record, such as one cut short by a crash, is ignored.
+
+        Raises:
+            ValueError: If the snapshot is missing data, corrupt or from an
+            unsupported format version.
+        """
+        with open(self.snapshot_path, "rb") as snapshot_file:
+            if os.fstat(snapshot_file.fileno()).st_size == 0:
+                raise ValueError("Snapshot file is empty.")
+            with mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                self._snapshot_checksum = zlib.crc32(buffer)
+                decoded = _decode_snapshot(buffer)
+        workshop_state, tick_counter, next_contract_id, jobs, jobs_completed, sequence = decoded
+
+        payloads, journal_end = self._read_journal()
+        for payload in payloads:
+            tick_counter, next_contract_id, jobs_completed, sequence = _apply_delta(
+                workshop_state, jobs, payload
+            )
+        self.journal_records = len(payloads)
+        if journal_end is None:
+            self._reset_journal()
+        else:
+            # Drop a torn trailing record so later appends stay readable.
+            os.truncate(self.journal_path, journal_end)
+
+        if time_system is not None:
+            time_system.tick_counter = tick_counter
+        if contracts_system is not None and next_contract_id > 0:
+            contracts_system.next_contract_id = next_contract_id
+        if production_system is not None:
+            production_system.restore(
+                ((seq, day, job) for seq, (day, job) in jobs.items()), jobs_completed, sequence
+            )
+        self._remember_contracts(workshop_state)
+        self._remember_jobs(production_system)
+        return workshop_state
+
+    def _read_journal(self) -> Tuple[List[bytes], Optional[int]]:
+        """Return the intact journal payloads and the offset just past the last one.
+
+        The offset is None when the journal is missing or belongs to another snapshot.
+        """
+        try:
+            journal_file = open(self.journal_path, "rb")
+        except FileNotFoundError:
+            return [], None
+        payloads: List[bytes] = []
+        with journal_file:
+            size = os.fstat(journal_file.fileno()).st_size
+            if size < _JOURNAL_HEADER.size:
+                return [], None
+            with mmap.mmap(journal_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                magic, version, checksum = _JOURNAL_HEADER.unpack_from(buffer, 0)
+                if magic != JOURNAL_MAGIC or version != FORMAT_VERSION:
+                    raise ValueError("Unsupported journal format.")
+                if checksum != self._snapshot_checksum:
+                    return [], None
+                offset = _JOURNAL_HEADER.size
+                while offset + _RECORD_HEADER.size <= size:
+                    length, crc = _RECORD_HEADER.unpack_from(buffer, offset)
+                    start = offset + _RECORD_HEADER.size
+                    payload = buffer[start : start + length]
+                    if len(payload) < length or zlib.crc32(payload) != crc:
+                        break
+                    payloads.append(payload)
+                    offset = start + length
+        return payloads, offset
+
+    def _reset_journal(self) -> None:
+        _atomic_write(
+            self.journal_path,
+            _JOURNAL_HEADER.pack(JOURNAL_MAGIC, FORMAT_VERSION, self._snapshot_checksum),
+        )
+        self.journal_records = 0
+
+    def _remember_contracts(self, workshop_state: WorkshopState) -> None:
+        self._persisted_contracts = {
+            contract.id: contract for contract in workshop_state.active_contracts
+        }
+        self._persisted_contracts_version = workshop_state.changes.version("contracts")
+        self._persisted_pool = workshop_state.active_contracts
+        self._persisted_pool_position = self._persisted_pool.change_position
+
+    def _remember_jobs(self, production_system: Optional["ProductionSystem"]) -> None:
+        if production_system is None:
+            self._persisted_jobs = {}
+            self._persisted_production_version = None
+        else:
+            self._persisted_jobs = _job_entries(production_system)
+            self._persisted_production_version = production_system.version
+
+
+class _StringTable:
+    """Interns strings so repeated patrons and names are stored once per file or record."""
+
+    def __init__(self) -> None:
+        self._indices: Dict[str, int] = {}
+        self._strings: List[str] = []
+
+    def index(self, value: str) -> int:
+        index = self._indices.get(value)
+        if index is None:
+            index = self._indices[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def encode(self) -> bytes:
+        parts = [_COUNT.pack(len(self._strings))]
+        for value in self._strings:
+            raw = value.encode("utf-8")
+            parts.append(_COUNT.pack(len(raw)))
+            parts.append(raw)
+        return b"".join(parts)
+
+
+def _decode_strings(buffer: Sequence[int], offset: int) -> List[str]:
+    (count,) = _COUNT.unpack_from(buffer, offset)
+    offset += _COUNT.size
+    strings = []
+    for _ in range(count):
+        (length,) = _COUNT.unpack_from(buffer, offset)
+        offset += _COUNT.size
+        strings.append(bytes(buffer[offset : offset + length]).decode("utf-8"))
+        offset += length
+    return strings
+
+
+def _generated_name(puzzle_type: PuzzleType, contract_id: int) -> str:
+    return f"{CONTRACT_TITLES.get(puzzle_type, 'Contract')} #{contract_id}"
+
+
+def _encode_contract(contract: Contract, strings: _StringTable) -> bytes:
+    puzzle_type = PuzzleType(contract.puzzle_type)
+    if contract.name == _generated_name(puzzle_type, contract.id):
+        name_index = _GENERATED_NAME
+    else:
+        name_index = strings.index(contract.name)
+    patron_index = _NO_PATRON if contract.patron is None else strings.index(contract.patron)
+    return _CONTRACT_RECORD.pack(
+        contract.id,
+        contract.reward_money,
+        contract.duration_days,
+        contract.prestige,
+        PUZZLE_TYPES.index(puzzle_type),
+        contract.puzzle_difficulty,
+        contract.start_day,
+        name_index,
+        patron_index,
+    ) + _MATERIALS.pack(
+        *(contract.materials_required.get(material, 0) for material in KNOWN_MATERIALS)
+    )
+
+
+def _read_contracts(
+    buffer: Sequence[int], offset: int, count: int
+) -> Tuple[List[Tuple[tuple, tuple]], int]:
+    records = []
+    for _ in range(count):
+        fields = _CONTRACT_RECORD.unpack_from(buffer, offset)
+        offset += _CONTRACT_RECORD.size
+        amounts = _MATERIALS.unpack_from(buffer, offset)
+        offset += _MATERIALS.size
+        records.append((fields, amounts))
+    return records, offset
+
+
+def _build_contract(record: Tuple[tuple, tuple], strings: List[str]) -> Contract:
+    fields, amounts = record
+    (
+        contract_id,
+        reward,
+        duration,
+        prestige,
+        puzzle_index,
+        difficulty,
+        start_day,
+        name_index,
+        patron_index,
+    ) = fields
+    if puzzle_index >= len(PUZZLE_TYPES):
+        raise ValueError("Corrupt contract record: unknown puzzle type.")
+    puzzle_type = PUZZLE_TYPES[puzzle_index]
+    # File-supplied contracts always go through the validating constructor.
+    return Contract(
+        id=contract_id,
+        name=(
+            _generated_name(puzzle_type, contract_id)
+            if name_index == _GENERATED_NAME
+            else strings[name_index]
+        ),
+        reward_money=reward,
+        duration_days=duration,
+        prestige=prestige,
+        materials_required={
+            material: amount for material, amount in zip(KNOWN_MATERIALS, amounts) if amount
+        },
+        puzzle_type=puzzle_type,
+        puzzle_difficulty=difficulty,
+        start_day=start_day,
+        patron=None if patron_index == _NO_PATRON else strings[patron_index],
+    )
+
+
+def _job_entries(production_system: "ProductionSystem") -> JobEntries:
+    return {seq: (day, job) for seq, day, job in production_system.job_entries()}
+
+
+def _encode_job(seq: int, entry: Tuple[Optional[int], Job], strings: _StringTable) -> bytes:
+    completion_day, job = entry
+    return _JOB_RECORD.pack(
+        seq,
+        _QUEUED if completion_day is None else completion_day,
+        ROOMS.index(job.room),
+        job.priority,
+        job.work_days,
+        job.accepted_day,
+    ) + _encode_contract(job.contract, strings)
+
+
+def _read_jobs(
+    buffer: Sequence[int], offset: int, count: int
+) -> Tuple[List[Tuple[tuple, Tuple[tuple, tuple]]], int]:
+    records = []
+    for _ in range(count):
+        fields = _JOB_RECORD.unpack_from(buffer, offset)
+        contracts, offset = _read_contracts(buffer, offset + _JOB_RECORD.size, 1)
+        records.append((fields, contracts[0]))
+    return records, offset
+
+
+def _build_jobs(
+    records: List[Tuple[tuple, Tuple[tuple, tuple]]], strings: List[str]
+) -> JobEntries:
+    jobs: JobEntries = {}
+    for fields, contract_record in records:
+        seq, completion_day, room_index, priority, work_days, accepted_day = fields
+        if room_index >= len(ROOMS):
+            raise ValueError("Corrupt job record: unknown room.")
+        job = Job(
+            _build_contract(contract_record, strings),
+            ROOMS[room_index],
+            priority,
+            work_days,
+            accepted_day,
+        )
+        jobs[seq] = (None if completion_day == _QUEUED else completion_day, job)
+    return jobs
+
+
+def _rooms_mask(workshop_state: WorkshopState) -> int:
+    mask = 0
+    for room in workshop_state.rooms:
+        mask |= 1 << ROOMS.index(room)
+    return mask
+
+
+def _rooms_from_mask(mask: int) -> List[WorkshopRoom]:
+    return [room for bit, room in enumerate(ROOMS) if mask & (1 << bit)]
+
+
+def _encode_materials(workshop_state: WorkshopState) -> bytes:
+    materials = workshop_state.materials
+    return _MATERIALS.pack(*(materials.get(material, 0) for material in KNOWN_MATERIALS))
+
+
+def encode_snapshot(
+    workshop_state: WorkshopState,
+    time_system: Optional["TimeSystem"] = None,
+    contracts_system: Optional["ContractsSystem"] = None,
+    production_system: Optional["ProductionSystem"] = None,
+) -> bytes:
+    """Serialize a workshop, its counters and its production jobs into the snapshot format."""
+    contracts = list(workshop_state.active_contracts)
+    jobs = _job_entries(production_system) if production_system is not None else {}
+    strings = _StringTable()
+    parts = [
+        _SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC,
+            FORMAT_VERSION,
+            len(KNOWN_MATERIALS),
+            workshop_state.day,
+            time_system.tick_counter if time_system is not None else 0,
+            contracts_system.next_contract_id if contracts_system is not None else 0,
+            workshop_state.money,
+            workshop_state.reputation,
+            workshop_state.inspiration,
+            workshop_state.daily_upkeep,
+            workshop_state.inspiration_gain,
+            _rooms_mask(workshop_state),
+            len(contracts),
+            production_system.sequence if production_system is not None else 0,
+            production_system.jobs_completed if production_system is not None else 0,
+            len(jobs),
+        ),
+        _encode_materials(workshop_state),
+    ]
+    parts.extend(_encode_contract(contract, strings) for contract in contracts)
+    parts.extend(_encode_job(seq, entry, strings) for seq, entry in jobs.items())
+    parts.append(strings.encode())
+    return b"".join(parts)
+
+
+def decode_snapshot(
+    buffer: Sequence[int], production_system: Optional["ProductionSystem"] = None
+) -> Tuple[WorkshopState, int, int]:
+    """
+    Parse snapshot bytes into a workshop state, tick counter and next contract id.
+
+    The saved jobs are restored into ``production_system`` when given.
+
+    Raises:
+        ValueError: If the data is truncated, foreign or from another format version.
+    """
+    workshop_state, tick_counter, next_contract_id, jobs, jobs_completed, sequence = (
+        _decode_snapshot(buffer)
+    )
+    if production_system is not None:
+        production_system.restore(
+            ((seq, day, job) for seq, (day, job) in jobs.items()), jobs_completed, sequence
+        )
+    return workshop_state, tick_counter, next_contract_id
+
+
+def _decode_snapshot(
+    buffer: Sequence[int],
+) -> Tuple[WorkshopState, int, int, JobEntries, int, int]:
+    try:
+        (
+            magic,
+            version,
+            material_count,
+            day,
+            tick_counter,
+            next_contract_id,
+            money,
+            reputation,
+            inspiration,
+            daily_upkeep,
+            inspiration_gain,
+            rooms_mask,
+            contract_count,
+            sequence,
+            jobs_completed,
+            job_count,
+        ) = _SNAPSHOT_HEADER.unpack_from(buffer, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a workshop snapshot.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}.")
+        if material_count != len(KNOWN_MATERIALS):
+            raise ValueError("Snapshot was written with a different material set.")
+        offset = _SNAPSHOT_HEADER.size
+        amounts = _MATERIALS.unpack_from(buffer, offset)
+        offset += _MATERIALS.size
+        contract_records, offset = _read_contracts(buffer, offset, contract_count)
+        job_records, offset = _read_jobs(buffer, offset, job_count)
+        strings = _decode_strings(buffer, offset)
+    except struct.error as exc:
+        raise ValueError("Snapshot is truncated.") from exc
+
+    workshop_state = WorkshopState(
+        day=day,
+        money=money,
+        reputation=reputation,
+        inspiration=inspiration,
+        materials=dict(zip(KNOWN_MATERIALS, amounts)),
+        daily_upkeep=daily_upkeep,
+        inspiration_gain=inspiration_gain,
+        active_contracts=[_build_contract(record, strings) for record in contract_records],
+        rooms=_rooms_from_mask(rooms_mask),
+    )
+    jobs = _build_jobs(job_records, strings)
+    return workshop_state, tick_counter, next_contract_id, jobs, jobs_completed, sequence
+
+
+def _apply_delta(
+    workshop_state: WorkshopState, jobs: JobEntries, payload: bytes
+) -> Tuple[int, int, int, int]:
+    (
+        day,
+        tick_counter,
+        next_contract_id,
+        money,
+        reputation,
+        inspiration,
+        daily_upkeep,
+        inspiration_gain,
+        rooms_mask,
+        removed_count,
+        added_count,
+        sequence,
+        jobs_completed,
+        removed_job_count,
+        added_job_count,
+    ) = _DELTA_HEADER.unpack_from(payload, 0)
+    offset = _DELTA_HEADER.size
+    amounts = _MATERIALS.unpack_from(payload, offset)
+    offset += _MATERIALS.size
+    removed = []
+    for _ in range(removed_count):
+        removed.append(_CONTRACT_ID.unpack_from(payload, offset)[0])
+        offset += _CONTRACT_ID.size
+    contract_records, offset = _read_contracts(payload, offset, added_count)
+    removed_jobs = []
+    for _ in range(removed_job_count):
+        removed_jobs.append(_JOB_SEQUENCE.unpack_from(payload, offset)[0])
+        offset += _JOB_SEQUENCE.size
+    job_records, offset = _read_jobs(payload, offset, added_job_count)
+    strings = _decode_strings(payload, offset)
+
+    workshop_state.day = day
+    workshop_state.money = money
+    workshop_state.reputation = reputation
+    workshop_state.inspiration = inspiration
+    workshop_state.daily_upkeep = daily_upkeep
+    workshop_state.inspiration_gain = inspiration_gain
+    workshop_state.rooms = _rooms_from_mask(rooms_mask)
+    for material, amount in zip(KNOWN_MATERIALS, amounts):
+        workshop_state.materials[material] = amount
+    pool = workshop_state.active_contracts
+    for contract_id in removed:
+        pool.pop_id(contract_id)
+    pool.extend(_build_contract(record, strings) for record in contract_records)
+    for seq in removed_jobs:
+        jobs.pop(seq, None)
+    jobs.update(_build_jobs(job_records, strings))
+    return tick_counter, next_contract_id, jobs_completed, sequence
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as handle:
+        handle.write(data)
+        # On disk before the rename, so a crash never leaves an empty file in place.
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp_path, path)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from world.workshop_state import WorkshopState
+
+STATE_FIELDS: Tuple[str, ...] = (
+    "day",
+    "money",
+    "reputation",
+    "inspiration",
+    "materials",
+    "contracts",
+)
+
+ChangeCallback = Callable[["WorkshopState", str], None]
+
+
+class Subscription:
+    """Handle returned by ``StateChanges.subscribe``; call ``cancel`` to stop listening."""
+
+    __slots__ = ("_callbacks", "_callback")
+
+    def __init__(self, callbacks: List[ChangeCallback], callback: ChangeCallback) -> None:
+        self._callbacks = callbacks
+        self._callback = callback
+
+    def cancel(self) -> None:
+        if self._callback in self._callbacks:
+            self._callbacks.remove(self._callback)
+
+
+class StateChanges:
+    """Per-field version counters and change callbacks for a ``WorkshopState``.
+
+    Systems report what they changed through ``WorkshopState.notify_changed``;
+    consumers either subscribe to a field or compare version counters instead
+    of polling and re-reading the whole state.
+    """
+
+    __slots__ = ("_versions", "_subscribers")
+
+    def __init__(self) -> None:
+        self._versions: Dict[str, int] = dict.fromkeys(STATE_FIELDS, 0)
+        self._subscribers: Dict[str, List[ChangeCallback]] = {name: [] for name in STATE_FIELDS}
+
+    def version(self, field_name: Optional[str] = None) -> int:
+        """Return the change counter of a field, or the total across all fields."""
+        if field_name is None:
+            return sum(self._versions.values())
+        self._validate_field(field_name)
+        return self._versions[field_name]
+
+    def versions(self) -> Dict[str, int]:
+        """Return a copy of every field's change counter."""
+        return dict(self._versions)
+
+    def copy_versions(self) -> "StateChanges":
+        """Return a tracker with the same counters and no subscribers."""
+        clone = StateChanges()
+        clone._versions.update(self._versions)
+        return clone
+
+    def changed_since(self, versions: Dict[str, int]) -> List[str]:
+        """List the fields whose counters moved since ``versions`` was taken."""
+        return [
+            name for name, version in self._versions.items() if versions.get(name) != version
+        ]
+
+    def subscribe(self, field_name: str, callback: ChangeCallback) -> Subscription:
+        """
+        Call ``callback(workshop_state, field_name)`` whenever the field changes.
+
+        Raises:
+            ValueError: If the field is not tracked.
+        """
+        self._validate_field(field_name)
+        callbacks = self._subscribers[field_name]
+        callbacks.append(callback)
+        return Subscription(callbacks, callback)
+
+    def emit(self, workshop_state: "WorkshopState", *field_names: str) -> None:
+        versions = self._versions
+        for field_name in field_names:
+            versions[field_name] += 1
+            callbacks = self._subscribers[field_name]
+            if callbacks:
+                for callback in list(callbacks):
+                    callback(workshop_state, field_name)
+
+    def _validate_field(self, field_name: str) -> None:
+        if field_name not in self._versions:
+            raise ValueError(f"Unknown state field '{field_name}'.")
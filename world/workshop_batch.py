@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from systems.contracts import CONTRACT_TITLES, KNOWN_MATERIALS, Contract, PuzzleType
+from world.workshop_state import WorkshopRoom, WorkshopState
+
+PUZZLE_TYPES: Tuple[PuzzleType, ...] = tuple(PuzzleType)
+ROOMS: Tuple[WorkshopRoom, ...] = tuple(WorkshopRoom)
+
+# Per-slot contract columns that are reordered together when contracts expire.
+CONTRACT_COLUMNS = (
+    "contract_id",
+    "contract_reward",
+    "contract_duration",
+    "contract_prestige",
+    "contract_puzzle",
+    "contract_difficulty",
+    "contract_start_day",
+    "contract_materials",
+)
+
+
+class WorkshopBatch:
+    """Struct-of-arrays storage for many workshops stepped together.
+
+    Row ``i`` holds one workshop. Contracts live in ``max_contracts`` slots per
+    row; the first ``contract_count[i]`` slots are active and kept in the same
+    order as ``WorkshopState.active_contracts``.
+    """
+
+    def __init__(self, size: int, max_contracts: int = 3) -> None:
+        if size <= 0:
+            raise ValueError("Batch size must be positive.")
+        if max_contracts < 0:
+            raise ValueError("max_contracts cannot be negative.")
+        defaults = WorkshopState()
+        self.size = size
+        self.max_contracts = max_contracts
+
+        self.day = np.full(size, defaults.day, dtype=np.int64)
+        self.tick_counter = np.zeros(size, dtype=np.int64)
+        self.money = np.full(size, defaults.money, dtype=np.float64)
+        self.reputation = np.full(size, defaults.reputation, dtype=np.float64)
+        self.inspiration = np.full(size, defaults.inspiration, dtype=np.float64)
+        self.daily_upkeep = np.full(size, defaults.daily_upkeep, dtype=np.float64)
+        self.inspiration_gain = np.full(size, defaults.inspiration_gain, dtype=np.float64)
+        self.materials = np.zeros((size, len(KNOWN_MATERIALS)), dtype=np.int64)
+        self.rooms = np.full(size, _rooms_to_mask(defaults.rooms), dtype=np.uint8)
+
+        shape = (size, max_contracts)
+        self.contract_count = np.zeros(size, dtype=np.int64)
+        self.next_contract_id = np.ones(size, dtype=np.int64)
+        self.contract_id = np.zeros(shape, dtype=np.int64)
+        self.contract_reward = np.zeros(shape, dtype=np.float64)
+        self.contract_duration = np.zeros(shape, dtype=np.int64)
+        self.contract_prestige = np.zeros(shape, dtype=np.float64)
+        self.contract_puzzle = np.zeros(shape, dtype=np.int8)
+        self.contract_difficulty = np.zeros(shape, dtype=np.int8)
+        self.contract_start_day = np.zeros(shape, dtype=np.int64)
+        self.contract_materials = np.zeros(shape + (len(KNOWN_MATERIALS),), dtype=np.int64)
+        # Names and patrons that differ from the generated defaults, keyed by (row, id).
+        self._contract_labels: Dict[Tuple[int, int], Tuple[str, Optional[str]]] = {}
+
+    @classmethod
+    def from_states(
+        cls, states: Sequence[WorkshopState], max_contracts: int = 3
+    ) -> "WorkshopBatch":
+        """Build a batch from individual workshop states."""
+        largest = max((len(state.active_contracts) for state in states), default=0)
+        batch = cls(len(states), max(max_contracts, largest))
+        for index, state in enumerate(states):
+            batch.write_state(index, state)
+        return batch
+
+    def active_slots(self) -> np.ndarray:
+        """Boolean (size x max_contracts) mask of occupied contract slots."""
+        return np.arange(self.max_contracts) < self.contract_count[:, None]
+
+    def write_state(
+        self,
+        index: int,
+        state: WorkshopState,
+        tick_counter: int = 0,
+        next_contract_id: Optional[int] = None,
+    ) -> None:
+        """
+        Copy an individual workshop state into row ``index``.
+
+        Raises:
+            ValueError: If the state holds more contracts than the batch has slots.
+        """
+        contracts = list(state.active_contracts)
+        if len(contracts) > self.max_contracts:
+            raise ValueError("Workshop has more active contracts than the batch can hold.")
+
+        self.day[index] = state.day
+        self.tick_counter[index] = tick_counter
+        self.money[index] = state.money
+        self.reputation[index] = state.reputation
+        self.inspiration[index] = state.inspiration
+        self.daily_upkeep[index] = state.daily_upkeep
+        self.inspiration_gain[index] = state.inspiration_gain
+        self.materials[index] = [state.materials.get(name, 0) for name in KNOWN_MATERIALS]
+        self.rooms[index] = _rooms_to_mask(state.rooms)
+
+        for key in [key for key in self._contract_labels if key[0] == index]:
+            del self._contract_labels[key]
+        self.contract_count[index] = len(contracts)
+        self.contract_materials[index] = 0
+        for slot, contract in enumerate(contracts):
+            self.contract_id[index, slot] = contract.id
+            self.contract_reward[index, slot] = contract.reward_money
+            self.contract_duration[index, slot] = contract.duration_days
+            self.contract_prestige[index, slot] = contract.prestige
+            self.contract_puzzle[index, slot] = PUZZLE_TYPES.index(PuzzleType(contract.puzzle_type))
+            self.contract_difficulty[index, slot] = contract.puzzle_difficulty
+            self.contract_start_day[index, slot] = contract.start_day
+            for material, amount in contract.materials_required.items():
+                self.contract_materials[index, slot, KNOWN_MATERIALS.index(material)] = amount
+            if contract.name != _generated_name(contract.puzzle_type, contract.id) or contract.patron:
+                self._contract_labels[(index, contract.id)] = (contract.name, contract.patron)
+
+        if next_contract_id is None:
+            next_contract_id = max((contract.id for contract in contracts), default=0) + 1
+        self.next_contract_id[index] = next_contract_id
+
+    def extract_state(self, index: int) -> WorkshopState:
+        """Materialize row ``index`` as a standalone ``WorkshopState``."""
+        contracts = []
+        for slot in range(int(self.contract_count[index])):
+            contract_id = int(self.contract_id[index, slot])
+            puzzle_type = PUZZLE_TYPES[int(self.contract_puzzle[index, slot])]
+            name, patron = self._contract_labels.get(
+                (index, contract_id), (_generated_name(puzzle_type, contract_id), None)
+            )
+            materials_row = self.contract_materials[index, slot]
+            contracts.append(
+                Contract(
+                    id=contract_id,
+                    name=name,
+                    reward_money=float(self.contract_reward[index, slot]),
+                    duration_days=int(self.contract_duration[index, slot]),
+                    prestige=float(self.contract_prestige[index, slot]),
+                    materials_required={
+                        material: int(amount)
+                        for material, amount in zip(KNOWN_MATERIALS, materials_row)
+                        if amount > 0
+                    },
+                    puzzle_type=puzzle_type,
+                    puzzle_difficulty=int(self.contract_difficulty[index, slot]),
+                    start_day=int(self.contract_start_day[index, slot]),
+                    patron=patron,
+                )
+            )
+
+        room_mask = int(self.rooms[index])
+        return WorkshopState(
+            day=int(self.day[index]),
+            money=float(self.money[index]),
+            reputation=float(self.reputation[index]),
+            inspiration=float(self.inspiration[index]),
+            materials={
+                material: int(amount)
+                for material, amount in zip(KNOWN_MATERIALS, self.materials[index])
+            },
+            daily_upkeep=float(self.daily_upkeep[index]),
+            inspiration_gain=float(self.inspiration_gain[index]),
+            active_contracts=contracts,
+            rooms=[room for bit, room in enumerate(ROOMS) if room_mask & (1 << bit)],
+        )
+
+
+def _rooms_to_mask(rooms: Sequence[WorkshopRoom]) -> int:
+    mask = 0
+    for room in rooms:
+        mask |= 1 << ROOMS.index(room)
+    return mask
+
+
+def _generated_name(puzzle_type: PuzzleType, contract_id: int) -> str:
+    return f"{CONTRACT_TITLES.get(puzzle_type, 'Contract')} #{contract_id}"
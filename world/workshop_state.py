@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, TYPE_CHECKING
+from typing import List
 
-if TYPE_CHECKING:
-    from systems.contracts import Contract
+from world.contract_pool import ContractPool
+from world.inventory import MaterialInventory
+from world.state_changes import StateChanges
 
 
 class WorkshopRoom(str, Enum):
@@ -15,7 +16,7 @@ class WorkshopRoom(str, Enum):
     LIBRARY = "Library"
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkshopState:
     """Tracks the high-level workshop status."""
 
@@ -23,12 +24,10 @@ class WorkshopState:
     money: float = 150.0
     reputation: float = 0.0
     inspiration: float = 5.0
-    materials: Dict[str, int] = field(
-        default_factory=lambda: {"wood": 0, "metal": 0, "pigment": 0}
-    )
+    materials: MaterialInventory = field(default_factory=MaterialInventory)
     daily_upkeep: float = 1.0
     inspiration_gain: float = 0.1
-    active_contracts: List["Contract"] = field(default_factory=list)
+    active_contracts: ContractPool = field(default_factory=ContractPool)
     rooms: List[WorkshopRoom] = field(
         default_factory=lambda: [
             WorkshopRoom.PAINTING_STUDIO,
@@ -37,3 +36,72 @@ class WorkshopState:
             WorkshopRoom.LIBRARY,
         ]
     )
+    changes: StateChanges = field(default_factory=StateChanges, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.materials, MaterialInventory):
+            self.materials = MaterialInventory(self.materials)
+        if not isinstance(self.active_contracts, ContractPool):
+            self.active_contracts = ContractPool(self.active_contracts)
+
+    def notify_changed(self, *field_names: str) -> None:
+        """Bump the version of the given fields and notify their subscribers."""
+        self.changes.emit(self, *field_names)
+
+    def fork(self) -> "WorkshopState":
+        """
+        Branch the state for what-if lookahead.
+
+        Materials and contracts are shared copy-on-write and contracts are
+        immutable, so a fork costs a few object allocations regardless of how
+        much the workshop holds. The branch gets its own ``changes`` with no
+        subscribers; drop it to discard the branch or pass it to ``commit``.
+        """
+        self.__post_init__()
+        return WorkshopState(
+            day=self.day,
+            money=self.money,
+            reputation=self.reputation,
+            inspiration=self.inspiration,
+            materials=self.materials.fork(),
+            daily_upkeep=self.daily_upkeep,
+            inspiration_gain=self.inspiration_gain,
+            active_contracts=self.active_contracts.fork(),
+            rooms=list(self.rooms),
+        )
+
+    def snapshot(self) -> "WorkshopState":
+        """
+        Fork the state for a reader on another thread.
+
+        Unlike ``fork`` the snapshot keeps the change counters, so a renderer
+        comparing versions across snapshots only re-reads fields that moved.
+        The owner's later writes copy shared containers first, so the
+        snapshot never changes as long as the reader does not modify it.
+        """
+        snapshot = self.fork()
+        snapshot.changes = self.changes.copy_versions()
+        return snapshot
+
+    def commit(self, branch: "WorkshopState") -> None:
+        """Adopt a branch's values, notifying subscribers of the fields that differ."""
+        self.__post_init__()
+        branch.__post_init__()
+        changed = [
+            name
+            for name in ("day", "money", "reputation", "inspiration")
+            if getattr(self, name) != getattr(branch, name)
+        ]
+        for name in changed:
+            setattr(self, name, getattr(branch, name))
+        self.daily_upkeep = branch.daily_upkeep
+        self.inspiration_gain = branch.inspiration_gain
+        self.rooms = list(branch.rooms)
+        if self.materials.counts != branch.materials.counts:
+            self.materials.share_from(branch.materials)
+            changed.append("materials")
+        if self.active_contracts != branch.active_contracts:
+            self.active_contracts.share_from(branch.active_contracts)
+            changed.append("contracts")
+        if changed:
+            self.notify_changed(*changed)